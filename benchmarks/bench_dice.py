@@ -0,0 +1,35 @@
+"""Стоимость броска кости: random.randint против буфера DiceStream.
+
+Запуск: python benchmarks/bench_dice.py
+"""
+
+import random
+import sys
+import timeit
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.dice import DiceStream  # noqa: E402
+
+
+def main(number: int = 200_000) -> None:
+    stream = DiceStream(1)
+
+    def by_randint():
+        return [random.randint(1, 6) for _ in range(5)]
+
+    def by_stream():
+        return stream.roll(5)
+
+    randint_ns = min(timeit.repeat(by_randint, number=number, repeat=5)) / number / 5 * 1e9
+    stream_ns = min(timeit.repeat(by_stream, number=number, repeat=5)) / number / 5 * 1e9
+    print(f"random.randint: {randint_ns:8.1f} нс/кость")
+    print(f"DiceStream:     {stream_ns:8.1f} нс/кость")
+    print(f"ускорение:      {randint_ns / stream_ns:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
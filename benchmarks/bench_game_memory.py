@@ -0,0 +1,72 @@
+"""Память на игру в состояниях WAITING, ACTIVE и COMPLETED (tracemalloc).
+
+Запуск: python benchmarks/bench_game_memory.py [--games 100000]
+"""
+
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.game_logic import DicePokerGame, GameStatus  # noqa: E402
+
+
+def _waiting(idx: int) -> DicePokerGame:
+    game = DicePokerGame(f"game-{idx}", max_players=4)
+    game.add_player("Alice")
+    game.add_player("Bob")
+    return game
+
+
+def _active(idx: int) -> DicePokerGame:
+    game = _waiting(idx)
+    for player_id in list(game.players):
+        game.set_player_ready(player_id)
+    game.start_game()
+    # Первый круг сыгран, игра в середине второго раунда
+    for _ in range(len(game.players)):
+        game.end_turn(game.get_current_player().id)
+    return game
+
+
+def _completed(idx: int) -> DicePokerGame:
+    game = _active(idx)
+    while game.status == GameStatus.ACTIVE:
+        game.end_turn(game.get_current_player().id)
+    return game
+
+
+def measure(build, games: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build(idx) for idx in range(games)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / games
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=100_000)
+    args = parser.parse_args()
+
+    random.seed(1)
+    for name, build in (
+        ("WAITING", _waiting),
+        ("ACTIVE", _active),
+        ("COMPLETED", _completed),
+    ):
+        per_game = measure(build, args.games)
+        print(f"{name:<9} {per_game:8.0f} байт/игру ({args.games} игр)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Сравнение табличной оценки броска с прямым подсчётом.
+
+Запуск: python benchmarks/bench_scoring.py
+"""
+
+import random
+import sys
+import timeit
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.scoring import classify_roll, evaluate_roll, score_roll  # noqa: E402
+
+
+def _reference(dice):
+    combination = classify_roll(dice)
+    return combination, score_roll(combination, dice)
+
+
+def main(number: int = 200_000) -> None:
+    rng = random.Random(1)
+    rolls = [[rng.randint(1, 6) for _ in range(5)] for _ in range(1024)]
+
+    def run(func):
+        def loop():
+            for dice in rolls:
+                func(dice)
+
+        repeats = max(1, number // len(rolls))
+        best = min(timeit.repeat(loop, number=repeats, repeat=5))
+        return best / (repeats * len(rolls)) * 1e9
+
+    reference_ns = run(_reference)
+    table_ns = run(evaluate_roll)
+    print(f"прямой подсчёт: {reference_ns:8.1f} нс/вызов")
+    print(f"таблица:        {table_ns:8.1f} нс/вызов")
+    print(f"ускорение:      {reference_ns / table_ns:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Память на ход: список объектов Turn против колонночного TurnLog.
+
+Запуск: python benchmarks/bench_turn_log.py
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.history import Turn, TurnLog  # noqa: E402
+from src.core.scoring import evaluate_roll  # noqa: E402
+
+
+def _rows(count: int):
+    rng = random.Random(1)
+    players = [f"player-{idx}" for idx in range(4)]
+    now = time.time()
+    for idx in range(count):
+        roll = [rng.randint(1, 6) for _ in range(5)]
+        combination, score = evaluate_roll(roll)
+        yield players[idx % 4], roll, combination, score, idx // 4 + 1, now + idx
+
+
+def _measure(build) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def main(count: int = 100_000) -> None:
+    rows = list(_rows(count))
+
+    def as_turns():
+        return [
+            Turn(pid, list(roll), comb, score, rnd, datetime.fromtimestamp(ts))
+            for pid, roll, comb, score, rnd, ts in rows
+        ]
+
+    def as_log():
+        log = TurnLog()
+        for row in rows:
+            log.record(*row)
+        return log
+
+    turns_bytes = _measure(as_turns) / count
+    log_bytes = _measure(as_log) / count
+    print(f"список Turn: {turns_bytes:8.1f} байт/ход")
+    print(f"TurnLog:     {log_bytes:8.1f} байт/ход (колонки: {TurnLog.bytes_per_turn()})")
+    print(f"экономия:    {turns_bytes - log_bytes:8.1f} байт/ход")
+
+
+if __name__ == "__main__":
+    main()
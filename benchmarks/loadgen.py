@@ -0,0 +1,450 @@
+"""Синтетическая нагрузка: множество клиентов играют партии через HTTP API.
+
+Каждый клиент проходит create_game (хост) -> join_game -> ready, затем
+опрашивает /game/<id>/state с заданным интервалом (с If-None-Match), а в
+свой ход делает 0-2 переброса и end_turn. Клиенты — конечные автоматы в
+общей куче, их шаги выполняет небольшой пул потоков, поэтому тысячи
+клиентов не требуют тысяч потоков.
+
+Цель — тестовый клиент Flask в этом процессе (по умолчанию) или запущенный
+сервер (--url http://127.0.0.1:5000). Итог — p50/p95/p99 задержки по
+маршрутам и пропускная способность, с выгрузкой в CSV/JSON.
+
+Запуск:
+    python benchmarks/loadgen.py --games 500 --players 2
+    python benchmarks/loadgen.py --url http://127.0.0.1:5000 --games 200 --json out.json
+"""
+
+import argparse
+import csv
+import heapq
+import http.client
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+for path in (PROJECT_ROOT, PROJECT_ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+
+class InProcessTransport:
+    """Запросы через тестовый клиент Flask, без сети"""
+
+    def __init__(self):
+        from src.app import app
+
+        self._client = app.test_client()
+
+    def request(
+        self, method: str, path: str, body: Optional[Dict] = None, headers=None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        response = self._client.open(path, method=method, json=body, headers=headers)
+        return response.status_code, dict(response.headers), response.get_data()
+
+
+class HttpTransport:
+    """Запросы к запущенному серверу; cookie сессии хранится в клиенте"""
+
+    def __init__(self, base_url: str, timeout: float = 10.0):
+        parts = urlsplit(base_url)
+        self._host = parts.hostname or "127.0.0.1"
+        self._port = parts.port or 80
+        self._timeout = timeout
+        self._cookie: Optional[str] = None
+        self._conn: Optional[http.client.HTTPConnection] = None
+
+    def request(
+        self, method: str, path: str, body: Optional[Dict] = None, headers=None
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        headers = dict(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        if self._cookie:
+            headers["Cookie"] = self._cookie
+        for attempt in range(2):
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(
+                    self._host, self._port, timeout=self._timeout
+                )
+            try:
+                self._conn.request(method, path, body=payload, headers=headers)
+                response = self._conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # Сервер закрыл соединение (HTTP/1.0) — повторяем на новом
+                self._conn.close()
+                self._conn = None
+                if attempt:
+                    raise
+        if response.getheader("Connection", "").lower() == "close" or (
+            response.version == 10
+        ):
+            self._conn.close()
+            self._conn = None
+        cookie = response.getheader("Set-Cookie")
+        if cookie:
+            self._cookie = cookie.split(";", 1)[0]
+        return response.status, dict(response.getheaders()), data
+
+
+class LatencyRecorder:
+    """Задержки по маршрутам; маршрут — метод и шаблон пути"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, route: str, seconds: float, ok: bool):
+        with self._lock:
+            self.latencies.setdefault(route, []).append(seconds)
+            if not ok:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+    def summary(self, elapsed: float) -> List[Dict]:
+        rows = []
+        with self._lock:
+            items = sorted(self.latencies.items())
+            for route, samples in items:
+                ordered = sorted(samples)
+                rows.append(
+                    {
+                        "route": route,
+                        "requests": len(ordered),
+                        "errors": self.errors.get(route, 0),
+                        "p50_ms": percentile(ordered, 50) * 1e3,
+                        "p95_ms": percentile(ordered, 95) * 1e3,
+                        "p99_ms": percentile(ordered, 99) * 1e3,
+                        "max_ms": ordered[-1] * 1e3,
+                        "rps": len(ordered) / elapsed if elapsed else 0.0,
+                    }
+                )
+        return rows
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Перцентиль по рангу в отсортированной выборке"""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class _Table:
+    """Общие данные клиентов одной игры"""
+
+    __slots__ = ("game_id", "players")
+
+    def __init__(self, players: int):
+        self.game_id: Optional[str] = None
+        self.players = players
+
+
+class SimulatedClient:
+    """Один игрок: каждый вызов ``step`` делает один запрос и возвращает
+    задержку до следующего шага или None, если клиент закончил"""
+
+    def __init__(
+        self,
+        transport,
+        table: _Table,
+        name: str,
+        is_host: bool,
+        recorder: LatencyRecorder,
+        rng: random.Random,
+        poll_interval: float,
+        think_time: float,
+    ):
+        self.transport = transport
+        self.table = table
+        self.name = name
+        self.recorder = recorder
+        self.rng = rng
+        self.poll_interval = poll_interval
+        self.think_time = think_time
+        self.player_id: Optional[str] = None
+        self.etag: Optional[str] = None
+        self.state: Optional[Dict] = None
+        self.next_op = "create" if is_host else "join"
+        self.completed = False
+
+    def _call(self, route: str, method: str, path: str, body=None, headers=None):
+        started = time.perf_counter()
+        try:
+            status, response_headers, data = self.transport.request(
+                method, path, body, headers
+            )
+        except (http.client.HTTPException, OSError):
+            self.recorder.record(route, time.perf_counter() - started, False)
+            return None, {}, None
+        elapsed = time.perf_counter() - started
+        payload = json.loads(data) if data and status == 200 else None
+        ok = status in (200, 304) and not (
+            isinstance(payload, dict) and payload.get("success") is False
+        )
+        self.recorder.record(route, elapsed, ok)
+        return status, response_headers, payload
+
+    def _think(self) -> float:
+        return self.think_time * self.rng.uniform(0.5, 1.5)
+
+    def step(self) -> Optional[float]:
+        op = self.next_op
+        game_id = self.table.game_id
+
+        if op == "create":
+            _, _, data = self._call(
+                "POST /create_game",
+                "POST",
+                "/create_game",
+                {"max_players": self.table.players, "max_rounds": 3},
+            )
+            if not data or not data.get("success"):
+                return None
+            self.table.game_id = data["game_id"]
+            self.next_op = "join"
+            return 0.0
+
+        if op == "join":
+            if game_id is None:
+                # Хост ещё не создал игру
+                return 0.01
+            _, _, data = self._call(
+                "POST /join_game",
+                "POST",
+                "/join_game",
+                {"game_id": game_id, "player_name": self.name},
+            )
+            if not data or not data.get("success"):
+                return None
+            self.player_id = data["player_id"]
+            self.next_op = "ready"
+            return self._think()
+
+        if op == "ready":
+            self._call("POST /game/<id>/ready", "POST", f"/game/{game_id}/ready")
+            self.next_op = "poll"
+            return 0.0
+
+        if op == "poll":
+            headers = {"If-None-Match": self.etag} if self.etag else None
+            status, response_headers, data = self._call(
+                "GET /game/<id>/state", "GET", f"/game/{game_id}/state", None, headers
+            )
+            if status == 200 and data:
+                self.state = data
+                self.etag = response_headers.get("ETag")
+            elif status != 304:
+                return None
+            state = self.state or {}
+            if state.get("status") == "completed":
+                self.completed = True
+                return None
+            current = [p["id"] for p in state.get("players", []) if p["is_current"]]
+            if state.get("status") == "active" and current == [self.player_id]:
+                rerolls = state["current_turn"]["remaining_rerolls"]
+                self.next_op = (
+                    "reroll" if rerolls and self.rng.random() < 0.6 else "end_turn"
+                )
+                return self._think()
+            return self.poll_interval * self.rng.uniform(0.8, 1.2)
+
+        if op == "reroll":
+            dice = [idx for idx in range(5) if self.rng.random() < 0.5] or [0]
+            _, _, data = self._call(
+                "POST /game/<id>/reroll",
+                "POST",
+                f"/game/{game_id}/reroll",
+                {"dice_to_reroll": dice},
+            )
+            remaining = (
+                data["game_state"]["current_turn"]["remaining_rerolls"]
+                if data and data.get("success")
+                else 0
+            )
+            self.next_op = (
+                "reroll" if remaining and self.rng.random() < 0.4 else "end_turn"
+            )
+            return self._think()
+
+        if op == "end_turn":
+            self._call("POST /game/<id>/end_turn", "POST", f"/game/{game_id}/end_turn")
+            self.next_op = "poll"
+            return 0.0
+
+        raise ValueError(f"Неизвестный шаг: {op}")
+
+
+def run_load(
+    games: int = 100,
+    players: int = 2,
+    workers: int = 8,
+    poll_interval: float = 1.0,
+    think_time: float = 0.5,
+    duration: Optional[float] = None,
+    url: Optional[str] = None,
+    seed: int = 0,
+) -> Dict:
+    """Прогоняет нагрузку и возвращает сводку (маршруты, пропускная способность)"""
+    recorder = LatencyRecorder()
+    rng = random.Random(seed)
+    clients: List[SimulatedClient] = []
+    for game in range(games):
+        table = _Table(players)
+        for seat in range(players):
+            transport = HttpTransport(url) if url else InProcessTransport()
+            clients.append(
+                SimulatedClient(
+                    transport,
+                    table,
+                    f"P{seat}",
+                    seat == 0,
+                    recorder,
+                    random.Random(rng.getrandbits(64)),
+                    poll_interval,
+                    think_time,
+                )
+            )
+
+    started = time.monotonic()
+    deadline = started + duration if duration else None
+    counter = itertools.count()
+    # Игры стартуют вразброс в течение первого интервала опроса
+    heap = [
+        (started + rng.uniform(0, poll_interval), next(counter), client)
+        for client in clients
+    ]
+    heapq.heapify(heap)
+    cond = threading.Condition()
+    in_flight = [0]
+
+    def worker():
+        while True:
+            with cond:
+                while True:
+                    now = time.monotonic()
+                    if deadline and now >= deadline:
+                        return
+                    if not heap:
+                        if in_flight[0] == 0:
+                            cond.notify_all()
+                            return
+                        cond.wait()
+                        continue
+                    due = heap[0][0]
+                    if due <= now:
+                        _, _, client = heapq.heappop(heap)
+                        in_flight[0] += 1
+                        break
+                    cond.wait(due - now)
+            try:
+                delay = client.step()
+            finally:
+                with cond:
+                    in_flight[0] -= 1
+                    if delay is not None:
+                        heapq.heappush(
+                            heap, (time.monotonic() + delay, next(counter), client)
+                        )
+                    cond.notify_all()
+
+    threads = [
+        threading.Thread(target=worker, name=f"loadgen-{idx}", daemon=True)
+        for idx in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    routes = recorder.summary(elapsed)
+    total = sum(row["requests"] for row in routes)
+    return {
+        "target": url or "in-process",
+        "games": games,
+        "clients": len(clients),
+        "completed_clients": sum(client.completed for client in clients),
+        "elapsed_s": elapsed,
+        "requests": total,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "routes": routes,
+    }
+
+
+_COLUMNS = ("route", "requests", "errors", "p50_ms", "p95_ms", "p99_ms", "max_ms", "rps")
+
+
+def write_csv(report: Dict, path: Path):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=_COLUMNS)
+        writer.writeheader()
+        for row in report["routes"]:
+            writer.writerow({key: row[key] for key in _COLUMNS})
+
+
+def write_json(report: Dict, path: Path):
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def print_report(report: Dict):
+    print(
+        f"цель: {report['target']}, клиентов: {report['clients']} "
+        f"(закончили партию: {report['completed_clients']}), "
+        f"время: {report['elapsed_s']:.1f} с"
+    )
+    print(f"{'маршрут':<26}{'запросов':>9}{'ошибок':>8}{'p50 мс':>9}{'p95 мс':>9}"
+          f"{'p99 мс':>9}{'max мс':>9}{'rps':>9}")
+    for row in report["routes"]:
+        print(
+            f"{row['route']:<26}{row['requests']:>9}{row['errors']:>8}"
+            f"{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}"
+            f"{row['max_ms']:>9.2f}{row['rps']:>9.1f}"
+        )
+    print(f"всего: {report['requests']} запросов, {report['throughput_rps']:.1f} rps")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Синтетическая нагрузка на сервер игр")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=8, help="потоков, выполняющих запросы")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="секунд между опросами")
+    parser.add_argument("--think-time", type=float, default=0.5, help="пауза игрока в свой ход")
+    parser.add_argument("--duration", type=float, help="остановить через N секунд")
+    parser.add_argument("--url", help="адрес запущенного сервера; без него — тестовый клиент")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", type=Path, help="выгрузить маршруты в CSV")
+    parser.add_argument("--json", type=Path, help="выгрузить отчёт в JSON")
+    args = parser.parse_args(argv)
+
+    report = run_load(
+        games=args.games,
+        players=args.players,
+        workers=args.workers,
+        poll_interval=args.poll_interval,
+        think_time=args.think_time,
+        duration=args.duration,
+        url=args.url,
+        seed=args.seed,
+    )
+    print_report(report)
+    if args.csv:
+        write_csv(report, args.csv)
+    if args.json:
+        write_json(report, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""Набор замеров горячих путей ядра и HTTP с проверкой регрессий.
+
+Каждый замер — время одной операции (лучшее из нескольких повторов,
+нс/операцию). Рядом замеряется эталонная работа, и с базовым файлом
+``benchmarks/baseline.json`` сравнивается время в единицах эталона:
+так меньше влияет частота процессора. Замедление больше порога —
+регрессия, скрипт завершается с кодом 1. Нужны только stdlib и
+зависимости проекта.
+
+Запуск:
+    python benchmarks/suite.py                  # сравнить с базой
+    python benchmarks/suite.py --save           # записать новую базу
+    python benchmarks/suite.py --threshold 0.5 --only state
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+for path in (PROJECT_ROOT, PROJECT_ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from src.core.game_logic import DicePokerGame, GameManager  # noqa: E402
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.3
+
+# Замер: функция подготовки возвращает вызываемый объект — одну операцию
+BENCHMARKS: Dict[str, Callable[[], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _rolls(count: int = 1024) -> List[List[int]]:
+    rng = random.Random(1)
+    return [[rng.randint(1, 6) for _ in range(5)] for _ in range(count)]
+
+
+def _active_game(players: int) -> DicePokerGame:
+    game = DicePokerGame("bench", max_players=4, seed=1)
+    for idx in range(players):
+        game.set_player_ready(game.add_player(f"P{idx}"))
+    game.start_game()
+    return game
+
+
+@benchmark("evaluate_combination")
+def _evaluate_combination():
+    game = DicePokerGame("bench")
+    rolls = itertools.cycle(_rolls())
+    return lambda: game._evaluate_combination(next(rolls))
+
+
+@benchmark("calculate_score")
+def _calculate_score():
+    game = DicePokerGame("bench")
+    pairs = [(game._evaluate_combination(r), r) for r in _rolls()]
+    items = itertools.cycle(pairs)
+
+    def run():
+        combination, dice = next(items)
+        return game._calculate_score(combination, dice)
+
+    return run
+
+
+def _state_benchmark(players: int, cached: bool):
+    def setup():
+        game = _active_game(players)
+        player_id = next(iter(game.players))
+
+        def run():
+            if not cached:
+                # Снимок сбрасывается — замеряется построение состояния
+                game._snapshot = None
+            return game.get_game_state(player_id)
+
+        return run
+
+    return setup
+
+
+for _players in (2, 3, 4):
+    benchmark(f"get_game_state_{_players}p")(_state_benchmark(_players, False))
+    benchmark(f"get_game_state_{_players}p_cached")(_state_benchmark(_players, True))
+
+
+@benchmark("manager_create_game")
+def _manager_create_game():
+    manager = GameManager()
+    return manager.create_game
+
+
+@benchmark("manager_get_game")
+def _manager_get_game():
+    manager = GameManager()
+    ids = [manager.create_game() for _ in range(1000)]
+    ids = itertools.cycle(ids)
+    return lambda: manager.get_game(next(ids))
+
+
+@benchmark("metrics_observe")
+def _metrics_observe():
+    from src.core.metrics import RequestMetrics
+
+    metrics = RequestMetrics()
+    return lambda: metrics.observe("/game/<game_id>/state", "GET", 200, 0.0004)
+
+
+@benchmark("profiler_wrap_disabled")
+def _profiler_wrap_disabled():
+    from src.core.profiling import RequestProfiler
+
+    def wsgi_app(environ, start_response):
+        return environ
+
+    # Выключенный профилировщик: обёртка только проверяет флаг
+    app = RequestProfiler("profiles").wrap(wsgi_app, lambda environ: "GET /")
+    environ = {}
+    return lambda: app(environ, None)
+
+
+@benchmark("http_full_game")
+def _http_full_game():
+    from src.app import app
+
+    app.config.update({"TESTING": True})
+
+    def run():
+        host = app.test_client()
+        guest = app.test_client()
+        game_id = host.post(
+            "/create_game", json={"max_players": 2, "max_rounds": 3}
+        ).get_json()["game_id"]
+        host.post("/join_game", json={"game_id": game_id, "player_name": "A"})
+        guest.post("/join_game", json={"game_id": game_id, "player_name": "B"})
+        host.post(f"/game/{game_id}/ready")
+        guest.post(f"/game/{game_id}/ready")
+        for _ in range(3):
+            for client in (host, guest):
+                client.post(f"/game/{game_id}/reroll", json={"dice_to_reroll": [0, 1]})
+                client.post(f"/game/{game_id}/end_turn")
+                client.get(f"/game/{game_id}/state")
+        state = host.get(f"/game/{game_id}/state").get_json()
+        assert state["status"] == "completed", state["status"]
+
+    return run
+
+
+def _calibration():
+    # Фиксированная чисто питоновская работа: по ней нормируются замеры,
+    # чтобы сравнение с базой меньше зависело от частоты процессора
+    data = list(range(64))
+    return lambda: sorted(data, key=lambda x: -x)
+
+
+def _calibrate(op: Callable[[], object], min_time: float) -> int:
+    """Число вызовов, при котором повтор длится не меньше ``min_time``"""
+    number = 1
+    while True:
+        elapsed = timeit.timeit(op, number=number)
+        if elapsed >= min_time / 4 or number >= 1 << 20:
+            break
+        number *= 4
+    return max(1, int(number * (min_time / max(elapsed, 1e-9))))
+
+
+def measure(
+    setup: Callable[[], Callable[[], object]],
+    repeat: int = 5,
+    min_time: float = 0.2,
+) -> Tuple[float, float]:
+    """Лучшее время одной операции и эталонной работы, нс.
+
+    Повторы замера и эталона чередуются, поэтому оба попадают в одни и те
+    же условия машины.
+    """
+    op, reference = setup(), _calibration()
+    number = _calibrate(op, min_time)
+    reference_number = _calibrate(reference, min_time / 4)
+    best = best_reference = float("inf")
+    for _ in range(repeat):
+        best = min(best, timeit.timeit(op, number=number) / number)
+        best_reference = min(
+            best_reference,
+            timeit.timeit(reference, number=reference_number) / reference_number,
+        )
+    return best * 1e9, best_reference * 1e9
+
+
+def run_suite(
+    only: Optional[str] = None, repeat: int = 5, min_time: float = 0.2
+) -> Dict[str, Dict[str, float]]:
+    """Результаты по замерам: нс/операцию и время в единицах эталона"""
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if only and only not in name:
+            continue
+        ns, reference_ns = measure(setup, repeat=repeat, min_time=min_time)
+        results[name] = {"ns_per_op": ns, "relative": ns / reference_ns}
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """Замеры, которые медленнее базы больше чем на ``threshold`` (по эталону)"""
+    return [
+        name
+        for name, case in results.items()
+        if name in baseline
+        and case["relative"] > baseline[name]["relative"] * (1 + threshold)
+    ]
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Dict[str, float]]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))["benchmarks"]
+
+
+def save_baseline(
+    results: Dict[str, Dict[str, float]], path: Path = BASELINE_PATH
+):
+    data = {
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": {
+            name: {
+                "ns_per_op": round(case["ns_per_op"], 1),
+                "relative": round(case["relative"], 4),
+            }
+            for name, case in sorted(results.items())
+        },
+    }
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def _format_ns(ns: float) -> str:
+    if ns >= 1e6:
+        return f"{ns / 1e6:.2f} мс"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.2f} мкс"
+    return f"{ns:.1f} нс"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Замеры горячих путей")
+    parser.add_argument("--save", action="store_true", help="записать результаты как базу")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="допустимое замедление относительно базы (0.3 = 30%%)",
+    )
+    parser.add_argument("--only", help="запускать замеры, в имени которых есть строка")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--output", type=Path, help="сохранить результаты в JSON")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.only, repeat=args.repeat, min_time=args.min_time)
+    baseline = {} if args.save else load_baseline(args.baseline)
+    regressions = set(compare(results, baseline, args.threshold))
+
+    for name, case in results.items():
+        line = f"{name:<28} {_format_ns(case['ns_per_op']):>12}"
+        if name in baseline:
+            base = baseline[name]
+            change = case["relative"] / base["relative"] - 1
+            mark = "  РЕГРЕССИЯ" if name in regressions else ""
+            line += f"   база {_format_ns(base['ns_per_op']):>12}  {change:+7.1%}{mark}"
+        print(line)
+
+    if args.output:
+        args.output.write_text(
+            json.dumps({"benchmarks": results}, indent=2) + "\n", encoding="utf-8"
+        )
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"база записана: {args.baseline}")
+        return 0
+    if regressions:
+        print(f"регрессии (порог {args.threshold:.0%}): {', '.join(sorted(regressions))}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
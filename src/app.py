@@ -1,11 +1,149 @@
-from flask import Flask, render_template, request, jsonify, session
-from core import GameManager
+import hmac
+import os
+import time
+
+from flask import Flask, Response, g, render_template, request, jsonify, session
+from werkzeug.exceptions import HTTPException
+from core import (
+    BOT_LEVELS,
+    DEFAULT_BOT_LEVEL,
+    BotScheduler,
+    GameEventBroker,
+    GameManager,
+    GameMetrics,
+    GameStatus,
+    LEADERBOARD_KEYS,
+    DEFAULT_LEADERBOARD,
+    LOAD_HEADER,
+    LOBBY_PAGE,
+    MAX_LEADERBOARD,
+    MAX_LOBBY_PAGE,
+    WORKER_HEADER,
+    Leaderboard,
+    MemoryGameStore,
+    RequestMetrics,
+    RequestProfiler,
+    SQLiteGameStore,
+    affine_id_factory,
+    diff_state,
+    encode_cursor,
+    render_metrics,
+)
 
 app = Flask(__name__)
-app.secret_key = "poker-dice-secret-key-2024"
+# В многопроцессном режиме ключ общий: cookie сессии читает любой процесс
+app.secret_key = os.environ.get("DICE_SECRET_KEY", "poker-dice-secret-key-2024")
+
+# Как часто отправлять keep-alive в поток событий, секунд
+EVENTS_HEARTBEAT = 15
+
+# Пауза перед каждым действием бота, секунд (чтобы люди успевали увидеть ход)
+BOT_DELAY = 0.8
+
+# Сколько операций принимает /game/<id>/actions за один запрос
+MAX_BATCH_ACTIONS = 16
+
+# Путь к базе SQLite для сохранения игр между перезапусками; без него
+# игры хранятся только в памяти
+DB_PATH = os.environ.get("DICE_DB_PATH")
+
+# Номер этого процесса и число процессов в многопроцессном режиме
+# (src/cluster.py); процесс создаёт только игры, которые принадлежат ему
+WORKER_INDEX = os.environ.get("DICE_WORKER_INDEX")
+WORKERS = int(os.environ.get("DICE_WORKERS", "1"))
+
+# Токен для /admin/*; без него административные маршруты закрыты
+app.config["ADMIN_TOKEN"] = os.environ.get("DICE_ADMIN_TOKEN")
+
+# Профилирование запросов: DICE_PROFILE=1 включает его при запуске,
+# DICE_PROFILE_RATE — доля профилируемых запросов, файлы pstats
+# пишутся в DICE_PROFILE_DIR
+PROFILE_DIR = os.environ.get("DICE_PROFILE_DIR", "profiles")
+PROFILE_RATE = float(os.environ.get("DICE_PROFILE_RATE", "0.01"))
+
+# Лимит игр в процессе (DICE_MAX_GAMES): сверх него вытесняются давно не
+# использованные игры. 100 000 ожидающих столов — около 140 МБ
+# (benchmarks/bench_game_memory.py)
+MAX_GAMES = int(os.environ.get("DICE_MAX_GAMES", "100000"))
+
+# Инициализация менеджера игр: брошенные игры вытесняются по простою,
+# общее число игр ограничено (активные лимитом не вытесняются)
+game_manager = GameManager(
+    idle_ttl={
+        GameStatus.WAITING: 30 * 60,
+        GameStatus.ACTIVE: 2 * 60 * 60,
+        GameStatus.COMPLETED: 10 * 60,
+    },
+    max_games=MAX_GAMES,
+    store=SQLiteGameStore(DB_PATH) if DB_PATH else MemoryGameStore(),
+    **(
+        {"id_factory": affine_id_factory(int(WORKER_INDEX), WORKERS)}
+        if WORKER_INDEX is not None
+        else {}
+    ),
+)
+# Уведомления об изменениях игр для потока /game/<id>/events
+events = GameEventBroker()
+
+
+def _publish_change(game, action):
+    events.publish(game.game_id)
+
+
+# Любое изменение игры (запрос игрока или ход бота) будит подписчиков
+game_manager.add_listener(_publish_change)
+
+# Ходы ботов во всех играх делает один поток
+bots = BotScheduler(game_manager, delay=BOT_DELAY)
+bots.start()
+
+# Статистика игроков по всем играм для /leaderboard
+leaderboard = Leaderboard(game_manager)
+
+# Сколько игроков можно запросить по имени (?player=...)
+MAX_LEADERBOARD_NAMES = 1000
+
+# Метрики для /metrics: задержки маршрутов и показатели игр
+request_metrics = RequestMetrics()
+game_metrics = GameMetrics(game_manager)
+
+
+def _route_of(environ):
+    """Шаблон маршрута запроса для профилировщика"""
+    method = environ.get("REQUEST_METHOD", "GET")
+    try:
+        rule, _ = app.url_map.bind_to_environ(environ).match(return_rule=True)
+    except HTTPException:
+        return f"{method} <unmatched>"
+    return f"{method} {rule.rule}"
+
+
+# Профилировщик оборачивает всё WSGI-приложение, чтобы в профиль попали
+# маршрутизация, сессия и сериализация ответа
+profiler = RequestProfiler(PROFILE_DIR, sample_rate=PROFILE_RATE)
+app.wsgi_app = profiler.wrap(app.wsgi_app, _route_of)
+if os.environ.get("DICE_PROFILE") == "1":
+    profiler.start()
 
-# Инициализация менеджера игр
-game_manager = GameManager()
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def _record_request_metrics(response):
+    started = g.pop("request_started", None)
+    if started is not None:
+        rule = request.url_rule.rule if request.url_rule else "<unmatched>"
+        request_metrics.observe(
+            rule, request.method, response.status_code, time.perf_counter() - started
+        )
+    if WORKER_INDEX is not None:
+        # Маршрутизатор выбирает по этому числу процесс для новой игры
+        response.headers[WORKER_HEADER] = WORKER_INDEX
+        response.headers[LOAD_HEADER] = str(len(game_manager))
+    return response
 
 
 @app.route("/")
@@ -24,6 +162,9 @@ def create_game():
     try:
         game_id = game_manager.create_game(max_players, max_rounds)
         return jsonify({"success": True, "game_id": game_id})
+    except ValueError as e:
+        # Неверные размеры игры
+        return jsonify({"success": False, "error": str(e)}), 400
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
@@ -43,7 +184,8 @@ def join_game():
         return jsonify({"success": False, "error": "Игра не найдена"})
 
     try:
-        player_id = game.add_player(player_name)
+        # ID игрока из сессии переиспользуется: так его игры находит /resume
+        player_id = game.add_player(player_name, session.get("player_id"))
         session["player_id"] = player_id
         session["game_id"] = game_id
         session["player_name"] = player_name
@@ -59,6 +201,49 @@ def join_game():
         return jsonify({"success": False, "error": str(e)})
 
 
+def _lobby_entry(game):
+    players = list(game.players.values())
+    free_seats = game.max_players - len(players)
+    return {
+        "game_id": game.game_id,
+        # Ключ игры в лобби: по нему маршрутизатор сливает списки процессов
+        "cursor": encode_cursor((free_seats, game._created_at, game.game_id)),
+        "players": [p.name for p in players],
+        "max_players": game.max_players,
+        "free_seats": free_seats,
+        "max_rounds": game.max_rounds,
+        "created_at": game.created_at.isoformat(timespec="seconds"),
+    }
+
+
+@app.route("/games")
+def open_games():
+    """Открытые игры: сначала самые заполненные, постранично по курсору"""
+    limit = request.args.get("limit", LOBBY_PAGE, type=int)
+    limit = max(1, min(limit, MAX_LOBBY_PAGE))
+    try:
+        games, cursor = game_manager.open_games(request.args.get("cursor"), limit)
+    except ValueError:
+        return jsonify({"success": False, "error": "Неверный курсор"}), 400
+    return jsonify(
+        {
+            "success": True,
+            "games": [_lobby_entry(game) for game in games],
+            "next_cursor": cursor,
+        }
+    )
+
+
+@app.route("/quick_match")
+def quick_match():
+    """Самая заполненная открытая игра для быстрого входа"""
+    game_id = game_manager.quick_match()
+    game = game_manager.get_game(game_id) if game_id else None
+    if game is None:
+        return jsonify({"success": False, "error": "Нет открытых игр"}), 404
+    return jsonify({"success": True, "game": _lobby_entry(game)})
+
+
 @app.route("/game/<game_id>")
 def game_page(game_id):
     """Страница игры"""
@@ -81,7 +266,67 @@ def get_game_state(game_id):
         return jsonify({"error": "Игра не найдена"}), 404
 
     player_id = session.get("player_id")
-    return jsonify(game.get_game_state(player_id))
+    with_hint = request.args.get("hint") == "1"
+
+    # Версия меняется при каждом изменении игры, в том числе при входе/выходе
+    etag = f"{game.version}-h" if with_hint else str(game.version)
+    since = request.args.get("since", type=int)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    elif since is not None and (
+        patch := game.get_state_patch(since, player_id, with_hint=with_hint)
+    ) is not None:
+        # Клиент знает версию since — отдаём только изменения после неё
+        response = jsonify({"since": since, "patch": patch})
+    else:
+        response = jsonify(game.get_game_state(player_id, with_hint=with_hint))
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@app.route("/game/<game_id>/events")
+def game_events(game_id):
+    """Поток Server-Sent Events: состояние игры при каждом её изменении"""
+    game = game_manager.get_game(game_id)
+    if not game:
+        return jsonify({"error": "Игра не найдена"}), 404
+
+    player_id = session.get("player_id")
+    # С ?patches=1 после первого состояния приходят только изменения
+    patches = request.args.get("patches") == "1"
+
+    def stream():
+        with events.subscribe(game_id) as subscription:
+            seen = subscription.sequence
+            changed = True
+            sent = None
+            while True:
+                if changed:
+                    state = game.get_game_state(player_id)
+                    if sent is None or not patches:
+                        yield f"id: {seen}\ndata: {app.json.dumps(state)}\n\n"
+                    elif state is not sent:
+                        # Дальше — только изменения относительно отправленного
+                        patch = diff_state(sent, state)
+                        yield f"id: {seen}\nevent: patch\ndata: {app.json.dumps(patch)}\n\n"
+                    sent = state
+                    if state["status"] == "completed":
+                        return
+                else:
+                    yield ": keep-alive\n\n"
+
+                current = subscription.wait(seen, EVENTS_HEARTBEAT)
+                if game_id not in game_manager:
+                    return
+                changed = current != seen
+                seen = current
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.route("/game/<game_id>/ready", methods=["POST"])
@@ -149,21 +394,174 @@ def end_turn(game_id):
     return jsonify({"success": False, "error": "Не удалось завершить ход"})
 
 
+@app.route("/game/<game_id>/actions", methods=["POST"])
+def apply_actions(game_id):
+    """Применяет несколько операций игрока за один запрос (все или ни одной)"""
+    game = game_manager.get_game(game_id)
+    if not game:
+        return jsonify({"success": False, "error": "Игра не найдена"})
+
+    player_id = session.get("player_id")
+    if not player_id:
+        return jsonify({"success": False, "error": "Игрок не авторизован"})
+
+    data = request.get_json(silent=True) or {}
+    operations = data.get("actions")
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"success": False, "error": "Неверные данные"})
+    if len(operations) > MAX_BATCH_ACTIONS:
+        return jsonify(
+            {"success": False, "error": f"Не больше {MAX_BATCH_ACTIONS} операций"}
+        )
+
+    try:
+        game.apply_batch(player_id, operations)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)})
+
+    return jsonify({"success": True, "game_state": game.get_game_state(player_id)})
+
+
+@app.route("/game/<game_id>/add_bot", methods=["POST"])
+def add_bot(game_id):
+    """Сажает за стол бота выбранного уровня"""
+    game = game_manager.get_game(game_id)
+    if not game:
+        return jsonify({"success": False, "error": "Игра не найдена"})
+
+    player_id = session.get("player_id")
+    if not player_id or player_id not in game.players:
+        return jsonify({"success": False, "error": "Игрок не найден"})
+
+    data = request.get_json(silent=True) or {}
+    level = data.get("level", DEFAULT_BOT_LEVEL)
+    if level not in BOT_LEVELS:
+        return jsonify({"success": False, "error": "Неизвестный уровень бота"})
+    name = data.get("name") or f"Бот {len(game.bots) + 1}"
+
+    try:
+        game.add_bot(name, level)
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)})
+
+    # Бот готов сразу: игра стартует, если готовы и все люди
+    game.start_game()
+    return jsonify({"success": True, "game_state": game.get_game_state(player_id)})
+
+
 @app.route("/game/<game_id>/leave", methods=["POST"])
 def leave_game(game_id):
     """Покидает игру"""
     game = game_manager.get_game(game_id)
-    if game and "player_id" in session:
-        player_id = session["player_id"]
-        if player_id in game.players:
-            del game.players[player_id]
+    player_id = session.get("player_id")
+    if game and player_id:
+        game.remove_player(player_id)
 
-    session.pop("player_id", None)
-    session.pop("game_id", None)
-    session.pop("player_name", None)
+    if session.get("game_id") == game_id:
+        session.pop("game_id", None)
+        session.pop("player_name", None)
+    # ID игрока остаётся: по нему /resume находит другие игры, в том числе
+    # в других процессах, о которых этот процесс не знает
 
     return jsonify({"success": True})
 
 
+@app.route("/resume")
+def resume():
+    """Незавершённые игры игрока из сессии — чтобы вернуться в них"""
+    player_id = session.get("player_id")
+    games = game_manager.games_of(player_id) if player_id else []
+    games = [game for game in games if game.status != GameStatus.COMPLETED]
+    if not games:
+        return jsonify({"success": False, "error": "Нет незавершённых игр"}), 404
+    # Сначала игра из сессии, затем более новые
+    current = session.get("game_id")
+    games.sort(key=lambda game: (game.game_id != current, -game._created_at))
+    return jsonify(
+        {
+            "success": True,
+            "player_id": player_id,
+            "games": [
+                {
+                    "game_id": game.game_id,
+                    "is_current": game.game_id == current,
+                    "created_at": game.created_at.isoformat(),
+                    "game_state": game.get_game_state(player_id),
+                }
+                for game in games
+            ],
+        }
+    )
+
+
+@app.route("/leaderboard")
+def leaderboard_top():
+    """Таблица лидеров по всем играм"""
+    by = request.args.get("by", DEFAULT_LEADERBOARD)
+    if by not in LEADERBOARD_KEYS:
+        return jsonify({"success": False, "error": "Неизвестная таблица"}), 400
+    names = request.args.getlist("player")
+    if names:
+        # Статистика названных игроков — маршрутизатор собирает её со всех процессов
+        players = [leaderboard.player(name) for name in names[:MAX_LEADERBOARD_NAMES]]
+        players = [player for player in players if player is not None]
+        return jsonify({"success": True, "by": by, "players": players})
+    limit = request.args.get("limit", 10, type=int)
+    limit = max(1, min(limit, MAX_LEADERBOARD))
+    return jsonify({"success": True, "by": by, "players": leaderboard.top(by, limit)})
+
+
+@app.route("/metrics")
+def metrics():
+    """Метрики сервиса в текстовом формате Prometheus"""
+    return Response(
+        render_metrics(request_metrics, game_metrics),
+        mimetype="text/plain; version=0.0.4",
+    )
+
+
+def _is_admin():
+    token = app.config.get("ADMIN_TOKEN")
+    supplied = request.headers.get("X-Admin-Token", "")
+    return bool(token) and hmac.compare_digest(supplied, token)
+
+
+@app.route("/admin/profiler", methods=["GET"])
+def profiler_status():
+    """Состояние окна профилирования"""
+    if not _is_admin():
+        return jsonify({"success": False, "error": "Нет доступа"}), 403
+    return jsonify({"success": True, **profiler.status()})
+
+
+@app.route("/admin/profiler/start", methods=["POST"])
+def profiler_start():
+    """Открывает окно профилирования"""
+    if not _is_admin():
+        return jsonify({"success": False, "error": "Нет доступа"}), 403
+    data = request.get_json(silent=True) or {}
+    sample_rate = data.get("sample_rate")
+    routes = data.get("routes") or {}
+    duration = data.get("duration")
+    rates = [sample_rate] if sample_rate is not None else []
+    rates += list(routes.values()) if isinstance(routes, dict) else [None]
+    if not all(isinstance(r, (int, float)) and 0 <= r <= 1 for r in rates):
+        return jsonify({"success": False, "error": "Доля выборки — число от 0 до 1"}), 400
+    if duration is not None and not (
+        isinstance(duration, (int, float)) and duration > 0
+    ):
+        return jsonify({"success": False, "error": "Некорректная длительность"}), 400
+    profiler.start(sample_rate=sample_rate, route_rates=routes, duration=duration)
+    return jsonify({"success": True, **profiler.status()})
+
+
+@app.route("/admin/profiler/stop", methods=["POST"])
+def profiler_stop():
+    """Закрывает окно профилирования и пишет файлы pstats"""
+    if not _is_admin():
+        return jsonify({"success": False, "error": "Нет доступа"}), 403
+    return jsonify({"success": True, **profiler.stop()})
+
+
 if __name__ == "__main__":
     app.run(debug=True, host="0.0.0.0", port=5000)
@@ -0,0 +1,160 @@
+"""Многопроцессный запуск: процессы-обработчики игр и фронтальный маршрутизатор.
+
+Каждый обработчик — отдельный процесс со своим ``GameManager``; игра живёт
+в процессе ``worker_for(game_id)``. Маршрутизаторы принимают запросы на
+общем порту (``SO_REUSEPORT``, ядро Linux распределяет соединения между
+ними) и пересылают их владельцу игры по локальному HTTP. Внешние сервисы
+не нужны. Ключ сессий общий для всех процессов.
+
+Запуск:
+    python -m src.cluster --workers 4 --port 5000
+    DICE_DB_PATH=games.db python -m src.cluster --workers 4   # games-0.db, ...
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import secrets
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+SRC_DIR = Path(__file__).resolve().parent
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+
+def _worker_db_path(path: str, index: int) -> str:
+    """Своя база SQLite для каждого обработчика: games.db -> games-0.db"""
+    base = Path(path)
+    return str(base.with_name(f"{base.stem}-{index}{base.suffix}"))
+
+
+def _listen(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(1024)
+    return sock
+
+
+def _serve(host: str, port: int, app, reuse_port: bool = False):
+    from werkzeug.serving import make_server
+
+    # Журнал каждого запроса в stderr заметно тормозит сервер под нагрузкой
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    # Сокет должен жить, пока работает сервер, иначе его дескриптор закроется
+    sock = _listen(host, port) if reuse_port else None
+    fd = sock.fileno() if sock is not None else None
+    make_server(host, port, app, threaded=True, fd=fd).serve_forever()
+
+
+def run_worker(index: int, workers: int, port: int, env: dict):
+    """Процесс-обработчик: приложение Flask с играми этого процесса"""
+    os.environ.update(env)
+    os.environ["DICE_WORKER_INDEX"] = str(index)
+    os.environ["DICE_WORKERS"] = str(workers)
+    from app import app
+
+    _serve("127.0.0.1", port, app)
+
+
+def run_router(host: str, port: int, worker_ports: List[int]):
+    """Процесс-маршрутизатор на общем порту"""
+    from core import Router
+
+    router = Router([("127.0.0.1", worker_port) for worker_port in worker_ports])
+    _serve(host, port, router, reuse_port=True)
+
+
+def _wait_ready(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Обработчик на порту {port} не запустился")
+            time.sleep(0.05)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Многопроцессный сервер игры")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--routers", type=int, help="процессов-маршрутизаторов (по умолчанию = workers)"
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument(
+        "--worker-port", type=int, help="порт первого обработчика (по умолчанию port+1)"
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers должно быть не меньше 1")
+
+    env = {"DICE_SECRET_KEY": os.environ.get("DICE_SECRET_KEY") or secrets.token_hex(32)}
+    db_path = os.environ.get("DICE_DB_PATH")
+    first_port = args.worker_port or args.port + 1
+    worker_ports = [first_port + index for index in range(args.workers)]
+
+    # spawn: каждый процесс заново импортирует приложение и создаёт свои потоки
+    context = multiprocessing.get_context("spawn")
+    processes = []
+    for index, worker_port in enumerate(worker_ports):
+        worker_env = dict(env)
+        if db_path:
+            worker_env["DICE_DB_PATH"] = _worker_db_path(db_path, index)
+        processes.append(
+            context.Process(
+                target=run_worker,
+                args=(index, args.workers, worker_port, worker_env),
+                name=f"dice-worker-{index}",
+                daemon=True,
+            )
+        )
+    for process in processes:
+        process.start()
+    for worker_port in worker_ports:
+        _wait_ready(worker_port)
+
+    routers = [
+        context.Process(
+            target=run_router,
+            args=(args.host, args.port, worker_ports),
+            name=f"dice-router-{index}",
+            daemon=True,
+        )
+        for index in range(args.routers or args.workers)
+    ]
+    for process in routers:
+        process.start()
+    processes += routers
+    print(
+        f"Сервер на http://{args.host}:{args.port}: "
+        f"{args.workers} обработчиков, {len(routers)} маршрутизаторов"
+    )
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        # Падение любого процесса останавливает весь сервер
+        while all(process.is_alive() for process in processes):
+            time.sleep(0.5)
+        return 1
+    except (KeyboardInterrupt, SystemExit):
+        return 0
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join(timeout=5)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
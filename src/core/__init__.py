@@ -6,6 +6,21 @@ from .game_logic import (
     Player,
     Turn,
 )
+from .history import TurnLog
+from .events import GameEventBroker
+from .bots import BOT_LEVELS, DEFAULT_BOT_LEVEL, BotScheduler
+from .leaderboard import (
+    DEFAULT_LEADERBOARD,
+    LEADERBOARD_KEYS,
+    MAX_LEADERBOARD,
+    Leaderboard,
+)
+from .metrics import GameMetrics, RequestMetrics, render_metrics
+from .profiling import RequestProfiler
+from .delta import apply_patch, diff_state
+from .lobby import LOBBY_PAGE, MAX_LOBBY_PAGE, encode_cursor
+from .routing import LOAD_HEADER, WORKER_HEADER, Router, affine_id_factory, worker_for
+from .storage import GameStore, MemoryGameStore, SQLiteGameStore
 
 __all__ = [
     "GameManager",
@@ -14,4 +29,30 @@ __all__ = [
     "GameStatus",
     "Player",
     "Turn",
+    "TurnLog",
+    "GameEventBroker",
+    "BotScheduler",
+    "BOT_LEVELS",
+    "DEFAULT_BOT_LEVEL",
+    "Leaderboard",
+    "LEADERBOARD_KEYS",
+    "DEFAULT_LEADERBOARD",
+    "MAX_LEADERBOARD",
+    "GameMetrics",
+    "RequestMetrics",
+    "render_metrics",
+    "RequestProfiler",
+    "LOBBY_PAGE",
+    "MAX_LOBBY_PAGE",
+    "encode_cursor",
+    "diff_state",
+    "apply_patch",
+    "Router",
+    "affine_id_factory",
+    "worker_for",
+    "WORKER_HEADER",
+    "LOAD_HEADER",
+    "GameStore",
+    "MemoryGameStore",
+    "SQLiteGameStore",
 ]
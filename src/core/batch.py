@@ -0,0 +1,73 @@
+"""Векторизованная оценка большого числа бросков (NumPy)"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .scoring import COMBINATION_CODES, SCORE_TABLE, Combination, DICE_COUNT
+
+_FACES = 6
+
+_FIVE = COMBINATION_CODES[Combination.FIVE_OF_A_KIND]
+_FOUR = COMBINATION_CODES[Combination.FOUR_OF_A_KIND]
+_FULL_HOUSE = COMBINATION_CODES[Combination.FULL_HOUSE]
+_STRAIGHT = COMBINATION_CODES[Combination.STRAIGHT]
+_THREE = COMBINATION_CODES[Combination.THREE_OF_A_KIND]
+_TWO_PAIRS = COMBINATION_CODES[Combination.TWO_PAIRS]
+_ONE_PAIR = COMBINATION_CODES[Combination.ONE_PAIR]
+_HIGH_DIE = COMBINATION_CODES[Combination.HIGH_DIE]
+
+
+def count_faces(rolls: np.ndarray) -> np.ndarray:
+    """Возвращает массив N×6: сколько раз выпала каждая грань в каждом броске"""
+    n = rolls.shape[0]
+    offsets = (rolls - 1) + _FACES * np.arange(n, dtype=np.int64)[:, None]
+    counts = np.bincount(offsets.ravel(), minlength=_FACES * n)
+    return counts.reshape(n, _FACES)
+
+
+def evaluate_batch(
+    rolls, score_table: Dict[Combination, int] = SCORE_TABLE
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Оценивает массив бросков N×5.
+
+    Возвращает пару массивов длины N: коды комбинаций (индексы в
+    ``scoring.COMBINATIONS``) и очки по ``score_table``.
+    """
+    rolls = np.asarray(rolls)
+    if rolls.ndim != 2 or rolls.shape[1] != DICE_COUNT:
+        raise ValueError("Ожидается массив бросков формы N×5")
+    if not np.issubdtype(rolls.dtype, np.integer):
+        raise ValueError("Значения костей должны быть целыми")
+    rolls = rolls.astype(np.int64, copy=False)
+    if rolls.size and (rolls.min() < 1 or rolls.max() > _FACES):
+        raise ValueError("Значения костей должны быть в диапазоне 1..6")
+
+    counts = count_faces(rolls)
+    ordered = np.sort(counts, axis=1)
+    top = ordered[:, -1]
+    second = ordered[:, -2]
+    # Все кости разные: стрит, если отсутствует единица или шестёрка
+    straight = (top == 1) & ((counts[:, 0] == 0) | (counts[:, -1] == 0))
+
+    codes = np.select(
+        [
+            top == 5,
+            top == 4,
+            (top == 3) & (second == 2),
+            top == 3,
+            (top == 2) & (second == 2),
+            top == 2,
+            straight,
+        ],
+        [_FIVE, _FOUR, _FULL_HOUSE, _THREE, _TWO_PAIRS, _ONE_PAIR, _STRAIGHT],
+        default=_HIGH_DIE,
+    ).astype(np.uint8)
+
+    payouts = np.zeros(len(COMBINATION_CODES), dtype=np.int32)
+    for combination, points in score_table.items():
+        payouts[COMBINATION_CODES[combination]] = points
+    scores = payouts[codes]
+    high_die = codes == _HIGH_DIE
+    scores[high_die] = rolls[high_die].max(axis=1)
+    return codes, scores
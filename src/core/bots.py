@@ -0,0 +1,145 @@
+"""Боты за игровым столом: ходы всех ботов делает один планировщик"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from .game_logic import DicePokerGame, GameStatus
+from .simulator import STRATEGIES, Strategy
+
+if TYPE_CHECKING:
+    from .game_logic import GameManager
+
+# Уровень бота -> стратегия переброса: от случайной до максимума матожидания
+BOT_LEVELS: Dict[str, Strategy] = {
+    "easy": STRATEGIES["random"],
+    "medium": STRATEGIES["greedy"],
+    "hard": STRATEGIES["optimal"],
+}
+DEFAULT_BOT_LEVEL = "medium"
+
+
+class BotScheduler:
+    """Делает ходы ботов во всех играх менеджера в одном потоке.
+
+    Планировщик подписан на изменения игр: если после изменения ходит бот,
+    игра кладётся в кучу со сроком ``now + delay``. Поток забирает созревшие
+    записи и делает за бота один шаг — переброс или конец хода. Этот шаг
+    снова вызывает подписчика, поэтому ход продолжается сам. Запись, версия
+    игры в которой устарела, пропускается.
+    """
+
+    def __init__(
+        self,
+        manager: "GameManager",
+        delay: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.manager = manager
+        self.delay = delay
+        self._clock = clock
+        self._rng = rng or random.Random()
+        # (срок, порядковый номер, game_id, версия игры)
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        manager.add_listener(self._on_change)
+
+    def _on_change(self, game: DicePokerGame, action: Dict):
+        # Вызывается под блокировкой игры, поэтому шаг только ставится в очередь
+        self.schedule(game)
+
+    def schedule(self, game: DicePokerGame):
+        """Ставит игру в очередь, если сейчас ходит бот"""
+        if game.status != GameStatus.ACTIVE or not game.bots:
+            return
+        player = game.get_current_player()
+        if player is None or player.id not in game.bots:
+            return
+        entry = (
+            self._clock() + self.delay,
+            next(self._counter),
+            game.game_id,
+            game.version,
+        )
+        with self._cond:
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                self._cond.notify()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """Делает все шаги ботов со сроком не позже ``now``; возвращает их число"""
+        now = self._clock() if now is None else now
+        done = 0
+        while True:
+            with self._cond:
+                if not self._heap or self._heap[0][0] > now:
+                    return done
+                _, _, game_id, version = heapq.heappop(self._heap)
+            if self._step(game_id, version):
+                done += 1
+
+    def _step(self, game_id: str, version: int) -> bool:
+        game = self.manager.get_game(game_id)
+        if game is None:
+            return False
+        with game.lock:
+            if game.version != version or game.status != GameStatus.ACTIVE:
+                return False
+            player = game.get_current_player()
+            level = game.bots.get(player.id) if player else None
+            if level is None:
+                return False
+            strategy = BOT_LEVELS.get(level, BOT_LEVELS[DEFAULT_BOT_LEVEL])
+            to_reroll = None
+            if game.remaining_rerolls > 0:
+                to_reroll = strategy(game, player.id, self._rng)
+            if not to_reroll or not game.reroll_dice(player.id, to_reroll):
+                game.end_turn(player.id)
+        return True
+
+    def start(self):
+        """Запускает поток планировщика и подхватывает уже идущие игры"""
+        if self._thread is not None:
+            return
+        self._stopped = False
+        for game in self.manager.games.values():
+            with game.lock:
+                self.schedule(game)
+        self._thread = threading.Thread(
+            target=self._run, name="bot-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                wait = self._heap[0][0] - self._clock()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+            self.run_due()
@@ -0,0 +1,113 @@
+"""Разница между двумя снимками состояния игры для клиента.
+
+Патч — словарь только с изменившимися полями состояния:
+
+- поля верхнего уровня (``status``, ``current_round``, ``winner``,
+  ``version`` и т.д.) — новым значением;
+- ``players`` — ``{"changed": {id: {поле: значение}}, "order": [id, ...]}``:
+  изменившиеся поля игроков (у нового игрока — все) и порядок, если он
+  изменился (вход, выход, обгон по очкам); если изменились все игроки —
+  список целиком;
+- ``turn`` — изменения текущего хода: ``roll`` как ``{индекс: значение}``
+  и изменившиеся ``remaining_rerolls``/``combination``;
+- ``current_turn`` — ход целиком, когда он начался или закончился.
+
+``apply_patch`` собирает из старого состояния и патча новое (так же
+делает ``script.js``).
+"""
+
+from typing import Dict, List, Optional
+
+
+def _diff_players(old: List[Dict], new: List[Dict]) -> Dict:
+    before = {player["id"]: player for player in old}
+    changed = {}
+    for player in new:
+        previous = before.get(player["id"])
+        if previous is None:
+            changed[player["id"]] = player
+            continue
+        fields = {key: value for key, value in player.items() if previous.get(key) != value}
+        if fields:
+            changed[player["id"]] = fields
+    patch: Dict = {}
+    if changed:
+        patch["changed"] = changed
+    order = [player["id"] for player in new]
+    if order != [player["id"] for player in old]:
+        patch["order"] = order
+    return patch
+
+
+def _diff_turn(old: Dict, new: Dict) -> Optional[Dict]:
+    """Изменения хода или ``None``, если его проще передать целиком"""
+    if set(old) != set(new) or len(old["roll"]) != len(new["roll"]):
+        return None
+    patch = {
+        key: value
+        for key, value in new.items()
+        if key != "roll" and old[key] != value
+    }
+    dice = {
+        str(idx): value
+        for idx, (before, value) in enumerate(zip(old["roll"], new["roll"]))
+        if before != value
+    }
+    if dice:
+        patch["roll"] = dice
+    return patch
+
+
+def diff_state(old: Dict, new: Dict) -> Dict:
+    """Патч, превращающий состояние ``old`` в ``new``"""
+    patch: Dict = {}
+    for key, value in new.items():
+        before = old.get(key)
+        if key == "players":
+            players = _diff_players(before or [], value)
+            if value and len(players.get("changed", ())) == len(value):
+                # Изменились все игроки — список целиком короче
+                patch["players"] = value
+            elif players:
+                patch["players"] = players
+        elif key == "current_turn":
+            if before is None or value is None:
+                if before != value:
+                    patch["current_turn"] = value
+                continue
+            turn = _diff_turn(before, value)
+            if turn is None:
+                patch["current_turn"] = value
+            elif turn:
+                patch["turn"] = turn
+        elif before != value:
+            patch[key] = value
+    return patch
+
+
+def apply_patch(state: Dict, patch: Dict) -> Dict:
+    """Новое состояние из старого и патча (старое не изменяется)"""
+    result = dict(state)
+    for key, value in patch.items():
+        if key == "players" and isinstance(value, list):
+            result["players"] = value
+        elif key == "players":
+            players = {player["id"]: player for player in state["players"]}
+            for player_id, fields in value.get("changed", {}).items():
+                players[player_id] = dict(players.get(player_id, {}), **fields)
+            order = value.get("order") or [player["id"] for player in state["players"]]
+            result["players"] = [players[player_id] for player_id in order]
+        elif key == "turn":
+            turn = dict(result["current_turn"])
+            for field, change in value.items():
+                if field == "roll":
+                    roll = list(turn["roll"])
+                    for idx, die in change.items():
+                        roll[int(idx)] = die
+                    turn["roll"] = roll
+                else:
+                    turn[field] = change
+            result["current_turn"] = turn
+        else:
+            result[key] = value
+    return result
@@ -0,0 +1,69 @@
+"""Детерминированный поток бросков кубиков для одной игры"""
+
+import hashlib
+import secrets
+from typing import List, Tuple
+
+# Байт 0..251 даёт грань 1..6 (252 = 42 * 6, поэтому грани равновероятны),
+# байты 252..255 отбрасываются
+_FACES = bytes(b % 6 + 1 for b in range(252)) + bytes(4)
+_REJECTED = bytes(range(252, 256))
+_BLOCK_SIZE = 64
+_SEED_BITS = 63
+
+
+def new_seed() -> int:
+    """Случайное зерно; 63 бита помещаются в INTEGER SQLite и в JSON"""
+    return secrets.randbits(_SEED_BITS)
+
+
+class DiceStream:
+    """Кости из буфера, который пополняется блоками по 64 байта.
+
+    Блок ``n`` — BLAKE2b от номера блока с зерном в качестве ключа, поэтому
+    поток целиком задаётся зерном, а позиция в нём — парой (число блоков,
+    смещение в последнем). Бросок кости — чтение байта из буфера.
+    """
+
+    __slots__ = ("seed", "_key", "_blocks", "_buffer", "_pos")
+
+    def __init__(self, seed: int, blocks: int = 0, pos: int = 0):
+        if not 0 <= seed < 1 << 64:
+            raise ValueError("Зерно должно быть целым от 0 до 2**64")
+        self.seed = seed
+        self._key = seed.to_bytes(8, "little")
+        self._blocks = 0
+        self._buffer = b""
+        self._pos = 0
+        if blocks:
+            # Восстанавливаем последний выданный блок и позицию в нём
+            self._blocks = blocks - 1
+            self._refill()
+            self._pos = pos
+
+    def state(self) -> Tuple[int, int]:
+        """Позиция в потоке для ``DiceStream(seed, *state)``"""
+        return self._blocks, self._pos
+
+    def _refill(self):
+        raw = hashlib.blake2b(
+            self._blocks.to_bytes(8, "little"), digest_size=_BLOCK_SIZE, key=self._key
+        ).digest()
+        self._blocks += 1
+        self._buffer = raw.translate(_FACES, _REJECTED)
+        self._pos = 0
+
+    def roll(self, count: int) -> List[int]:
+        """Следующие ``count`` костей"""
+        end = self._pos + count
+        if end <= len(self._buffer):
+            dice = list(self._buffer[self._pos : end])
+            self._pos = end
+            return dice
+        dice = list(self._buffer[self._pos :])
+        while len(dice) < count:
+            self._refill()
+            take = min(count - len(dice), len(self._buffer))
+            dice.extend(self._buffer[:take])
+            self._pos = take
+        return dice
@@ -0,0 +1,75 @@
+"""Уведомления об изменениях игр для потоковых подписчиков (SSE)"""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+class _Channel:
+    __slots__ = ("condition", "sequence", "subscribers")
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.sequence = 0
+        self.subscribers = 0
+
+
+class Subscription:
+    """Подписка на изменения одной игры"""
+
+    def __init__(self, channel: _Channel):
+        self._channel = channel
+
+    @property
+    def sequence(self) -> int:
+        return self._channel.sequence
+
+    def wait(self, seen: int, timeout: Optional[float] = None) -> int:
+        """Ждёт изменения после ``seen`` и возвращает новый номер.
+
+        По таймауту возвращает ``seen`` без изменений.
+        """
+        channel = self._channel
+        with channel.condition:
+            channel.condition.wait_for(lambda: channel.sequence != seen, timeout)
+            return channel.sequence
+
+
+class GameEventBroker:
+    """Счётчик изменений на игру с пробуждением ожидающих подписчиков.
+
+    Каналы создаются только для игр, у которых есть подписчики, поэтому
+    ``publish`` без подписчиков — одна проверка словаря.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels: Dict[str, _Channel] = {}
+
+    def publish(self, game_id: str):
+        """Сообщает подписчикам, что игра изменилась"""
+        channel = self._channels.get(game_id)
+        if channel is None:
+            return
+        with channel.condition:
+            channel.sequence += 1
+            channel.condition.notify_all()
+
+    def subscriber_count(self, game_id: str) -> int:
+        channel = self._channels.get(game_id)
+        return channel.subscribers if channel else 0
+
+    @contextmanager
+    def subscribe(self, game_id: str) -> Iterator[Subscription]:
+        with self._lock:
+            channel = self._channels.get(game_id)
+            if channel is None:
+                channel = self._channels[game_id] = _Channel()
+            channel.subscribers += 1
+        try:
+            yield Subscription(channel)
+        finally:
+            with self._lock:
+                channel.subscribers -= 1
+                if channel.subscribers == 0:
+                    del self._channels[game_id]
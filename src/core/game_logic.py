@@ -1,22 +1,35 @@
 """Основная логика игры в покер на костях"""
 
-import random
-from typing import List, Dict, Optional
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from typing import TYPE_CHECKING, Callable, Deque, Iterable, List, Dict, Optional, Set, Tuple
 from enum import Enum
 from dataclasses import dataclass
 from datetime import datetime
-import uuid
+import functools
+import secrets
 
+from .delta import diff_state
+from .dice import DiceStream, new_seed
+from .history import Turn, TurnLog
+from .lobby import LOBBY_PAGE, LobbyIndex, decode_cursor, encode_cursor
+from .scoring import Combination, evaluate_roll, score_roll
+from .solver import solver_for
 
-class Combination(Enum):
-    FIVE_OF_A_KIND = "Пять одинаковых"
-    FOUR_OF_A_KIND = "Четыре одинаковых"
-    FULL_HOUSE = "Фулл-хаус"
-    STRAIGHT = "Стрит"
-    THREE_OF_A_KIND = "Три одинаковых"
-    TWO_PAIRS = "Две пары"
-    ONE_PAIR = "Одна пара"
-    HIGH_DIE = "Старшая кость"
+if TYPE_CHECKING:
+    from .storage import GameStore
+
+# Сколько предыдущих снимков состояния хранится для патчей; клиент,
+# отставший сильнее, получает полное состояние
+STATE_HISTORY = 4
+
+# Наибольшее число раундов игры: номер раунда хранится в истории ходов
+# двухбайтовым числом (см. TurnLog), с большим запасом
+MAX_ROUNDS = 1000
+
+# Подписчик на изменения игр: listener(игра, действие)
+GameListener = Callable[["DicePokerGame", Dict], None]
 
 
 class GameStatus(Enum):
@@ -25,7 +38,7 @@ class GameStatus(Enum):
     COMPLETED = "completed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     id: str
     name: str
@@ -33,44 +46,241 @@ class Player:
     is_ready: bool = False
 
 
-@dataclass
-class Turn:
-    player_id: str
-    roll: List[int]
-    combination: Combination
-    score: int
-    round_number: int
-    timestamp: datetime
+def _locked(method):
+    """Выполняет метод игры под её блокировкой"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _new_id() -> str:
+    """Короткий случайный ID: 96 бит в 16 символах URL-safe base64"""
+    return secrets.token_urlsafe(12)
+
+
+def _parse_operation(operation: Dict) -> Tuple[str, Optional[List[int]]]:
+    """Операция пакета ``(op, dice)``; неверный формат — ValueError"""
+    op = operation.get("op") if isinstance(operation, dict) else None
+    if op == "reroll":
+        dice = operation.get("dice", [])
+        if not isinstance(dice, list) or not all(isinstance(idx, int) for idx in dice):
+            raise ValueError("Индексы костей должны быть списком чисел")
+        return op, dice
+    if op in ("end_turn", "ready"):
+        return op, None
+    raise ValueError(f"Неизвестная операция: {op}")
 
 
 class DicePokerGame:
-    def __init__(self, game_id: str, max_players: int = 4, max_rounds: int = 3):
+    # Без __dict__: на сервере одновременно живут десятки тысяч игр
+    __slots__ = (
+        "game_id",
+        "max_players",
+        "max_rounds",
+        "max_rerolls",
+        "score_table",
+        "players",
+        "status",
+        "current_round",
+        "current_player_index",
+        "current_roll",
+        "remaining_rerolls",
+        "version",
+        "lock",
+        "on_change",
+        "bots",
+        "seed",
+        "_dice",
+        "_turns",
+        "_created_at",
+        "_seats",
+        "_ranking",
+        "_join_order",
+        "_joined",
+        "_snapshot",
+        "_recent",
+    )
+
+    def __init__(
+        self,
+        game_id: str,
+        max_players: int = 4,
+        max_rounds: int = 3,
+        max_rerolls: int = 2,
+        score_table: Optional[Dict[Combination, int]] = None,
+        seed: Optional[int] = None,
+    ):
         self.game_id = game_id
         self.max_players = max_players
         self.max_rounds = max_rounds
+        self.max_rerolls = max_rerolls
+        # None — стандартная таблица очков (SCORE_TABLE)
+        self.score_table = score_table
         self.players: Dict[str, Player] = {}
         self.status = GameStatus.WAITING
         self.current_round = 1
         self.current_player_index = 0
         self.current_roll = []
-        self.remaining_rerolls = 2
-        self.turns_history: List[Turn] = []
-        self.created_at = datetime.now()
+        self.remaining_rerolls = max_rerolls
+        # Боты за столом: ID игрока -> уровень (см. core.bots.BOT_LEVELS)
+        self.bots: Dict[str, str] = {}
+        # Зерно задаёт все броски игры; поток костей создаётся при первом броске
+        self.seed = new_seed() if seed is None else seed
+        self._dice: Optional[DiceStream] = None
+        # История создаётся при первом ходе, у ожидающих игр её нет
+        self._turns: Optional[TurnLog] = None
+        self._created_at = time.time()
+        # Растёт при каждом изменении состояния (для ETag и подписчиков)
+        self.version = 0
+        # Порядок ходов; current_player_index — индекс в этом списке
+        self._seats: List[Player] = []
+        # Игроки по убыванию очков; при равенстве — в порядке входа
+        self._ranking: List[Player] = []
+        self._join_order: Dict[str, int] = {}
+        self._joined = 0
+        # (версия, состояние) последнего построенного снимка
+        self._snapshot: Optional[tuple] = None
+        # Предыдущие снимки для патчей get_state_patch; создаётся, когда
+        # снимок сменяется впервые
+        self._recent: Optional[Deque[tuple]] = None
+        # Все изменения состояния выполняются под этой блокировкой
+        self.lock = threading.RLock()
+        # Вызывается после каждого изменения: on_change(игра, действие)
+        self.on_change: Optional[GameListener] = None
+
+    @property
+    def turns_history(self) -> TurnLog:
+        if self._turns is None:
+            self._turns = TurnLog()
+        return self._turns
+
+    @property
+    def turns_played(self) -> int:
+        """Число сыгранных ходов без создания истории"""
+        return len(self._turns) if self._turns is not None else 0
+
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self._created_at)
+
+    @created_at.setter
+    def created_at(self, value: datetime):
+        self._created_at = value.timestamp()
+
+    def _touch(self, op: str, **details):
+        """Отмечает изменение состояния игры и сообщает о нём подписчику.
 
-    def add_player(self, player_name: str) -> str:
-        """Добавляет игрока в игру и возвращает его ID"""
+        Действие содержит всё, чтобы повторить его через ``apply_action``,
+        включая бросок после изменения; ``completed`` — это действие
+        завершило партию.
+        """
+        self.version += 1
+        if self.on_change is not None:
+            details["op"] = op
+            details["roll"] = list(self.current_roll)
+            self.on_change(self, details)
+
+    @_locked
+    def add_player(self, player_name: str, player_id: Optional[str] = None) -> str:
+        """Добавляет игрока в игру и возвращает его ID.
+
+        ``player_id`` — ID игрока из других игр: один игрок может
+        участвовать в нескольких играх под одним ID.
+        """
+        self._check_new_player(player_name)
+        if player_id is not None and player_id in self.players:
+            raise ValueError("Вы уже в этой игре")
+        if player_id is None:
+            player_id = _new_id()
+        self._add_player(player_id, player_name)
+        return player_id
+
+    @_locked
+    def add_bot(self, player_name: str, level: str) -> str:
+        """Добавляет бота; бот сразу готов, ходы за него делает BotScheduler"""
+        self._check_new_player(player_name)
+        player_id = _new_id()
+        self._add_player(player_id, player_name, bot=level)
+        self.set_player_ready(player_id)
+        return player_id
+
+    def _check_new_player(self, player_name: str):
         if len(self.players) >= self.max_players:
             raise ValueError("Достигнуто максимальное количество игроков")
 
         if any(p.name == player_name for p in self.players.values()):
             raise ValueError("Игрок с таким именем уже существует")
 
-        player_id = str(uuid.uuid4())
-        self.players[player_id] = Player(id=player_id, name=player_name)
-        return player_id
+    def _add_player(
+        self, player_id: str, player_name: str, bot: Optional[str] = None
+    ):
+        player = Player(id=player_id, name=player_name)
+        self.players[player_id] = player
+        self._seats.append(player)
+        self._join_order[player_id] = self._joined
+        self._joined += 1
+        # Очки неотрицательны, новый игрок с нулём всегда последний
+        self._ranking.append(player)
+        if bot is None:
+            self._touch("add_player", player_id=player_id, name=player_name)
+        else:
+            self.bots[player_id] = bot
+            self._touch("add_player", player_id=player_id, name=player_name, bot=bot)
 
+    @_locked
+    def remove_player(self, player_id: str) -> bool:
+        """Удаляет игрока из игры, сохраняя очередь ходов"""
+        if player_id not in self.players:
+            return False
+        was_active = self.status == GameStatus.ACTIVE
+        player = self.players.pop(player_id)
+        self.bots.pop(player_id, None)
+        self._ranking.remove(player)
+        del self._join_order[player_id]
+
+        seat = self._seats.index(player)
+        del self._seats[seat]
+        if self.status == GameStatus.ACTIVE:
+            if not self._seats:
+                self.status = GameStatus.COMPLETED
+            elif seat < self.current_player_index:
+                self.current_player_index -= 1
+            elif seat == self.current_player_index:
+                # Ушёл текущий игрок: ход получает следующий, занявший его место
+                self._begin_seat_turn()
+        elif self.current_player_index >= len(self._seats):
+            self.current_player_index = 0
+
+        if was_active and self.status == GameStatus.COMPLETED:
+            # Ушёл тот, кто ходил последним, — партия завершена
+            self._touch("remove_player", player_id=player_id, completed=True)
+        else:
+            self._touch("remove_player", player_id=player_id)
+        return True
+
+    def _rank_key(self, player: Player) -> tuple:
+        return (-player.score, self._join_order[player.id])
+
+    def _update_ranking(self, player: Player):
+        """Сдвигает игрока вверх по таблице после роста его очков"""
+        ranking = self._ranking
+        idx = ranking.index(player)
+        key = self._rank_key(player)
+        while idx > 0 and self._rank_key(ranking[idx - 1]) > key:
+            ranking[idx] = ranking[idx - 1]
+            idx -= 1
+        ranking[idx] = player
+
+    @_locked
     def start_game(self) -> bool:
         """Начинает игру, если готовы все игроки"""
+        if self.status != GameStatus.WAITING:
+            return False
+
         if len(self.players) < 2:
             return False
 
@@ -79,23 +289,26 @@ class DicePokerGame:
 
         self.status = GameStatus.ACTIVE
         self._start_new_turn()
+        self._touch("start")
         return True
 
     def _start_new_turn(self):
         """Начинает ход текущего игрока"""
         self.current_roll = self._roll_dice(5)
-        self.remaining_rerolls = 2
+        self.remaining_rerolls = self.max_rerolls
 
     def _roll_dice(self, count: int) -> List[int]:
-        return [random.randint(1, 6) for _ in range(count)]
+        if self._dice is None:
+            self._dice = DiceStream(self.seed)
+        return self._dice.roll(count)
 
     def get_current_player(self) -> Optional[Player]:
         """Возвращает текущего игрока"""
-        if not self.players:
+        if not self._seats:
             return None
-        player_ids = list(self.players.keys())
-        return self.players[player_ids[self.current_player_index]]
+        return self._seats[self.current_player_index]
 
+    @_locked
     def reroll_dice(self, player_id: str, dice_to_reroll: List[int]) -> bool:
         """Перебрасывает выбранные кости"""
         if self.status != GameStatus.ACTIVE:
@@ -109,13 +322,15 @@ class DicePokerGame:
             return False
 
         # Перебрасываем выбранные кости
-        for idx in dice_to_reroll:
-            if 0 <= idx < 5:
-                self.current_roll[idx] = random.randint(1, 6)
+        selected = [idx for idx in dice_to_reroll if 0 <= idx < 5]
+        for idx, value in zip(selected, self._roll_dice(len(selected))):
+            self.current_roll[idx] = value
 
         self.remaining_rerolls -= 1
+        self._touch("reroll", player_id=player_id, dice=list(dice_to_reroll))
         return True
 
+    @_locked
     def end_turn(self, player_id: str) -> bool:
         """Завершает ход текущего игрока"""
         if self.status != GameStatus.ACTIVE:
@@ -126,32 +341,44 @@ class DicePokerGame:
             return False
 
         # Вычисляем комбинацию и очки
-        combination = self._evaluate_combination(self.current_roll)
-        score = self._calculate_score(combination, self.current_roll)
+        combination, score = evaluate_roll(self.current_roll)
+        if self.score_table is not None:
+            score = score_roll(combination, self.current_roll, self.score_table)
 
         # Обновляем счет игрока
         current_player.score += score
+        self._update_ranking(current_player)
 
         # Сохраняем ход в историю
-        turn = Turn(
-            player_id=current_player.id,
-            roll=self.current_roll.copy(),
-            combination=combination,
-            score=score,
-            round_number=self.current_round,
-            timestamp=datetime.now(),
+        timestamp = time.time()
+        self.turns_history.record(
+            current_player.id,
+            self.current_roll,
+            combination,
+            score,
+            self.current_round,
+            timestamp,
         )
-        self.turns_history.append(turn)
 
         # Переходим к следующему игроку или раунду
-        return self._next_turn()
+        result = self._next_turn()
+        if self.status == GameStatus.COMPLETED:
+            self._touch(
+                "end_turn", player_id=player_id, timestamp=timestamp, completed=True
+            )
+        else:
+            self._touch("end_turn", player_id=player_id, timestamp=timestamp)
+        return result
 
     def _next_turn(self) -> bool:
         """Переходит к следующему ходу"""
         self.current_player_index += 1
+        return self._begin_seat_turn()
 
+    def _begin_seat_turn(self) -> bool:
+        """Начинает ход игрока на месте current_player_index"""
         # Если все игроки сходили в этом раунде
-        if self.current_player_index >= len(self.players):
+        if self.current_player_index >= len(self._seats):
             self.current_player_index = 0
             self.current_round += 1
 
@@ -164,61 +391,98 @@ class DicePokerGame:
         return True
 
     def _evaluate_combination(self, dice: List[int]) -> Combination:
-        dice_counts = self._count_dice(dice)
-        values = list(dice_counts.values())
-        dice_values = list(dice_counts.keys())
-
-        if 5 in values:
-            return Combination.FIVE_OF_A_KIND
-        elif 4 in values:
-            return Combination.FOUR_OF_A_KIND
-        elif 3 in values and 2 in values:
-            return Combination.FULL_HOUSE
-        elif 3 in values:
-            return Combination.THREE_OF_A_KIND
-        elif values.count(2) == 2:
-            return Combination.TWO_PAIRS
-        elif 2 in values:
-            return Combination.ONE_PAIR
-        elif self._is_straight(dice_values):
-            return Combination.STRAIGHT
+        return evaluate_roll(dice)[0]
+
+    def _calculate_score(self, combination: Combination, dice: List[int]) -> int:
+        if self.score_table is None:
+            return score_roll(combination, dice)
+        return score_roll(combination, dice, self.score_table)
+
+    def get_game_state(
+        self, for_player_id: str | None = None, with_hint: bool = False
+    ) -> Dict:
+        """Возвращает состояние игры для клиента.
+
+        Снимок строится один раз на версию и общий для всех зрителей —
+        его нельзя изменять. При ``with_hint`` текущему игроку добавляется
+        подсказка ``hint``: какие кости оставить и ожидаемые очки.
+        """
+        state = self._current_snapshot()[1]
+        hint = self._hint(state, for_player_id) if with_hint else None
+        if hint is not None:
+            # Поля, зависящие от зрителя, накладываются поверх снимка
+            state = dict(state, current_turn=dict(state["current_turn"], hint=hint))
+        return state
+
+    def get_state_patch(
+        self, since: int, for_player_id: str | None = None, with_hint: bool = False
+    ) -> Optional[Dict]:
+        """Патч от состояния версии ``since`` к текущему (см. ``core.delta``).
+
+        ``None`` — снимка этой версии уже нет, нужно полное состояние.
+        """
+        version, state = self._current_snapshot()
+        if since == version:
+            patch: Dict = {}
         else:
-            return Combination.HIGH_DIE
+            with self.lock:
+                base = next(
+                    (old for old_version, old in self._recent or () if old_version == since),
+                    None,
+                )
+            if base is None:
+                return None
+            patch = diff_state(base, state)
+        hint = self._hint(state, for_player_id) if with_hint else None
+        if hint is not None:
+            if "current_turn" in patch:
+                patch["current_turn"] = dict(patch["current_turn"], hint=hint)
+            else:
+                patch["turn"] = dict(patch.get("turn", {}), hint=hint)
+        return patch
 
-    def _count_dice(self, dice: List[int]) -> Dict[int, int]:
-        counts = {}
-        for die in dice:
-            counts[die] = counts.get(die, 0) + 1
-        return counts
+    def _current_snapshot(self) -> tuple:
+        """(версия, состояние) для текущей версии, построенный не более раза"""
+        # Снимок читается без блокировки: он строится целиком под ней
+        # и подменяется одним присваиванием
+        snapshot = self._snapshot
+        if snapshot is None or snapshot[0] != self.version:
+            with self.lock:
+                snapshot = self._snapshot
+                if snapshot is None or snapshot[0] != self.version:
+                    if snapshot is not None:
+                        if self._recent is None:
+                            self._recent = deque(maxlen=STATE_HISTORY)
+                        self._recent.append(snapshot)
+                    snapshot = (self.version, self._build_state())
+                    self._snapshot = snapshot
+        return snapshot
 
-    def _is_straight(self, dice_values: List[int]) -> bool:
-        unique_values = sorted(set(dice_values))
-        if len(unique_values) != 5:
-            return False
-        return unique_values == [1, 2, 3, 4, 5] or unique_values == [2, 3, 4, 5, 6]
+    def _hint(self, state: Dict, for_player_id: str | None) -> Optional[Dict]:
+        """Подсказка текущему игроку: какие кости оставить и ожидаемые очки.
 
-    def _calculate_score(self, combination: Combination, dice: List[int]) -> int:
-        score_table = {
-            Combination.FIVE_OF_A_KIND: 100,
-            Combination.FOUR_OF_A_KIND: 40,
-            Combination.FULL_HOUSE: 25,
-            Combination.STRAIGHT: 20,
-            Combination.THREE_OF_A_KIND: 15,
-            Combination.TWO_PAIRS: 10,
-            Combination.ONE_PAIR: 5,
-            Combination.HIGH_DIE: max(dice),
+        Считается только по снимку ``state``: он вызывается без блокировки,
+        а места игроков в это время может менять ``remove_player``.
+        """
+        current_turn = state["current_turn"]
+        if not current_turn or not current_turn["roll"] or for_player_id is None:
+            return None
+        if not any(
+            player["is_current"] and player["id"] == for_player_id
+            for player in state["players"]
+        ):
+            return None
+        solver = solver_for(self.score_table, self.max_rerolls)
+        advice = solver.best_hold(current_turn["roll"], current_turn["remaining_rerolls"])
+        return {
+            "keep": advice.keep,
+            "reroll": advice.reroll,
+            "expected_score": round(advice.expected_score, 2),
         }
-        return score_table.get(combination, 0)
 
-    def get_game_state(self, for_player_id: str | None = None) -> Dict:
-        """Возвращает состояние игры для клиента"""
+    def _build_state(self) -> Dict:
         current_player = self.get_current_player()
 
-        # Сортируем игроков по очкам
-        sorted_players = sorted(
-            self.players.values(), key=lambda p: p.score, reverse=True
-        )
-
         # Определяем current_turn в зависимости от статуса
         current_turn = None
         if self.status == GameStatus.ACTIVE:
@@ -227,7 +491,7 @@ class DicePokerGame:
                 combination = self._evaluate_combination(self.current_roll).value
 
             current_turn = {
-                "roll": self.current_roll,
+                "roll": list(self.current_roll),
                 "remaining_rerolls": self.remaining_rerolls,
                 "combination": combination,
             }
@@ -237,8 +501,9 @@ class DicePokerGame:
         if self.status == GameStatus.COMPLETED:
             winner = self._get_winner()
 
-        state = {
+        return {
             "game_id": self.game_id,
+            "version": self.version,
             "status": self.status.value,
             "current_round": self.current_round,
             "max_rounds": self.max_rounds,
@@ -248,51 +513,561 @@ class DicePokerGame:
                     "name": p.name,
                     "score": p.score,
                     "is_ready": p.is_ready,
+                    "is_bot": p.id in self.bots,
                     "is_current": (
                         p.id == current_player.id if current_player else False
                     ),
                 }
-                for p in sorted_players
+                for p in self._ranking
             ],
             "current_turn": current_turn,
             "winner": winner,
         }
 
-        return state
-
     def _get_winner(self) -> Dict | None:
         """Определяет победителя игры"""
         if not self.players:
             return None
 
-        winner = max(self.players.values(), key=lambda p: p.score)
+        winner = self._ranking[0]
         return {"id": winner.id, "name": winner.name, "score": winner.score}
 
+    @_locked
     def set_player_ready(self, player_id: str) -> bool:
         """Отмечает игрока как готового"""
         if player_id in self.players:
-            self.players[player_id].is_ready = True
+            player = self.players[player_id]
+            if not player.is_ready:
+                player.is_ready = True
+                self._touch("ready", player_id=player_id)
             return True
         return False
 
+    @_locked
+    def apply_batch(self, player_id: str, operations: List[Dict]):
+        """Применяет операции игрока по порядку: все или ни одной.
+
+        Операции: ``{"op": "reroll", "dice": [...]}``, ``{"op": "end_turn"}``,
+        ``{"op": "ready"}`` (после готовности игра стартует, если может).
+        Вся последовательность сначала проверяется без изменения игры
+        (``_check_batch``). При ошибке бросает ValueError, и игра не меняется.
+        """
+        if player_id not in self.players:
+            raise ValueError("Игрок не найден")
+        parsed = self._check_batch(player_id, operations)
+        for op, dice in parsed:
+            if op == "reroll":
+                self.reroll_dice(player_id, dice)
+            elif op == "end_turn":
+                self.end_turn(player_id)
+            else:
+                self.set_player_ready(player_id)
+                self.start_game()
+
+    def _check_batch(self, player_id: str, operations: List[Dict]) -> List[Tuple]:
+        """Проходит операции по копии нескольких полей, а не всей игры.
+
+        Применимость операции зависит только от статуса, места текущего
+        игрока, раунда, оставшихся перебросов и готовности игроков; значения
+        костей на неё не влияют. Возвращает разобранные операции ``(op, dice)``.
+        """
+        status = self.status
+        seat = self.current_player_index
+        current_round = self.current_round
+        rerolls = self.remaining_rerolls
+        seats = [player.id for player in self._seats]
+        not_ready = {pid for pid, player in self.players.items() if not player.is_ready}
+        parsed = []
+        for number, operation in enumerate(operations, 1):
+            op, dice = _parse_operation(operation)
+            is_current = status == GameStatus.ACTIVE and seats[seat] == player_id
+            if op == "reroll":
+                applicable = is_current and rerolls > 0
+                rerolls -= 1
+            elif op == "end_turn":
+                applicable = is_current
+                # Как _next_turn: следующее место, после последнего — новый раунд
+                seat += 1
+                if seat >= len(seats):
+                    seat = 0
+                    current_round += 1
+                    if current_round > self.max_rounds:
+                        status = GameStatus.COMPLETED
+                rerolls = self.max_rerolls
+            else:
+                applicable = True
+                # Как start_game после готовности
+                not_ready.discard(player_id)
+                if status == GameStatus.WAITING and len(seats) >= 2 and not not_ready:
+                    status = GameStatus.ACTIVE
+                    rerolls = self.max_rerolls
+            if not applicable:
+                raise ValueError(f"Операция {number} ({op}) не применима")
+            parsed.append((op, dice))
+        return parsed
+
+    @_locked
+    def apply_action(self, action: Dict):
+        """Повторяет действие, записанное через ``on_change``.
+
+        Броски повторяются потоком костей игры (то же зерно — те же кости);
+        бросок из записи, если он есть, перекрывает текущий. Подписчик на
+        время повтора отключается.
+        """
+        listener, self.on_change = self.on_change, None
+        try:
+            op = action["op"]
+            if op == "add_player":
+                self._add_player(
+                    action["player_id"], action["name"], action.get("bot")
+                )
+                applied = True
+            elif op == "remove_player":
+                applied = self.remove_player(action["player_id"])
+            elif op == "ready":
+                applied = self.set_player_ready(action["player_id"])
+            elif op == "start":
+                applied = self.start_game()
+            elif op == "reroll":
+                applied = self.reroll_dice(action["player_id"], action["dice"])
+            elif op == "end_turn":
+                applied = self.end_turn(action["player_id"])
+                if applied:
+                    self.turns_history.set_timestamp(-1, action["timestamp"])
+            else:
+                raise ValueError(f"Неизвестное действие: {op}")
+            if not applied:
+                raise ValueError(f"Действие {op} не применимо к игре {self.game_id}")
+            if "roll" in action:
+                self.current_roll = list(action["roll"])
+        finally:
+            self.on_change = listener
+
+    @_locked
+    def to_dict(self) -> Dict:
+        """Полный снимок игры для хранилища"""
+        return {
+            "game_id": self.game_id,
+            "max_players": self.max_players,
+            "max_rounds": self.max_rounds,
+            "max_rerolls": self.max_rerolls,
+            "score_table": (
+                None
+                if self.score_table is None
+                else {c.name: points for c, points in self.score_table.items()}
+            ),
+            # Игроки в порядке мест за столом
+            "players": [
+                {
+                    "id": p.id,
+                    "name": p.name,
+                    "score": p.score,
+                    "is_ready": p.is_ready,
+                    "bot": self.bots.get(p.id),
+                }
+                for p in self._seats
+            ],
+            "status": self.status.value,
+            "current_round": self.current_round,
+            "current_player_index": self.current_player_index,
+            "current_roll": list(self.current_roll),
+            "remaining_rerolls": self.remaining_rerolls,
+            "turns_history": [
+                {
+                    "player_id": t.player_id,
+                    "roll": list(t.roll),
+                    "combination": t.combination.name,
+                    "score": t.score,
+                    "round_number": t.round_number,
+                    "timestamp": self._turns.timestamp(idx),
+                }
+                for idx, t in enumerate(self._turns or ())
+            ],
+            "created_at": self._created_at,
+            "version": self.version,
+            "seed": self.seed,
+            "dice_state": list(self._dice.state()) if self._dice else [0, 0],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DicePokerGame":
+        """Восстанавливает игру из снимка ``to_dict``"""
+        score_table = data["score_table"]
+        if score_table is not None:
+            score_table = {Combination[name]: p for name, p in score_table.items()}
+        game = cls(
+            data["game_id"],
+            max_players=data["max_players"],
+            max_rounds=data["max_rounds"],
+            max_rerolls=data["max_rerolls"],
+            score_table=score_table,
+            seed=data.get("seed"),
+        )
+        blocks, pos = data.get("dice_state", (0, 0))
+        if blocks:
+            game._dice = DiceStream(game.seed, blocks, pos)
+        for item in data["players"]:
+            player = Player(
+                id=item["id"],
+                name=item["name"],
+                score=item["score"],
+                is_ready=item["is_ready"],
+            )
+            game.players[player.id] = player
+            game._seats.append(player)
+            game._join_order[player.id] = game._joined
+            game._joined += 1
+            if item.get("bot"):
+                game.bots[player.id] = item["bot"]
+        game._ranking = sorted(game._seats, key=game._rank_key)
+        game.status = GameStatus(data["status"])
+        game.current_round = data["current_round"]
+        game.current_player_index = data["current_player_index"]
+        game.current_roll = list(data["current_roll"])
+        game.remaining_rerolls = data["remaining_rerolls"]
+        for t in data["turns_history"]:
+            game.turns_history.record(
+                t["player_id"],
+                t["roll"],
+                Combination[t["combination"]],
+                t["score"],
+                t["round_number"],
+                t["timestamp"],
+            )
+        game._created_at = data["created_at"]
+        game.version = data["version"]
+        return game
+
+
+def replay(seed: int, actions: Iterable[Dict], game_id: str = "replay", **options):
+    """Восстанавливает игру с начала по зерну и журналу действий.
+
+    ``options`` — параметры ``DicePokerGame`` (max_players, max_rounds и т.д.).
+    Работает без HTTP-слоя и подписчиков: только ядро игры.
+    """
+    game = DicePokerGame(game_id, seed=seed, **options)
+    for action in actions:
+        game.apply_action(action)
+    return game
+
+
+# Действия, после которых меняется место игры в лобби
+_LOBBY_OPS = frozenset({"add_player", "remove_player", "start"})
+
+
+class _Shard:
+    """Часть игр менеджера со своей блокировкой и LRU-порядком"""
+
+    __slots__ = ("games", "last_used", "lock", "next_sweep")
+
+    def __init__(self, next_sweep: float):
+        # Порядок — от давно не использованных к недавним
+        self.games: "OrderedDict[str, DicePokerGame]" = OrderedDict()
+        self.last_used: Dict[str, float] = {}
+        self.lock = threading.Lock()
+        self.next_sweep = next_sweep
+
 
 class GameManager:
     """Менеджер для управления всеми играми"""
 
-    def __init__(self):
-        self.games: Dict[str, DicePokerGame] = {}
+    def __init__(
+        self,
+        idle_ttl: Optional[Dict[GameStatus, float]] = None,
+        max_games: Optional[int] = None,
+        sweep_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        shard_count: int = 16,
+        store: Optional["GameStore"] = None,
+        id_factory: Callable[[], str] = _new_id,
+    ):
+        # Простаивающие дольше idle_ttl своего статуса игры вытесняются,
+        # сверх max_games — в порядке LRU (активные — только по TTL)
+        self.idle_ttl: Dict[GameStatus, float] = dict(idle_ttl or {})
+        self.max_games = max_games
+        self.sweep_interval = sweep_interval
+        # ID новых игр; в многопроцессном режиме — только принадлежащие
+        # этому процессу (см. routing.affine_id_factory)
+        self.id_factory = id_factory
+        # Число вытесненных игр по (причина, статус): ("ttl", "waiting") и т.п.
+        self.evictions: Counter = Counter()
+        self._evictions_lock = threading.Lock()
+        self._clock = clock
+        next_sweep = clock() + sweep_interval
+        # Части по хешу game_id со своими блокировками: обращения к разным
+        # играм не мешают друг другу, изменения игры защищает её блокировка
+        self._shards = [_Shard(next_sweep) for _ in range(shard_count)]
+        self._reaper: Optional[threading.Thread] = None
+        self._reaper_stop = threading.Event()
+        self._listeners: List[GameListener] = []
+        # Ожидающие игры со свободными местами — для лобби и быстрого подбора
+        self.lobby = LobbyIndex()
+        # Обратный индекс «игрок -> его игры» (без ботов) для games_of
+        self._player_games: Dict[str, Set[str]] = {}
+        self._players_lock = threading.Lock()
+        # Игры из хранилища загружаются сразу, изменения идут в store.record
+        self.store = store
+        if store is not None:
+            now = clock()
+            for game in store.load_games():
+                shard = self._shard(game.game_id)
+                self._adopt(game)
+                shard.games[game.game_id] = game
+                shard.last_used[game.game_id] = now
+                self._index_lobby(game)
+                for player_id in game.players:
+                    if player_id not in game.bots:
+                        self._link_player(player_id, game.game_id)
+
+    def add_listener(self, listener: GameListener):
+        """Подписывает на изменения всех игр менеджера"""
+        self._listeners.append(listener)
 
-    def create_game(self, max_players: int = 4, max_rounds: int = 3) -> str:
-        """Создает новую игру и возвращает её ID"""
-        game_id = str(uuid.uuid4())
-        self.games[game_id] = DicePokerGame(game_id, max_players, max_rounds)
+    def _adopt(self, game: DicePokerGame):
+        game.on_change = self._on_game_change
+
+    def _on_game_change(self, game: DicePokerGame, action: Dict):
+        if self.store is not None:
+            self.store.record(game, action)
+        op = action["op"]
+        if op in _LOBBY_OPS:
+            self._index_lobby(game)
+        if op == "add_player" and "bot" not in action:
+            self._link_player(action["player_id"], game.game_id)
+        elif op == "remove_player":
+            self._unlink_player(action["player_id"], game.game_id)
+        for listener in self._listeners:
+            listener(game, action)
+
+    @property
+    def games(self) -> Dict[str, DicePokerGame]:
+        """Снимок всех игр (копия; изменения в нём не отражаются на менеджере)"""
+        games = {}
+        for shard in self._shards:
+            with shard.lock:
+                games.update(shard.games)
+        return games
+
+    def _shard(self, game_id: str) -> _Shard:
+        return self._shards[hash(game_id) % len(self._shards)]
+
+    def __contains__(self, game_id: str) -> bool:
+        """Проверяет наличие игры, не продлевая её жизнь"""
+        return game_id in self._shard(game_id).games
+
+    def __len__(self) -> int:
+        return sum(len(shard.games) for shard in self._shards)
+
+    def stats(self) -> Dict:
+        """Сводка для метрик: игры по статусам, игроки и ходы в текущих играх.
+
+        Игры читаются без их блокировок — значения могут отставать на одно
+        изменение, для мониторинга этого достаточно.
+        """
+        by_status = Counter({status: 0 for status in GameStatus})
+        players_online = turns = 0
+        for shard in self._shards:
+            with shard.lock:
+                games = list(shard.games.values())
+            for game in games:
+                by_status[game.status] += 1
+                if game.status != GameStatus.COMPLETED:
+                    players_online += len(game.players)
+                turns += game.turns_played
+        total = sum(by_status.values())
+        with self._evictions_lock:
+            evictions = dict(self.evictions)
+        return {
+            "games": dict(by_status),
+            "evictions": evictions,
+            "players_online": players_online,
+            "turns": turns,
+            "avg_turns": turns / total if total else 0.0,
+        }
+
+    def create_game(
+        self, max_players: int = 4, max_rounds: int = 3, seed: Optional[int] = None
+    ) -> str:
+        """Создает новую игру и возвращает её ID.
+
+        Неверные размеры игры — ``ValueError``; проверка идёт до регистрации,
+        так что в менеджер и лобби попадают только корректные игры.
+        """
+        if type(max_players) is not int or max_players < 2:
+            raise ValueError("Игроков должно быть не меньше 2")
+        if type(max_rounds) is not int or not 1 <= max_rounds <= MAX_ROUNDS:
+            raise ValueError(f"Раундов должно быть от 1 до {MAX_ROUNDS}")
+        game_id = self.id_factory()
+        game = DicePokerGame(game_id, max_players, max_rounds, seed=seed)
+        self._adopt(game)
+        if self.store is not None:
+            self.store.save_snapshot(game)
+        shard = self._shard(game_id)
+        with shard.lock:
+            now = self._clock()
+            shard.games[game_id] = game
+            shard.last_used[game_id] = now
+            self._index_lobby(game)
+            self._maybe_sweep(shard, now)
+        if self.max_games is not None and len(self) > self.max_games:
+            self._evict_over_capacity(shard, keep=game_id)
         return game_id
 
     def get_game(self, game_id: str) -> Optional[DicePokerGame]:
         """Возвращает игру по ID"""
-        return self.games.get(game_id)
+        shard = self._shard(game_id)
+        with shard.lock:
+            now = self._clock()
+            game = shard.games.get(game_id)
+            if game is not None:
+                shard.games.move_to_end(game_id)
+                shard.last_used[game_id] = now
+            self._maybe_sweep(shard, now)
+            return game
+
+    def _index_lobby(self, game: DicePokerGame):
+        free_seats = None
+        if game.status == GameStatus.WAITING:
+            free_seats = game.max_players - len(game.players)
+        self.lobby.update(game.game_id, free_seats, game._created_at)
+
+    def _link_player(self, player_id: str, game_id: str):
+        with self._players_lock:
+            self._player_games.setdefault(player_id, set()).add(game_id)
+
+    def _unlink_player(self, player_id: str, game_id: str):
+        with self._players_lock:
+            game_ids = self._player_games.get(player_id)
+            if game_ids is not None:
+                game_ids.discard(game_id)
+                if not game_ids:
+                    del self._player_games[player_id]
+
+    def games_of(self, player_id: str) -> List[DicePokerGame]:
+        """Игры, в которых участвует игрок"""
+        with self._players_lock:
+            game_ids = list(self._player_games.get(player_id, ()))
+        games = [self.get_game(game_id) for game_id in game_ids]
+        return [game for game in games if game is not None]
+
+    def _peek(self, game_id: str) -> Optional[DicePokerGame]:
+        """Игра по ID без продления её жизни"""
+        shard = self._shard(game_id)
+        with shard.lock:
+            return shard.games.get(game_id)
+
+    def open_games(
+        self, cursor: Optional[str] = None, limit: int = LOBBY_PAGE
+    ) -> Tuple[List[DicePokerGame], Optional[str]]:
+        """Страница открытых игр и курсор следующей (``None`` — последняя).
+
+        Неверный курсор — ``ValueError``.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        keys, more = self.lobby.page(after, limit)
+        games = [game for game in map(self._peek, (key[2] for key in keys)) if game]
+        return games, encode_cursor(keys[-1]) if more else None
+
+    def quick_match(self) -> Optional[str]:
+        """ID самой заполненной открытой игры (среди равных — самой старой)"""
+        key = self.lobby.first()
+        return key[2] if key is not None else None
 
     def remove_game(self, game_id: str):
         """Удаляет игру"""
-        if game_id in self.games:
-            del self.games[game_id]
+        shard = self._shard(game_id)
+        with shard.lock:
+            self._discard(shard, game_id)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Вытесняет игры, простоявшие дольше своего TTL; возвращает их число"""
+        if now is None:
+            now = self._clock()
+        evicted = 0
+        for shard in self._shards:
+            with shard.lock:
+                evicted += self._sweep_shard(shard, now)
+        return evicted
+
+    def _sweep_shard(self, shard: _Shard, now: float) -> int:
+        shard.next_sweep = now + self.sweep_interval
+        if not self.idle_ttl:
+            return 0
+        shortest = min(self.idle_ttl.values())
+        expired = []
+        for game_id, game in shard.games.items():
+            idle = now - shard.last_used[game_id]
+            # Дальше идут только более свежие игры
+            if idle < shortest:
+                break
+            ttl = self.idle_ttl.get(game.status)
+            if ttl is not None and idle >= ttl:
+                expired.append((game_id, game.status))
+        for game_id, status in expired:
+            self._discard(shard, game_id)
+            self._count_eviction("ttl", status)
+        return len(expired)
+
+    def start_reaper(self, interval: Optional[float] = None):
+        """Запускает фоновый поток, периодически вызывающий ``sweep``"""
+        if self._reaper is not None:
+            return
+        interval = interval or self.sweep_interval
+        self._reaper_stop.clear()
+
+        def run():
+            while not self._reaper_stop.wait(interval):
+                self.sweep()
+
+        self._reaper = threading.Thread(target=run, name="game-reaper", daemon=True)
+        self._reaper.start()
+
+    def stop_reaper(self):
+        if self._reaper is None:
+            return
+        self._reaper_stop.set()
+        self._reaper.join()
+        self._reaper = None
+
+    def close(self):
+        """Останавливает фоновые потоки и закрывает хранилище"""
+        self.stop_reaper()
+        if self.store is not None:
+            self.store.close()
+
+    def _maybe_sweep(self, shard: _Shard, now: float):
+        # Попутная проверка при обращениях — не чаще раза в sweep_interval
+        if now >= shard.next_sweep:
+            self._sweep_shard(shard, now)
+
+    def _evict_over_capacity(self, origin: _Shard, keep: str):
+        # Сначала вытесняем из части, куда добавлена игра, затем из остальных
+        shards = [origin] + [s for s in self._shards if s is not origin]
+        for shard in shards:
+            excess = len(self) - self.max_games
+            if excess <= 0:
+                return
+            with shard.lock:
+                victims = []
+                for game_id, game in shard.games.items():
+                    if len(victims) >= excess:
+                        break
+                    if game.status != GameStatus.ACTIVE and game_id != keep:
+                        victims.append((game_id, game.status))
+                for game_id, status in victims:
+                    self._discard(shard, game_id)
+                    self._count_eviction("capacity", status)
+
+    def _count_eviction(self, reason: str, status: GameStatus):
+        with self._evictions_lock:
+            self.evictions[reason, status.value] += 1
+
+    def _discard(self, shard: _Shard, game_id: str):
+        if game_id in shard.games:
+            game = shard.games.pop(game_id)
+            del shard.last_used[game_id]
+            self.lobby.discard(game_id)
+            for player_id in list(game.players):
+                self._unlink_player(player_id, game_id)
+            if self.store is not None:
+                self.store.delete(game_id)
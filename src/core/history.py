@@ -0,0 +1,171 @@
+"""История ходов: запись хода и компактный колонночный журнал"""
+
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Union, overload
+
+from .scoring import COMBINATION_CODES, COMBINATIONS, DICE_COUNT, Combination
+
+_DIE_BITS = 3
+_DIE_MASK = (1 << _DIE_BITS) - 1
+
+
+@dataclass(slots=True)
+class Turn:
+    player_id: str
+    roll: List[int]
+    combination: Combination
+    score: int
+    round_number: int
+    timestamp: datetime
+
+
+def pack_roll(roll: List[int]) -> int:
+    """Упаковывает 5 костей (1..6) в 15 бит: по 3 бита на кость"""
+    if len(roll) != DICE_COUNT:
+        raise ValueError("Бросок должен состоять из 5 костей")
+    packed = 0
+    for die in reversed(roll):
+        if not 1 <= die <= 6:
+            raise ValueError("Значения костей должны быть в диапазоне 1..6")
+        packed = (packed << _DIE_BITS) | (die - 1)
+    return packed
+
+
+def unpack_roll(packed: int) -> List[int]:
+    roll = []
+    for _ in range(DICE_COUNT):
+        roll.append((packed & _DIE_MASK) + 1)
+        packed >>= _DIE_BITS
+    return roll
+
+
+class TurnLog:
+    """История ходов игры в колонках ``array``.
+
+    Вместо объекта ``Turn`` на ход хранится строка из чисел: индекс игрока,
+    упакованный бросок, код комбинации, очки, раунд и время (секунды эпохи).
+    Объекты ``Turn`` создаются только при чтении, поэтому изменение
+    полученного ``Turn`` журнал не меняет.
+    """
+
+    __slots__ = (
+        "_player_ids",
+        "_player_index",
+        "_players",
+        "_rolls",
+        "_combinations",
+        "_scores",
+        "_rounds",
+        "_timestamps",
+    )
+
+    def __init__(self, turns: Iterable[Turn] = ()):
+        self._player_ids: List[str] = []
+        self._player_index: Dict[str, int] = {}
+        self._players = array("H")
+        self._rolls = array("H")
+        self._combinations = array("B")
+        self._scores = array("i")
+        self._rounds = array("H")
+        self._timestamps = array("d")
+        self.extend(turns)
+
+    def _player_code(self, player_id: str) -> int:
+        code = self._player_index.get(player_id)
+        if code is None:
+            code = self._player_index[player_id] = len(self._player_ids)
+            self._player_ids.append(player_id)
+        return code
+
+    def record(
+        self,
+        player_id: str,
+        roll: List[int],
+        combination: Combination,
+        score: int,
+        round_number: int,
+        timestamp: float,
+    ):
+        """Добавляет ход без создания объекта ``Turn``"""
+        self._rolls.append(pack_roll(roll))
+        self._players.append(self._player_code(player_id))
+        self._combinations.append(COMBINATION_CODES[combination])
+        self._scores.append(score)
+        self._rounds.append(round_number)
+        self._timestamps.append(timestamp)
+
+    def append(self, turn: Turn):
+        self.record(
+            turn.player_id,
+            turn.roll,
+            turn.combination,
+            turn.score,
+            turn.round_number,
+            turn.timestamp.timestamp(),
+        )
+
+    def extend(self, turns: Iterable[Turn]):
+        for turn in turns:
+            self.append(turn)
+
+    def __len__(self) -> int:
+        return len(self._rolls)
+
+    def _turn(self, idx: int) -> Turn:
+        return Turn(
+            player_id=self._player_ids[self._players[idx]],
+            roll=unpack_roll(self._rolls[idx]),
+            combination=COMBINATIONS[self._combinations[idx]],
+            score=self._scores[idx],
+            round_number=self._rounds[idx],
+            timestamp=datetime.fromtimestamp(self._timestamps[idx]),
+        )
+
+    @overload
+    def __getitem__(self, idx: int) -> Turn: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> List[Turn]: ...
+
+    def __getitem__(self, idx: Union[int, slice]):
+        if isinstance(idx, slice):
+            return [self._turn(i) for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("Номер хода вне истории")
+        return self._turn(idx)
+
+    def __iter__(self) -> Iterator[Turn]:
+        for idx in range(len(self)):
+            yield self._turn(idx)
+
+    def __bool__(self) -> bool:
+        return len(self._rolls) > 0
+
+    def __repr__(self) -> str:
+        return f"TurnLog({len(self)} turns)"
+
+    def set_timestamp(self, idx: int, timestamp: float):
+        self._timestamps[idx] = timestamp
+
+    def timestamp(self, idx: int) -> float:
+        return self._timestamps[idx]
+
+    def combination_codes(self) -> array:
+        """Колонка кодов комбинаций (индексы в ``scoring.COMBINATIONS``) без копирования"""
+        return self._combinations
+
+    def player_ids(self) -> Iterator[str]:
+        """ID игроков по ходам без создания объектов ``Turn``"""
+        ids = self._player_ids
+        return (ids[code] for code in self._players)
+
+    @classmethod
+    def bytes_per_turn(cls) -> int:
+        """Сколько байт занимает один ход во всех колонках"""
+        return sum(
+            array(code).itemsize for code in ("H", "H", "B", "i", "H", "d")
+        )
@@ -0,0 +1,191 @@
+"""Сквозная статистика игроков по всем играм и таблица лидеров"""
+
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from .game_logic import DicePokerGame
+from .scoring import COMBINATION_CODES, COMBINATIONS
+
+if TYPE_CHECKING:
+    from .game_logic import GameManager
+
+
+@dataclass(slots=True)
+class PlayerStats:
+    name: str
+    games: int = 0
+    wins: int = 0
+    turns: int = 0
+    # Сумма итоговых очков по завершённым играм
+    total_score: int = 0
+    best_score: int = 0
+    best_roll: Optional[List[int]] = None
+    # Число выпадений по кодам комбинаций (индекс в COMBINATIONS)
+    combinations: List[int] = field(default_factory=lambda: [0] * len(COMBINATIONS))
+
+    @property
+    def avg_score(self) -> float:
+        return self.total_score / self.games if self.games else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "games": self.games,
+            "wins": self.wins,
+            "turns": self.turns,
+            "total_score": self.total_score,
+            "avg_score": round(self.avg_score, 2),
+            "best_score": self.best_score,
+            "best_roll": self.best_roll,
+            "combinations": {
+                combination.value: count
+                for combination, count in zip(COMBINATIONS, self.combinations)
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PlayerStats":
+        counts = data.get("combinations", {})
+        return cls(
+            name=data["name"],
+            games=data["games"],
+            wins=data["wins"],
+            turns=data["turns"],
+            total_score=data["total_score"],
+            best_score=data["best_score"],
+            best_roll=data["best_roll"],
+            combinations=[counts.get(c.value, 0) for c in COMBINATIONS],
+        )
+
+    def merge(self, other: "PlayerStats"):
+        """Добавляет статистику того же игрока из другого процесса"""
+        self.games += other.games
+        self.wins += other.wins
+        self.turns += other.turns
+        self.total_score += other.total_score
+        if other.best_roll is not None and (
+            self.best_roll is None or other.best_score > self.best_score
+        ):
+            self.best_score = other.best_score
+            self.best_roll = other.best_roll
+        self.combinations = [a + b for a, b in zip(self.combinations, other.combinations)]
+
+
+# Ключи сортировки таблиц: меньше — выше; имя разрешает ничьи
+LEADERBOARD_KEYS: Dict[str, Callable[[PlayerStats], Tuple]] = {
+    "wins": lambda s: (-s.wins, -s.games, s.name),
+    "avg_score": lambda s: (-s.avg_score, s.name),
+    "best_score": lambda s: (-s.best_score, s.name),
+    "games": lambda s: (-s.games, s.name),
+}
+DEFAULT_LEADERBOARD = "wins"
+# Сколько мест отдаёт /leaderboard за один запрос
+MAX_LEADERBOARD = 100
+
+
+class Leaderboard:
+    """Статистика игроков по имени, обновляемая подписчиком менеджера.
+
+    Ход учитывается при ``end_turn``, партия — по действию, которое её
+    завершило (``completed``): последний ход, в том числе ход бота, или
+    выход игрока, который ходил последним. Историю игр заново не
+    просматривает никто, и уже учтённые игры помнить не нужно. Для каждой таблицы
+    хранится отсортированный список ключей: изменение игрока — удаление и
+    вставка (поиск места двоичный, O(log n), сдвиг элементов списка — O(n),
+    но это быстрый memmove), первые K мест — срез списка. Боты в
+    статистику не попадают; статистика живёт в памяти процесса.
+    """
+
+    def __init__(self, manager: Optional["GameManager"] = None):
+        self._players: Dict[str, PlayerStats] = {}
+        self._index: Dict[str, List[Tuple]] = {name: [] for name in LEADERBOARD_KEYS}
+        # Текущие ключи игрока в каждой таблице, чтобы найти их при изменении
+        self._keys: Dict[str, Dict[str, Tuple]] = {}
+        self._lock = threading.Lock()
+        if manager is not None:
+            manager.add_listener(self.on_change)
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def on_change(self, game: DicePokerGame, action: Dict):
+        with self._lock:
+            if action["op"] == "end_turn":
+                self._record_turn(game)
+            # Переход в COMPLETED случается один раз, под блокировкой игры
+            if action.get("completed"):
+                self._record_game(game)
+
+    def _record_turn(self, game: DicePokerGame):
+        turn = game.turns_history[-1]
+        if turn.player_id in game.bots:
+            return
+        stats = self._stats(game.players[turn.player_id].name)
+        stats.turns += 1
+        stats.combinations[COMBINATION_CODES[turn.combination]] += 1
+        if stats.best_roll is None or turn.score > stats.best_score:
+            stats.best_score = turn.score
+            stats.best_roll = list(turn.roll)
+        self._reindex(stats)
+
+    def _record_game(self, game: DicePokerGame):
+        winner = game._get_winner()
+        for player in game.players.values():
+            if player.id in game.bots:
+                continue
+            stats = self._stats(player.name)
+            stats.games += 1
+            stats.total_score += player.score
+            if winner is not None and winner["id"] == player.id:
+                stats.wins += 1
+            self._reindex(stats)
+
+    def _stats(self, name: str) -> PlayerStats:
+        stats = self._players.get(name)
+        if stats is None:
+            stats = self._players[name] = PlayerStats(name)
+            self._keys[name] = {}
+        return stats
+
+    def _reindex(self, stats: PlayerStats):
+        keys = self._keys[stats.name]
+        for board, key_of in LEADERBOARD_KEYS.items():
+            index = self._index[board]
+            old = keys.get(board)
+            if old is not None:
+                del index[bisect_left(index, old)]
+            key = keys[board] = key_of(stats)
+            insort(index, key)
+
+    def top(self, by: str = DEFAULT_LEADERBOARD, limit: int = 10) -> List[Dict]:
+        """Первые ``limit`` игроков таблицы ``by``"""
+        if by not in LEADERBOARD_KEYS:
+            raise ValueError(f"Неизвестная таблица: {by}")
+        with self._lock:
+            names = [key[-1] for key in self._index[by][:limit]]
+            return [self._players[name].to_dict() for name in names]
+
+    def player(self, name: str) -> Optional[Dict]:
+        with self._lock:
+            stats = self._players.get(name)
+            return stats.to_dict() if stats is not None else None
+
+
+def merge_leaderboards(pages: List[List[Dict]], by: str, limit: int) -> List[Dict]:
+    """Общая таблица из таблиц нескольких процессов.
+
+    Партии одного игрока могут идти в разных процессах: записи с одним
+    именем складываются, затем таблица сортируется заново.
+    """
+    merged: Dict[str, PlayerStats] = {}
+    for players in pages:
+        for data in players:
+            stats = PlayerStats.from_dict(data)
+            if stats.name in merged:
+                merged[stats.name].merge(stats)
+            else:
+                merged[stats.name] = stats
+    ranked = sorted(merged.values(), key=LEADERBOARD_KEYS[by])
+    return [stats.to_dict() for stats in ranked[:limit]]
@@ -0,0 +1,84 @@
+"""Индекс открытых игр для списка лобби и быстрого подбора"""
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+# Размер страницы списка открытых игр по умолчанию и наибольший
+LOBBY_PAGE = 20
+MAX_LOBBY_PAGE = 100
+
+# Ключ игры в индексе: (свободные места, время создания, game_id)
+LobbyKey = Tuple[int, float, str]
+
+
+def encode_cursor(key: LobbyKey) -> str:
+    """Курсор страницы — ключ последней отданной игры"""
+    free_seats, created_at, game_id = key
+    return f"{free_seats}:{created_at!r}:{game_id}"
+
+
+def decode_cursor(cursor: str) -> LobbyKey:
+    """Разбирает курсор; ``ValueError`` при неверном формате"""
+    free_seats, created_at, game_id = cursor.split(":", 2)
+    return int(free_seats), float(created_at), game_id
+
+
+class LobbyIndex:
+    """Ожидающие игры со свободными местами, отсортированные по ключу.
+
+    Первыми идут самые заполненные столы, среди равных — более старые.
+    Изменение игры — удаление и вставка двоичным поиском, быстрый подбор
+    берёт первый ключ, страница списка начинается сразу после курсора.
+    """
+
+    def __init__(self):
+        self._index: List[LobbyKey] = []
+        self._keys: Dict[str, LobbyKey] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._keys
+
+    def update(self, game_id: str, free_seats: Optional[int], created_at: float):
+        """Ставит игру в индекс; ``free_seats=None`` или не больше 0 — убирает её"""
+        key = None
+        if free_seats is not None and free_seats > 0:
+            key = (free_seats, created_at, game_id)
+        with self._lock:
+            index = self._index
+            old = self._keys.get(game_id)
+            if old is not None:
+                if old == key:
+                    return
+                del index[bisect_left(index, old)]
+                del self._keys[game_id]
+            if key is not None:
+                # Новая пустая игра обычно оказывается в самом конце
+                if not index or key > index[-1]:
+                    index.append(key)
+                else:
+                    insort(index, key)
+                self._keys[game_id] = key
+
+    def discard(self, game_id: str):
+        with self._lock:
+            old = self._keys.pop(game_id, None)
+            if old is not None:
+                del self._index[bisect_left(self._index, old)]
+
+    def first(self) -> Optional[LobbyKey]:
+        with self._lock:
+            return self._index[0] if self._index else None
+
+    def page(
+        self, after: Optional[LobbyKey] = None, limit: int = LOBBY_PAGE
+    ) -> Tuple[List[LobbyKey], bool]:
+        """До ``limit`` ключей после ``after`` и признак, что есть ещё"""
+        with self._lock:
+            start = bisect_right(self._index, after) if after is not None else 0
+            keys = self._index[start : start + limit]
+            return keys, start + limit < len(self._index)
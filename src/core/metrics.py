@@ -0,0 +1,211 @@
+"""Метрики сервиса в текстовом формате Prometheus"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .game_logic import DicePokerGame, GameManager
+
+# Границы корзин гистограммы задержек, секунд
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """Гистограмма с короткой блокировкой на одно наблюдение"""
+
+    __slots__ = ("bounds", "counts", "sum", "count", "lock")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        # Последняя корзина — всё, что больше последней границы
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self.lock:
+            self.record(value)
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        with self.lock:
+            return self.read()
+
+    def record(self, value: float):
+        """Наблюдение без блокировки: ``lock`` держит вызывающий"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def read(self) -> Tuple[List[int], float, int]:
+        """Снимок без блокировки: ``lock`` держит вызывающий"""
+        return list(self.counts), self.sum, self.count
+
+
+class _RouteStats:
+    __slots__ = ("histogram", "statuses")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.histogram = Histogram(bounds)
+        self.statuses: Dict[int, int] = {}
+
+
+class RequestMetrics:
+    """Счётчики запросов и гистограммы задержек по маршрутам.
+
+    Наблюдение берёт только блокировку своего маршрута на несколько
+    операций; словарь маршрутов меняется под общей блокировкой лишь при
+    первом запросе к новому маршруту.
+    """
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self._routes: Dict[Tuple[str, str], _RouteStats] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route: str, method: str, status: int, seconds: float):
+        key = (route, method)
+        stats = self._routes.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._routes.setdefault(key, _RouteStats(self.bounds))
+        histogram = stats.histogram
+        # Статусы считаются под той же блокировкой, что и гистограмма
+        with histogram.lock:
+            histogram.record(seconds)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def render(self) -> List[str]:
+        lines = [
+            "# HELP dice_http_requests_total Обработанные HTTP-запросы",
+            "# TYPE dice_http_requests_total counter",
+        ]
+        histograms = [
+            "# HELP dice_http_request_duration_seconds Время обработки запроса",
+            "# TYPE dice_http_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            routes = sorted(self._routes.items())
+        for (route, method), stats in routes:
+            histogram = stats.histogram
+            with histogram.lock:
+                statuses = sorted(stats.statuses.items())
+                counts, total, count = histogram.read()
+            for status, requests in statuses:
+                labels = _labels(route=route, method=method, status=status)
+                lines.append(f"dice_http_requests_total{{{labels}}} {requests}")
+            cumulative = 0
+            for bound, bucket in zip(self.bounds + (float("inf"),), counts):
+                cumulative += bucket
+                labels = _labels(route=route, method=method, le=_number(bound))
+                histograms.append(
+                    f"dice_http_request_duration_seconds_bucket{{{labels}}} {cumulative}"
+                )
+            labels = _labels(route=route, method=method)
+            histograms.append(
+                f"dice_http_request_duration_seconds_sum{{{labels}}} {_number(total)}"
+            )
+            histograms.append(
+                f"dice_http_request_duration_seconds_count{{{labels}}} {count}"
+            )
+        return lines + histograms
+
+
+class GameMetrics:
+    """Показатели игр менеджера: игры по статусам, игроки, ходы.
+
+    Ходы считаются подписчиком менеджера; «ходов в секунду» — скорость
+    между двумя последними снятиями метрик.
+    """
+
+    def __init__(
+        self, manager: "GameManager", clock: Callable[[], float] = time.monotonic
+    ):
+        self.manager = manager
+        self._clock = clock
+        self._turns_total = 0
+        self._lock = threading.Lock()
+        self._last_scrape: Optional[Tuple[float, int]] = None
+        manager.add_listener(self._on_change)
+
+    def _on_change(self, game: "DicePokerGame", action: Dict):
+        if action["op"] == "end_turn":
+            with self._lock:
+                self._turns_total += 1
+
+    def turns_per_second(self) -> float:
+        """Скорость ходов с прошлого вызова (при первом вызове — 0)"""
+        now = self._clock()
+        with self._lock:
+            turns = self._turns_total
+            last, self._last_scrape = self._last_scrape, (now, turns)
+        if last is None or now <= last[0]:
+            return 0.0
+        return (turns - last[1]) / (now - last[0])
+
+    def render(self) -> List[str]:
+        stats = self.manager.stats()
+        tps = self.turns_per_second()
+        lines = [
+            "# HELP dice_games Игры в менеджере по статусам",
+            "# TYPE dice_games gauge",
+        ]
+        for status, count in stats["games"].items():
+            lines.append(f"dice_games{{{_labels(status=status.value)}}} {count}")
+        lines += [
+            "# HELP dice_players_online Игроки в незавершённых играх",
+            "# TYPE dice_players_online gauge",
+            f"dice_players_online {stats['players_online']}",
+            "# HELP dice_turns_total Завершённые ходы с запуска процесса",
+            "# TYPE dice_turns_total counter",
+            f"dice_turns_total {self._turns_total}",
+            "# HELP dice_turns_per_second Ходы в секунду с прошлого снятия метрик",
+            "# TYPE dice_turns_per_second gauge",
+            f"dice_turns_per_second {_number(float(tps))}",
+            "# HELP dice_turns_history_avg_length Средняя длина истории ходов игры",
+            "# TYPE dice_turns_history_avg_length gauge",
+            f"dice_turns_history_avg_length {_number(float(stats['avg_turns']))}",
+            "# HELP dice_game_evictions_total Вытесненные игры по причине и статусу",
+            "# TYPE dice_game_evictions_total counter",
+        ]
+        for (reason, status), count in sorted(stats["evictions"].items()):
+            labels = _labels(reason=reason, status=status)
+            lines.append(f"dice_game_evictions_total{{{labels}}} {count}")
+        return lines
+
+
+def render_metrics(*collectors) -> str:
+    """Текст для ``/metrics`` из нескольких источников"""
+    lines: List[str] = []
+    for collector in collectors:
+        lines.extend(collector.render())
+    return "\n".join(lines) + "\n"
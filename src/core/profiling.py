@@ -0,0 +1,129 @@
+"""Выборочное профилирование запросов через cProfile"""
+
+import cProfile
+import pstats
+import random
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Маршрут запроса по WSGI-окружению, например "GET /game/<game_id>/state"
+RouteResolver = Callable[[Dict], str]
+
+
+def _slug(route: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+
+
+class RequestProfiler:
+    """Профилирует долю запросов и копит статистику по маршрутам.
+
+    Профилировщик оборачивает WSGI-приложение целиком, поэтому в профиль
+    попадают маршрутизация Flask, сессия, обработчик и сериализация JSON.
+    Пока окно профилирования закрыто, обёртка только проверяет флаг.
+    ``stop`` закрывает окно и пишет по файлу pstats на маршрут в
+    ``output_dir``; файлы открываются через ``python -m pstats``.
+    """
+
+    def __init__(self, output_dir: str, sample_rate: float = 0.01):
+        self.output_dir = Path(output_dir)
+        self.sample_rate = sample_rate
+        # Доля выборки для отдельных маршрутов поверх sample_rate
+        self.route_rates: Dict[str, float] = {}
+        self.active = False
+        self._started_at: Optional[float] = None
+        self._stats: Dict[str, pstats.Stats] = {}
+        self._samples: Counter = Counter()
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def start(
+        self,
+        sample_rate: Optional[float] = None,
+        route_rates: Optional[Dict[str, float]] = None,
+        duration: Optional[float] = None,
+    ):
+        """Открывает окно профилирования; ``duration`` — закрыть через N секунд"""
+        with self._lock:
+            if sample_rate is not None:
+                self.sample_rate = sample_rate
+            self.route_rates = dict(route_rates or {})
+            if not self.active:
+                self._stats = {}
+                self._samples = Counter()
+                self._started_at = time.time()
+            self.active = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if duration:
+                self._timer = threading.Timer(duration, self.stop)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def stop(self) -> Dict:
+        """Закрывает окно и пишет накопленную статистику; возвращает сводку"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            was_active, self.active = self.active, False
+            stats, self._stats = self._stats, {}
+            samples, self._samples = self._samples, Counter()
+            started_at = self._started_at
+        files: List[str] = []
+        if was_active and stats:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            window = time.strftime("%Y%m%d-%H%M%S", time.localtime(started_at))
+            for route, route_stats in sorted(stats.items()):
+                path = self.output_dir / f"{window}-{_slug(route)}.pstats"
+                route_stats.dump_stats(str(path))
+                files.append(str(path))
+        return {"files": files, "samples": dict(samples)}
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                "active": self.active,
+                "sample_rate": self.sample_rate,
+                "route_rates": dict(self.route_rates),
+                "samples": dict(self._samples),
+            }
+
+    def _record(self, route: str, profile: cProfile.Profile):
+        with self._lock:
+            if not self.active:
+                return
+            existing = self._stats.get(route)
+            if existing is None:
+                self._stats[route] = pstats.Stats(profile)
+            else:
+                existing.add(profile)
+            self._samples[route] += 1
+
+    def wrap(self, wsgi_app, resolve_route: RouteResolver):
+        """WSGI-обёртка, которая профилирует выбранные запросы"""
+
+        def profiled_app(environ, start_response):
+            if not self.active:
+                return wsgi_app(environ, start_response)
+            route = resolve_route(environ)
+            rate = self.route_rates.get(route, self.sample_rate)
+            if random.random() >= rate:
+                return wsgi_app(environ, start_response)
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Профилировщик уже включён в этом потоке (Python 3.12+)
+                return wsgi_app(environ, start_response)
+            try:
+                return wsgi_app(environ, start_response)
+            finally:
+                profile.disable()
+                self._record(route, profile)
+
+        return profiled_app
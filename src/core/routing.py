@@ -0,0 +1,316 @@
+"""Привязка игр к процессам-обработчикам и фронтальный маршрутизатор.
+
+Каждая игра живёт в одном процессе: номер процесса — стабильный хеш
+``game_id`` (``worker_for``). Новые игры создаёт наименее загруженный
+процесс, подбирая ID, хеш которого указывает на него самого
+(``affine_id_factory``). ``Router`` — WSGI-приложение, пересылающее
+запросы процессам по HTTP; см. ``src/cluster.py``.
+"""
+
+import hashlib
+import http.client
+import itertools
+import json
+import re
+import threading
+from urllib.parse import urlencode
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from werkzeug.wrappers import Request, Response
+
+from .game_logic import _new_id
+from .leaderboard import (
+    DEFAULT_LEADERBOARD,
+    LEADERBOARD_KEYS,
+    MAX_LEADERBOARD,
+    merge_leaderboards,
+)
+from .lobby import LOBBY_PAGE, MAX_LOBBY_PAGE, decode_cursor
+
+# Заголовки ответа процесса: его номер и число игр в нём
+WORKER_HEADER = "X-Dice-Worker"
+LOAD_HEADER = "X-Dice-Games"
+
+# Заголовки одного соединения, которые не пересылаются (RFC 9110, 7.6.1)
+_HOP_BY_HOP = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+        "content-length",
+    }
+)
+
+_GAME_PATH = re.compile(r"^/game/([^/]+)")
+
+
+def worker_for(game_id: str, workers: int) -> int:
+    """Номер процесса, владеющего игрой; одинаков во всех процессах"""
+    digest = hashlib.blake2b(game_id.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % workers
+
+
+def affine_id_factory(
+    index: int, workers: int, new_id: Callable[[], str] = _new_id
+) -> Callable[[], str]:
+    """Генератор ID, которые ``worker_for`` относит к процессу ``index``.
+
+    В среднем нужно ``workers`` попыток — микросекунды на создание игры.
+    """
+
+    def mint() -> str:
+        while True:
+            game_id = new_id()
+            if worker_for(game_id, workers) == index:
+                return game_id
+
+    return mint
+
+
+def _error(message: str, status: int) -> Response:
+    return Response(
+        json.dumps({"success": False, "error": message}, ensure_ascii=False),
+        status=status,
+        mimetype="application/json",
+    )
+
+
+class Router:
+    """Фронтальный маршрутизатор запросов к процессам-обработчикам.
+
+    - ``/game/<game_id>/...`` и ``/join_game`` — процессу, владеющему игрой;
+    - ``/create_game`` — наименее загруженному процессу (по числу игр из
+      заголовка ``X-Dice-Games`` последнего ответа);
+    - ``/games``, ``/quick_match``, ``/resume`` и ``/leaderboard`` — всем
+      процессам с объединением ответов;
+    - запрос с заголовком ``X-Dice-Worker: N`` — процессу N (метрики,
+      профилирование); остальное — по кругу, так что ``/metrics`` без
+      заголовка отдаёт счётчики произвольного процесса.
+
+    Соединения с процессами переиспользуются, у каждого потока свои.
+    """
+
+    def __init__(self, workers: Sequence[Tuple[str, int]], timeout: float = 30.0):
+        self.workers = list(workers)
+        self.timeout = timeout
+        self.loads = [0] * len(self.workers)
+        self._lock = threading.Lock()
+        self._round_robin = itertools.cycle(range(len(self.workers)))
+        self._local = threading.local()
+
+    def __call__(self, environ, start_response):
+        request = Request(environ)
+        try:
+            response = self._dispatch(request)
+        except (OSError, http.client.HTTPException):
+            response = _error("Обработчик игры недоступен", 502)
+        return response(environ, start_response)
+
+    def _dispatch(self, request: Request) -> Response:
+        path = request.path
+        pinned = request.headers.get(WORKER_HEADER)
+        if pinned is not None:
+            if not pinned.isdigit() or int(pinned) >= len(self.workers):
+                return _error("Нет такого обработчика", 400)
+            return self._forward(int(pinned), request)
+        match = _GAME_PATH.match(path)
+        if match:
+            return self._forward(worker_for(match.group(1), len(self.workers)), request)
+        if path == "/join_game":
+            data = request.get_json(silent=True)
+            game_id = data.get("game_id") if isinstance(data, dict) else None
+            if isinstance(game_id, str) and game_id:
+                return self._forward(worker_for(game_id, len(self.workers)), request)
+        elif path == "/create_game":
+            return self._forward(self._least_loaded(), request)
+        elif path == "/games":
+            return self._merge_lobby(request)
+        elif path == "/quick_match":
+            return self._quick_match(request)
+        elif path == "/resume":
+            return self._resume(request)
+        elif path == "/leaderboard":
+            return self._leaderboard(request)
+        with self._lock:
+            index = next(self._round_robin)
+        return self._forward(index, request)
+
+    def _least_loaded(self) -> int:
+        with self._lock:
+            index = min(range(len(self.loads)), key=self.loads.__getitem__)
+            # До ответа процесса считаем, что игра в нём уже есть
+            self.loads[index] += 1
+        return index
+
+    def _connection(self, index: int) -> Tuple[http.client.HTTPConnection, bool]:
+        pool: Optional[Dict[int, http.client.HTTPConnection]]
+        pool = getattr(self._local, "pool", None)
+        if pool is None:
+            pool = self._local.pool = {}
+        conn = pool.get(index)
+        if conn is not None:
+            return conn, True
+        host, port = self.workers[index]
+        conn = pool[index] = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        return conn, False
+
+    def _drop(self, index: int):
+        conn = self._local.pool.pop(index, None)
+        if conn is not None:
+            conn.close()
+
+    def _send(
+        self, index: int, request: Request, body: bytes, target: Optional[str] = None
+    ) -> http.client.HTTPResponse:
+        headers = {
+            key: value
+            for key, value in request.headers.items()
+            if key.lower() not in _HOP_BY_HOP
+        }
+        headers["X-Forwarded-For"] = request.remote_addr or ""
+        # Исходная строка запроса, как её прислал клиент
+        if target is None:
+            target = request.environ.get("RAW_URI") or request.full_path
+        while True:
+            conn, reused = self._connection(index)
+            try:
+                conn.request(request.method, target, body=body or None, headers=headers)
+                return conn.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # Процесс закрыл простаивавшее соединение — повторяем на новом;
+                # ошибку нового соединения отдаём наверх
+                self._drop(index)
+                if not reused:
+                    raise
+            except (OSError, http.client.HTTPException):
+                self._drop(index)
+                raise
+
+    def _forward(self, index: int, request: Request) -> Response:
+        upstream = self._send(index, request, request.get_data())
+        self._note_load(index, upstream)
+        headers = [
+            (key, value)
+            for key, value in upstream.getheaders()
+            if key.lower() not in _HOP_BY_HOP
+        ]
+        if (upstream.getheader("Content-Type") or "").startswith("text/event-stream"):
+            # Поток событий занимает соединение до конца — в пул оно не вернётся
+            conn = self._local.pool.pop(index)
+            return Response(
+                self._stream(conn, upstream),
+                status=upstream.status,
+                headers=headers,
+                direct_passthrough=True,
+            )
+        data = upstream.read()
+        if upstream.will_close:
+            self._drop(index)
+        return Response(data, status=upstream.status, headers=headers)
+
+    @staticmethod
+    def _stream(conn: http.client.HTTPConnection, upstream: http.client.HTTPResponse):
+        try:
+            while True:
+                chunk = upstream.read1(8192)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            conn.close()
+
+    def _note_load(self, index: int, upstream: http.client.HTTPResponse):
+        load = upstream.getheader(LOAD_HEADER)
+        if load is not None and load.isdigit():
+            with self._lock:
+                self.loads[index] = int(load)
+
+    def _gather(self, request: Request, target: Optional[str] = None) -> List[Dict]:
+        """JSON-ответы всех процессов на один и тот же запрос"""
+        results = []
+        for index in range(len(self.workers)):
+            upstream = self._send(index, request, b"", target)
+            self._note_load(index, upstream)
+            data = upstream.read()
+            if upstream.will_close:
+                self._drop(index)
+            if upstream.status == 400:
+                return [json.loads(data)]
+            results.append(json.loads(data))
+        return results
+
+    def _merge_lobby(self, request: Request) -> Response:
+        # Курсор — ключ игры, а не позиция, поэтому он годится для всех процессов:
+        # каждый отдаёт свою первую страницу после него, берётся общая первая
+        pages = self._gather(request)
+        if any(not page.get("success") for page in pages):
+            return _error(pages[0].get("error", "Ошибка"), 400)
+        limit = request.args.get("limit", LOBBY_PAGE, type=int)
+        limit = max(1, min(limit, MAX_LOBBY_PAGE))
+        games = sorted(
+            (game for page in pages for game in page["games"]),
+            key=lambda game: decode_cursor(game["cursor"]),
+        )
+        more = len(games) > limit or any(page["next_cursor"] for page in pages)
+        games = games[:limit]
+        body = {
+            "success": True,
+            "games": games,
+            "next_cursor": games[-1]["cursor"] if more and games else None,
+        }
+        return Response(
+            json.dumps(body, ensure_ascii=False), mimetype="application/json"
+        )
+
+    def _quick_match(self, request: Request) -> Response:
+        found = [result["game"] for result in self._gather(request) if result.get("success")]
+        if not found:
+            return _error("Нет открытых игр", 404)
+        game = min(found, key=lambda game: decode_cursor(game["cursor"]))
+        return Response(
+            json.dumps({"success": True, "game": game}, ensure_ascii=False),
+            mimetype="application/json",
+        )
+
+    def _resume(self, request: Request) -> Response:
+        # Игры одного игрока могут жить в разных процессах
+        found = [result for result in self._gather(request) if result.get("success")]
+        if not found:
+            return _error("Нет незавершённых игр", 404)
+        games = sorted(
+            (game for result in found for game in result["games"]),
+            key=lambda game: game["created_at"],
+            reverse=True,
+        )
+        games.sort(key=lambda game: not game["is_current"])
+        body = {"success": True, "player_id": found[0]["player_id"], "games": games}
+        return Response(
+            json.dumps(body, ensure_ascii=False), mimetype="application/json"
+        )
+
+    def _leaderboard(self, request: Request) -> Response:
+        by = request.args.get("by", DEFAULT_LEADERBOARD)
+        if by not in LEADERBOARD_KEYS:
+            return _error("Неизвестная таблица", 400)
+        pages = self._gather(request)
+        if any(not page.get("success") for page in pages):
+            return _error(pages[0].get("error", "Ошибка"), 400)
+        limit = request.args.get("limit", 10, type=int)
+        limit = max(1, min(limit, MAX_LEADERBOARD))
+        names = sorted({player["name"] for page in pages for player in page["players"]})
+        if len(self.workers) > 1 and names and not request.args.getlist("player"):
+            # Кандидаты — первые места каждого процесса; их полная статистика
+            # собирается со всех процессов, иначе у игрока, чьи партии шли в
+            # разных процессах, были бы учтены не все
+            query = urlencode([("by", by)] + [("player", name) for name in names])
+            pages = self._gather(request, f"/leaderboard?{query}")
+        players = merge_leaderboards([page["players"] for page in pages], by, limit)
+        return Response(
+            json.dumps({"success": True, "by": by, "players": players}, ensure_ascii=False),
+            mimetype="application/json",
+        )
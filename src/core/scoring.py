@@ -0,0 +1,105 @@
+"""Комбинации, таблица очков и предвычисленные таблицы оценки бросков"""
+
+from enum import Enum
+from itertools import combinations_with_replacement, product
+from typing import Dict, List, Sequence, Tuple
+
+
+class Combination(Enum):
+    FIVE_OF_A_KIND = "Пять одинаковых"
+    FOUR_OF_A_KIND = "Четыре одинаковых"
+    FULL_HOUSE = "Фулл-хаус"
+    STRAIGHT = "Стрит"
+    THREE_OF_A_KIND = "Три одинаковых"
+    TWO_PAIRS = "Две пары"
+    ONE_PAIR = "Одна пара"
+    HIGH_DIE = "Старшая кость"
+
+
+# Числовые коды комбинаций: индекс в этом кортеже (0 — пять одинаковых, 7 — старшая кость)
+COMBINATIONS = tuple(Combination)
+COMBINATION_CODES: Dict[Combination, int] = {c: i for i, c in enumerate(COMBINATIONS)}
+
+# Очки за комбинации; для старшей кости очки равны значению максимальной кости
+SCORE_TABLE: Dict[Combination, int] = {
+    Combination.FIVE_OF_A_KIND: 100,
+    Combination.FOUR_OF_A_KIND: 40,
+    Combination.FULL_HOUSE: 25,
+    Combination.STRAIGHT: 20,
+    Combination.THREE_OF_A_KIND: 15,
+    Combination.TWO_PAIRS: 10,
+    Combination.ONE_PAIR: 5,
+}
+
+DICE_COUNT = 5
+DIE_FACES = (1, 2, 3, 4, 5, 6)
+
+
+def classify_roll(dice: Sequence[int]) -> Combination:
+    """Определяет комбинацию прямым подсчётом (эталонная реализация)"""
+    counts: Dict[int, int] = {}
+    for die in dice:
+        counts[die] = counts.get(die, 0) + 1
+    values = list(counts.values())
+
+    if 5 in values:
+        return Combination.FIVE_OF_A_KIND
+    elif 4 in values:
+        return Combination.FOUR_OF_A_KIND
+    elif 3 in values and 2 in values:
+        return Combination.FULL_HOUSE
+    elif 3 in values:
+        return Combination.THREE_OF_A_KIND
+    elif values.count(2) == 2:
+        return Combination.TWO_PAIRS
+    elif 2 in values:
+        return Combination.ONE_PAIR
+    elif _is_straight(counts.keys()):
+        return Combination.STRAIGHT
+    else:
+        return Combination.HIGH_DIE
+
+
+def _is_straight(dice_values) -> bool:
+    unique_values = sorted(set(dice_values))
+    if len(unique_values) != 5:
+        return False
+    return unique_values == [1, 2, 3, 4, 5] or unique_values == [2, 3, 4, 5, 6]
+
+
+def score_roll(
+    combination: Combination,
+    dice: Sequence[int],
+    score_table: Dict[Combination, int] = SCORE_TABLE,
+) -> int:
+    """Возвращает очки за комбинацию по таблице"""
+    if combination is Combination.HIGH_DIE:
+        return max(dice)
+    return score_table.get(combination, 0)
+
+
+def _build_roll_table() -> Dict[Tuple[int, ...], Tuple[Combination, int]]:
+    table = {}
+    for roll in product(DIE_FACES, repeat=DICE_COUNT):
+        combination = classify_roll(roll)
+        table[roll] = (combination, score_roll(combination, roll))
+    return table
+
+
+# Все 6^5 = 7776 упорядоченных бросков -> (комбинация, очки)
+ROLL_TABLE = _build_roll_table()
+
+# 252 отсортированных набора костей (мультимножества) в лексикографическом порядке
+MULTISETS: List[Tuple[int, ...]] = list(
+    combinations_with_replacement(DIE_FACES, DICE_COUNT)
+)
+
+
+def evaluate_roll(dice: Sequence[int]) -> Tuple[Combination, int]:
+    """Возвращает комбинацию и очки броска одним обращением к таблице"""
+    entry = ROLL_TABLE.get(tuple(dice))
+    if entry is None:
+        # Нестандартный бросок (не 5 костей или значения вне 1..6)
+        combination = classify_roll(dice)
+        return combination, score_roll(combination, dice)
+    return entry
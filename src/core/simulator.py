@@ -0,0 +1,261 @@
+"""Пакетная симуляция полных партий для подбора параметров игры.
+
+Партии идут через обычный API ``DicePokerGame`` (add_player -> start_game ->
+reroll_dice/end_turn) и распределяются по пулу процессов. Результат
+полностью определяется ``seed``: партии режутся на блоки фиксированного
+размера, и у каждого блока своё зерно, не зависящее от числа процессов.
+
+Запуск: python -m src.core.simulator --games 1000000 --seed 42
+"""
+
+import argparse
+import json
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .game_logic import DicePokerGame, GameStatus
+from .scoring import COMBINATIONS, Combination, evaluate_roll
+from .solver import solver_for
+
+# Стратегия получает игру, ID игрока и свой генератор; возвращает индексы
+# костей для переброса или пустой список/None, чтобы завершить ход
+Strategy = Callable[[DicePokerGame, str, random.Random], Optional[List[int]]]
+
+# Комбинации, которые жадная стратегия не ломает перебросом
+_MADE_HANDS = (Combination.FIVE_OF_A_KIND, Combination.FULL_HOUSE, Combination.STRAIGHT)
+
+
+def stand_strategy(game: DicePokerGame, player_id: str, rng: random.Random):
+    """Никогда не перебрасывает"""
+    return None
+
+
+def random_strategy(game: DicePokerGame, player_id: str, rng: random.Random):
+    """Перебрасывает случайное подмножество костей"""
+    return [idx for idx in range(5) if rng.random() < 0.5]
+
+
+def greedy_strategy(game: DicePokerGame, player_id: str, rng: random.Random):
+    """Держит самую частую грань (при равенстве — старшую), остальное перебрасывает"""
+    roll = game.current_roll
+    combination, _ = evaluate_roll(roll)
+    if combination in _MADE_HANDS:
+        return None
+    counts = Counter(roll)
+    keep = max(counts, key=lambda face: (counts[face], face))
+    return [idx for idx, die in enumerate(roll) if die != keep]
+
+
+def optimal_strategy(game: DicePokerGame, player_id: str, rng: random.Random):
+    """Перебрасывает кости по точному решателю (максимум матожидания)"""
+    solver = solver_for(game.score_table, game.max_rerolls)
+    return solver.best_hold(game.current_roll, game.remaining_rerolls).reroll
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    "stand": stand_strategy,
+    "random": random_strategy,
+    "greedy": greedy_strategy,
+    "optimal": optimal_strategy,
+}
+
+
+@dataclass
+class SimulationConfig:
+    # Стратегии по местам за столом: имя из STRATEGIES или функция уровня модуля
+    strategies: Sequence[Union[str, Strategy]] = ("optimal", "random")
+    max_rounds: int = 3
+    max_rerolls: int = 2
+    score_table: Optional[Dict[Combination, int]] = None
+
+
+@dataclass
+class SimulationReport:
+    seats: int
+    games: int = 0
+    # Победы по местам; при ничьей победа делится поровну
+    wins: List[float] = field(default_factory=list)
+    ties: int = 0
+    score_histograms: List[Counter] = field(default_factory=list)
+    combination_counts: List[Counter] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.wins:
+            self.wins = [0.0] * self.seats
+        if not self.score_histograms:
+            self.score_histograms = [Counter() for _ in range(self.seats)]
+        if not self.combination_counts:
+            self.combination_counts = [Counter() for _ in range(self.seats)]
+
+    def merge(self, other: "SimulationReport") -> "SimulationReport":
+        self.games += other.games
+        self.ties += other.ties
+        for seat in range(self.seats):
+            self.wins[seat] += other.wins[seat]
+            self.score_histograms[seat].update(other.score_histograms[seat])
+            self.combination_counts[seat].update(other.combination_counts[seat])
+        return self
+
+    def win_rates(self) -> List[float]:
+        return [w / self.games if self.games else 0.0 for w in self.wins]
+
+    def mean_scores(self) -> List[float]:
+        means = []
+        for histogram in self.score_histograms:
+            total = sum(histogram.values())
+            means.append(
+                sum(s * n for s, n in histogram.items()) / total if total else 0.0
+            )
+        return means
+
+    def combination_frequencies(self) -> List[Dict[str, float]]:
+        frequencies = []
+        for counts in self.combination_counts:
+            total = sum(counts.values())
+            frequencies.append(
+                {c.name: counts[c.name] / total if total else 0.0 for c in Combination}
+            )
+        return frequencies
+
+    def to_dict(self) -> Dict:
+        return {
+            "games": self.games,
+            "ties": self.ties,
+            "win_rates": self.win_rates(),
+            "mean_scores": self.mean_scores(),
+            "score_histograms": [
+                dict(sorted(h.items())) for h in self.score_histograms
+            ],
+            "combination_frequencies": self.combination_frequencies(),
+        }
+
+
+def _resolve(strategy: Union[str, Strategy]) -> Strategy:
+    if callable(strategy):
+        return strategy
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Неизвестная стратегия: {strategy}")
+    return STRATEGIES[strategy]
+
+
+def play_game(
+    config: SimulationConfig, rng: random.Random, game_id: str = "sim"
+) -> DicePokerGame:
+    """Играет одну партию до конца и возвращает завершённую игру"""
+    strategies = [_resolve(s) for s in config.strategies]
+    game = DicePokerGame(
+        game_id,
+        max_players=len(strategies),
+        max_rounds=config.max_rounds,
+        max_rerolls=config.max_rerolls,
+        score_table=config.score_table,
+        seed=rng.getrandbits(63),
+    )
+    by_player = {}
+    for seat, strategy in enumerate(strategies):
+        player_id = game.add_player(f"P{seat}")
+        game.set_player_ready(player_id)
+        by_player[player_id] = strategy
+    game.start_game()
+
+    while game.status == GameStatus.ACTIVE:
+        player_id = game.get_current_player().id
+        strategy = by_player[player_id]
+        while game.remaining_rerolls > 0:
+            to_reroll = strategy(game, player_id, rng)
+            if not to_reroll:
+                break
+            game.reroll_dice(player_id, to_reroll)
+        game.end_turn(player_id)
+    return game
+
+
+def _run_chunk(task: Tuple[SimulationConfig, int, int]) -> SimulationReport:
+    config, games, chunk_seed = task
+    report = SimulationReport(seats=len(config.strategies))
+    # Зерно каждой партии берётся из генератора блока
+    rng = random.Random(chunk_seed)
+    for _ in range(games):
+        game = play_game(config, rng)
+        seat_of = {pid: seat for seat, pid in enumerate(game.players)}
+        scores = [p.score for p in game.players.values()]
+        best = max(scores)
+        winners = [seat for seat, score in enumerate(scores) if score == best]
+        if len(winners) > 1:
+            report.ties += 1
+        for seat in winners:
+            report.wins[seat] += 1 / len(winners)
+        for seat, score in enumerate(scores):
+            report.score_histograms[seat][score] += 1
+        history = game.turns_history
+        for player_id, code in zip(
+            history.player_ids(), history.combination_codes()
+        ):
+            report.combination_counts[seat_of[player_id]][
+                COMBINATIONS[code].name
+            ] += 1
+        report.games += 1
+    return report
+
+
+def simulate(
+    config: SimulationConfig,
+    games: int,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    chunk_size: int = 10_000,
+) -> SimulationReport:
+    """Симулирует ``games`` партий; ``workers=1`` — без пула процессов"""
+    for strategy in config.strategies:
+        _resolve(strategy)
+    seeder = random.Random(seed)
+    tasks = []
+    remaining = games
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        tasks.append((config, size, seeder.getrandbits(64)))
+        remaining -= size
+
+    report = SimulationReport(seats=len(config.strategies))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        for partial in map(_run_chunk, tasks):
+            report.merge(partial)
+        return report
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(_run_chunk, tasks):
+            report.merge(partial)
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Симуляция партий покера на костях")
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument(
+        "--strategies", nargs="+", default=["optimal", "random"], choices=STRATEGIES
+    )
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--rerolls", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    config = SimulationConfig(
+        strategies=tuple(args.strategies),
+        max_rounds=args.rounds,
+        max_rerolls=args.rerolls,
+    )
+    report = simulate(
+        config, args.games, args.seed, workers=args.workers, chunk_size=args.chunk_size
+    )
+    print(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Точный выбор удерживаемых костей (expectimax по 252 наборам костей)"""
+
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations_with_replacement, product
+from math import factorial
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .scoring import (
+    DICE_COUNT,
+    DIE_FACES,
+    MULTISETS,
+    SCORE_TABLE,
+    Combination,
+    classify_roll,
+    score_roll,
+)
+
+Hold = Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class HoldAdvice:
+    keep: List[int]
+    reroll: List[int]
+    expected_score: float
+
+
+def _outcome_probabilities(count: int) -> List[Tuple[Hold, float]]:
+    """Все исходы броска ``count`` костей как наборы с вероятностями"""
+    total = 6 ** count
+    outcomes = []
+    for outcome in combinations_with_replacement(DIE_FACES, count):
+        ways = factorial(count)
+        for repeats in Counter(outcome).values():
+            ways //= factorial(repeats)
+        outcomes.append((outcome, ways / total))
+    return outcomes
+
+
+def _sub_holds(multiset: Hold) -> List[Hold]:
+    """Все различные поднаборы набора костей (варианты удержания)"""
+    counts = sorted(Counter(multiset).items())
+    holds = []
+    for taken in product(*(range(n + 1) for _, n in counts)):
+        hold = []
+        for (face, _), k in zip(counts, taken):
+            hold.extend([face] * k)
+        holds.append(tuple(hold))
+    return holds
+
+
+class HoldSolver:
+    """Expectimax по оставшимся перебросам с таблицами переходов.
+
+    Все значения считаются один раз в конструкторе; запрос — поиск в словаре.
+    """
+
+    def __init__(
+        self,
+        score_table: Dict[Combination, int] = SCORE_TABLE,
+        max_rerolls: int = 2,
+    ):
+        self.max_rerolls = max_rerolls
+        holds_by_size: Dict[int, List[Hold]] = {
+            size: list(combinations_with_replacement(DIE_FACES, size))
+            for size in range(DICE_COUNT + 1)
+        }
+        outcomes = {
+            count: _outcome_probabilities(count) for count in range(DICE_COUNT + 1)
+        }
+        # Таблица переходов: удержание -> [(итоговый набор, вероятность)]
+        self._transitions: Dict[Hold, List[Tuple[Hold, float]]] = {
+            hold: [
+                (tuple(sorted(hold + outcome)), p)
+                for outcome, p in outcomes[DICE_COUNT - size]
+            ]
+            for size, holds in holds_by_size.items()
+            for hold in holds
+        }
+        self._sub_holds = {m: _sub_holds(m) for m in MULTISETS}
+
+        values = {
+            m: float(score_roll(classify_roll(m), m, score_table)) for m in MULTISETS
+        }
+        # _best[r][набор] = (лучшее удержание, матожидание) при r перебросах
+        self._best: List[Dict[Hold, Tuple[Hold, float]]] = [
+            {m: (m, value) for m, value in values.items()}
+        ]
+        for _ in range(max_rerolls):
+            expected = {
+                hold: sum(values[m] * p for m, p in transitions)
+                for hold, transitions in self._transitions.items()
+            }
+            best = {}
+            for m in MULTISETS:
+                # При равенстве предпочитаем удержать больше костей
+                hold = max(
+                    self._sub_holds[m],
+                    key=lambda h: (round(expected[h], 12), len(h)),
+                )
+                best[m] = (hold, expected[hold])
+            self._best.append(best)
+            values = {m: ev for m, (_, ev) in best.items()}
+
+    def best_hold(self, roll: Sequence[int], remaining_rerolls: int) -> HoldAdvice:
+        """Возвращает удержание с максимальным матожиданием очков"""
+        if not 0 <= remaining_rerolls <= self.max_rerolls:
+            raise ValueError("Недопустимое количество перебросов")
+        multiset = tuple(sorted(roll))
+        entry = self._best[remaining_rerolls].get(multiset)
+        if entry is None:
+            raise ValueError("Бросок должен состоять из 5 костей со значениями 1..6")
+        hold, expected = entry
+
+        to_keep = Counter(hold)
+        keep, reroll = [], []
+        for idx, die in enumerate(roll):
+            if to_keep[die] > 0:
+                to_keep[die] -= 1
+                keep.append(idx)
+            else:
+                reroll.append(idx)
+        return HoldAdvice(keep=keep, reroll=reroll, expected_score=expected)
+
+
+@lru_cache(maxsize=None)
+def default_solver() -> HoldSolver:
+    """Решатель для стандартной таблицы очков и двух перебросов"""
+    return HoldSolver()
+
+
+def solver_for(
+    score_table: Optional[Dict[Combination, int]] = None, max_rerolls: int = 2
+) -> HoldSolver:
+    """Возвращает (кэшированный) решатель для таблицы очков и лимита перебросов"""
+    if score_table is None or score_table == SCORE_TABLE:
+        if max_rerolls == 2:
+            return default_solver()
+        score_table = SCORE_TABLE
+    return _cached_solver(frozenset(score_table.items()), max_rerolls)
+
+
+@lru_cache(maxsize=32)
+def _cached_solver(table_items: frozenset, max_rerolls: int) -> HoldSolver:
+    return HoldSolver(dict(table_items), max_rerolls)
+
+
+def best_hold(roll: Sequence[int], remaining_rerolls: int) -> HoldAdvice:
+    return default_solver().best_hold(roll, remaining_rerolls)
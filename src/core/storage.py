@@ -0,0 +1,251 @@
+"""Хранилища игр: в памяти процесса и журнал SQLite с восстановлением"""
+
+import json
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .game_logic import DicePokerGame, replay
+from .scoring import Combination
+
+# Параметры игры, по которым replay воссоздаёт её с начала
+_ORIGIN_KEYS = ("game_id", "seed", "max_players", "max_rounds", "max_rerolls", "score_table")
+
+
+class GameStore:
+    """Интерфейс хранилища, которым пользуется ``GameManager``.
+
+    Менеджер сохраняет снимок новой игры, передаёт каждое действие игры в
+    ``record`` и сообщает об удалении. При запуске ``load_games``
+    возвращает игры, сохранённые прошлым процессом.
+    """
+
+    def load_games(self) -> List[DicePokerGame]:
+        return []
+
+    def save_snapshot(self, game: DicePokerGame):
+        pass
+
+    def record(self, game: DicePokerGame, action: Dict):
+        pass
+
+    def delete(self, game_id: str):
+        pass
+
+    def replay_game(self, game_id: str) -> Optional[DicePokerGame]:
+        """Повторяет игру с начала по зерну и полному журналу действий"""
+        return None
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class MemoryGameStore(GameStore):
+    """Игры живут только в памяти процесса и теряются при перезапуске"""
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    game_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    game_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    action TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS journal_game ON journal (game_id, version);
+CREATE TABLE IF NOT EXISTS origins (
+    game_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+
+class SQLiteGameStore(GameStore):
+    """Журнал действий в SQLite (режим WAL) со снимками игр.
+
+    ``record`` только кладёт строку в буфер, поэтому ход не ждёт диска.
+    Фоновый поток записывает буфер одной транзакцией, как только в нём
+    набирается ``batch_size`` строк или проходит ``flush_interval`` секунд.
+    Каждые ``snapshot_every`` действий игры пишется её снимок.
+    Восстановление — последний снимок плюс хвост журнала после него.
+    Журнал хранится целиком вместе с зерном и параметрами игры, поэтому
+    ``replay_game`` воспроизводит любую игру с начала.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 256,
+        flush_interval: float = 0.2,
+        snapshot_every: int = 64,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._db_lock = threading.Lock()
+
+        # Буфер операций в порядке поступления: ("journal"|"snapshot"|"delete", ...)
+        self._pending: List[Tuple] = []
+        self._since_snapshot: Dict[str, int] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._run_writer, name="sqlite-game-store", daemon=True
+        )
+        self._writer.start()
+
+    def load_games(self) -> List[DicePokerGame]:
+        self.flush()
+        with self._db_lock:
+            snapshots = self._conn.execute(
+                "SELECT game_id, version, data FROM snapshots"
+            ).fetchall()
+            games = {}
+            for game_id, version, data in snapshots:
+                games[game_id] = DicePokerGame.from_dict(json.loads(data))
+            rows = self._conn.execute(
+                "SELECT j.game_id, j.version, j.action FROM journal j "
+                "JOIN snapshots s ON s.game_id = j.game_id AND j.version > s.version "
+                "ORDER BY j.seq"
+            ).fetchall()
+        for game_id, version, action in rows:
+            game = games.get(game_id)
+            if game is not None and version > game.version:
+                game.apply_action(json.loads(action))
+        return list(games.values())
+
+    def save_snapshot(self, game: DicePokerGame):
+        snapshot = game.to_dict()
+        if game.game_id not in self._since_snapshot:
+            origin = {key: snapshot[key] for key in _ORIGIN_KEYS}
+            self._enqueue(
+                ("origin", game.game_id, json.dumps(origin, ensure_ascii=False))
+            )
+        self._since_snapshot[game.game_id] = 0
+        data = json.dumps(snapshot, ensure_ascii=False)
+        self._enqueue(("snapshot", game.game_id, game.version, data))
+
+    def record(self, game: DicePokerGame, action: Dict):
+        # Вызывается под блокировкой игры, снимок согласован с действием
+        self._enqueue(
+            (
+                "journal",
+                game.game_id,
+                game.version,
+                json.dumps(action, ensure_ascii=False),
+            )
+        )
+        count = self._since_snapshot.get(game.game_id, 0) + 1
+        if count >= self.snapshot_every:
+            self.save_snapshot(game)
+        else:
+            self._since_snapshot[game.game_id] = count
+
+    def delete(self, game_id: str):
+        self._since_snapshot.pop(game_id, None)
+        self._enqueue(("delete", game_id))
+
+    def replay_game(self, game_id: str) -> Optional[DicePokerGame]:
+        self.flush()
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT data FROM origins WHERE game_id = ?", (game_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            actions = [
+                json.loads(action)
+                for (action,) in self._conn.execute(
+                    "SELECT action FROM journal WHERE game_id = ? ORDER BY seq",
+                    (game_id,),
+                )
+            ]
+        options = json.loads(row[0])
+        if options["score_table"] is not None:
+            options["score_table"] = {
+                Combination[name]: p for name, p in options["score_table"].items()
+            }
+        return replay(options.pop("seed"), actions, **options)
+
+    def flush(self):
+        """Синхронно записывает всё накопленное"""
+        self._write_pending()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._writer.join()
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+    def _enqueue(self, item: Tuple):
+        with self._cond:
+            self._pending.append(item)
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    def _run_writer(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._pending) >= self.batch_size,
+                    self.flush_interval,
+                )
+                if self._closed:
+                    return
+            self._write_pending()
+
+    def _write_pending(self):
+        # Буфер забирается под блокировкой базы, чтобы пачки писались по порядку
+        with self._db_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            with self._conn:
+                for item in batch:
+                    kind, game_id = item[0], item[1]
+                    if kind == "journal":
+                        self._conn.execute(
+                            "INSERT INTO journal (game_id, version, action) "
+                            "VALUES (?, ?, ?)",
+                            item[1:],
+                        )
+                    elif kind == "snapshot":
+                        _, _, version, data = item
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO snapshots (game_id, version, data) "
+                            "VALUES (?, ?, ?)",
+                            (game_id, version, data),
+                        )
+                    elif kind == "origin":
+                        self._conn.execute(
+                            "INSERT OR IGNORE INTO origins (game_id, data) "
+                            "VALUES (?, ?)",
+                            item[1:],
+                        )
+                    else:
+                        self._conn.execute(
+                            "DELETE FROM snapshots WHERE game_id = ?", (game_id,)
+                        )
+                        self._conn.execute(
+                            "DELETE FROM journal WHERE game_id = ?", (game_id,)
+                        )
+                        self._conn.execute(
+                            "DELETE FROM origins WHERE game_id = ?", (game_id,)
+                        )
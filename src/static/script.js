@@ -4,6 +4,9 @@ class PokerDiceGame {
         this.playerId = null;
         this.playerName = null;
         this.pollInterval = null;
+        this.eventSource = null;
+        // Последнее полученное состояние: к нему применяются патчи сервера
+        this.gameState = null;
         this.currentSelectedDice = [];
         this.currentRerolls = 0;
         this.isInteractive = false;
@@ -27,6 +30,7 @@ class PokerDiceGame {
         
         // Игровые кнопки
         document.getElementById('ready-btn')?.addEventListener('click', () => this.setReady());
+        document.getElementById('add-bot-btn')?.addEventListener('click', () => this.addBot());
         document.getElementById('reroll-btn')?.addEventListener('click', () => this.rerollDice());
         document.getElementById('end-turn-btn')?.addEventListener('click', () => this.endTurn());
         document.getElementById('leave-game')?.addEventListener('click', () => this.leaveGame());
@@ -34,7 +38,7 @@ class PokerDiceGame {
     }
     
     initializeGamePage() {
-        // Если мы на странице игры, запускаем опрос состояния
+        // Если мы на странице игры, подписываемся на обновления состояния
         if (window.location.pathname.includes('/game/')) {
             this.gameId = window.location.pathname.split('/').pop();
             
@@ -44,13 +48,59 @@ class PokerDiceGame {
             
             if (this.gameId && this.playerId) {
                 console.log('Initializing game page for game:', this.gameId, 'player:', this.playerId);
-                this.startPolling();
+                this.startUpdates();
             } else {
-                console.error('Missing gameId or playerId');
+                // Новая вкладка: ID игрока берём из сессии на сервере
+                this.resumeGame();
             }
+        } else if (document.getElementById('resume-games')) {
+            this.showResumableGames();
         }
     }
     
+    async fetchResume() {
+        try {
+            const response = await fetch('/resume');
+            const data = await response.json();
+            return data.success ? data : null;
+        } catch (error) {
+            console.error('Error resuming:', error);
+            return null;
+        }
+    }
+    
+    async resumeGame() {
+        const data = await this.fetchResume();
+        const entry = data && data.games.find(game => game.game_id === this.gameId);
+        if (!entry) {
+            console.error('Missing gameId or playerId');
+            return;
+        }
+        this.playerId = data.player_id;
+        const me = entry.game_state.players.find(player => player.id === this.playerId);
+        this.playerName = me ? me.name : null;
+        sessionStorage.setItem('playerId', this.playerId);
+        if (this.playerName) sessionStorage.setItem('playerName', this.playerName);
+        this.updateGameState(entry.game_state);
+        this.startUpdates();
+    }
+    
+    async showResumableGames() {
+        const data = await this.fetchResume();
+        if (!data) return;
+        const container = document.getElementById('resume-games');
+        const list = container.querySelector('ul');
+        data.games.forEach(game => {
+            const item = document.createElement('li');
+            const link = document.createElement('a');
+            link.href = `/game/${game.game_id}`;
+            link.textContent = `Игра ${game.game_id} (${game.game_state.status === 'waiting' ? 'ожидание' : 'идёт'})`;
+            item.appendChild(link);
+            list.appendChild(item);
+        });
+        container.style.display = 'block';
+    }
+    
     async createGame() {
         const playerName = document.getElementById('create-player-name').value;
         const maxPlayers = document.getElementById('max-players').value;
@@ -140,7 +190,7 @@ class PokerDiceGame {
             if (data.success) {
                 console.log('Player ready, game started:', data.game_started);
                 if (data.game_started) {
-                    this.startPolling();
+                    this.startUpdates();
                 }
                 this.updateGameState(data.game_state);
             } else {
@@ -151,6 +201,69 @@ class PokerDiceGame {
         }
     }
     
+    async addBot() {
+        try {
+            const level = document.getElementById('bot-level')?.value || 'medium';
+            const response = await fetch(`/game/${this.gameId}/add_bot`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ level })
+            });
+            
+            const data = await response.json();
+            
+            if (data.success) {
+                this.updateGameState(data.game_state);
+            } else {
+                console.error('Failed to add bot:', data.error);
+            }
+        } catch (error) {
+            console.error('Error adding bot:', error);
+        }
+    }
+    
+    startUpdates() {
+        // Поток событий уже открыт — сервер сам пришлёт изменения
+        if (this.eventSource) return;
+        
+        if (!window.EventSource) {
+            this.startPolling();
+            return;
+        }
+        
+        console.log('Subscribing to game events...');
+        this.eventSource = new EventSource(`/game/${this.gameId}/events?patches=1`);
+        
+        this.eventSource.onmessage = (event) => {
+            this.updateGameState(JSON.parse(event.data));
+        };
+        
+        // После первого состояния сервер присылает только изменения
+        this.eventSource.addEventListener('patch', (event) => {
+            if (this.gameState) {
+                this.updateGameState(applyPatch(this.gameState, JSON.parse(event.data)));
+            }
+        });
+        
+        // При обрыве потока переходим на периодический опрос
+        this.eventSource.onerror = () => {
+            console.warn('Event stream lost, falling back to polling');
+            this.stopUpdates();
+            this.startPolling();
+        };
+    }
+    
+    stopUpdates() {
+        if (this.eventSource) {
+            this.eventSource.close();
+            this.eventSource = null;
+        }
+        if (this.pollInterval) {
+            clearInterval(this.pollInterval);
+            this.pollInterval = null;
+        }
+    }
+    
     startPolling() {
         console.log('Starting game state polling...');
         
@@ -169,21 +282,29 @@ class PokerDiceGame {
     
     async updateGameStateFromServer() {
         try {
-            const response = await fetch(`/game/${this.gameId}/state`);
+            // Зная версию, просим только изменения после неё
+            const since = this.gameState ? `?since=${this.gameState.version}` : '';
+            const response = await fetch(`/game/${this.gameId}/state${since}`);
             
             if (!response.ok) {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
             
-            const gameState = await response.json();
+            const data = await response.json();
             
-            if (gameState.error) {
-                console.error('Game error:', gameState.error);
-                this.showMessage(`Ошибка игры: ${gameState.error}`, 'error');
+            if (data.error) {
+                console.error('Game error:', data.error);
+                this.showMessage(`Ошибка игры: ${data.error}`, 'error');
                 return;
             }
             
-            this.updateGameState(gameState);
+            if (data.patch) {
+                // Пустой патч — с прошлого опроса ничего не изменилось
+                if (Object.keys(data.patch).length === 0) return;
+                this.updateGameState(applyPatch(this.gameState, data.patch));
+            } else {
+                this.updateGameState(data);
+            }
             
         } catch (error) {
             console.error('Error fetching game state:', error);
@@ -191,17 +312,15 @@ class PokerDiceGame {
     }
     
     updateGameState(gameState) {
+        this.gameState = gameState;
         this.updatePlayersList(gameState.players);
         this.updateGameInfo(gameState);
         this.updateGameControls(gameState);
         this.updateDiceArea(gameState);
         
         if (gameState.status === 'completed') {
-            console.log('Game completed, stopping polling');
-            if (this.pollInterval) {
-                clearInterval(this.pollInterval);
-                this.pollInterval = null;
-            }
+            console.log('Game completed, stopping updates');
+            this.stopUpdates();
             this.showResults(gameState);
         }
     }
@@ -220,7 +339,7 @@ class PokerDiceGame {
             
             return `
                 <div class="${classes}">
-                    <span>${player.name} ${isCurrent ? '🎲' : ''} ${isYou ? '(Вы)' : ''}</span>
+                    <span>${player.name} ${player.is_bot ? '🤖' : ''} ${isCurrent ? '🎲' : ''} ${isYou ? '(Вы)' : ''}</span>
                     <span class="player-score">${player.score}</span>
                 </div>
             `;
@@ -490,6 +609,7 @@ class PokerDiceGame {
     async leaveGame() {
         if (confirm('Вы уверены, что хотите покинуть игру?')) {
             try {
+                this.stopUpdates();
                 await fetch(`/game/${this.gameId}/leave`, { method: 'POST' });
                 // Очищаем sessionStorage
                 sessionStorage.removeItem('playerId');
@@ -537,6 +657,39 @@ class PokerDiceGame {
     }
 }
 
+// Собирает новое состояние игры из старого и патча сервера (см. src/core/delta.py)
+function applyPatch(state, patch) {
+    const result = { ...state };
+    for (const [key, value] of Object.entries(patch)) {
+        if (key === 'players' && Array.isArray(value)) {
+            result.players = value;
+        } else if (key === 'players') {
+            const players = new Map(state.players.map(player => [player.id, player]));
+            for (const [id, fields] of Object.entries(value.changed || {})) {
+                players.set(id, { ...(players.get(id) || {}), ...fields });
+            }
+            const order = value.order || state.players.map(player => player.id);
+            result.players = order.map(id => players.get(id));
+        } else if (key === 'turn') {
+            const turn = { ...result.current_turn };
+            for (const [field, change] of Object.entries(value)) {
+                if (field === 'roll') {
+                    turn.roll = [...turn.roll];
+                    for (const [idx, die] of Object.entries(change)) {
+                        turn.roll[Number(idx)] = die;
+                    }
+                } else {
+                    turn[field] = change;
+                }
+            }
+            result.current_turn = turn;
+        } else {
+            result[key] = value;
+        }
+    }
+    return result;
+}
+
 // Инициализация игры при загрузке страницы
 document.addEventListener('DOMContentLoaded', function() {
     window.game = new PokerDiceGame();
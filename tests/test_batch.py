@@ -0,0 +1,37 @@
+from itertools import product
+
+import numpy as np
+import pytest
+
+from src.core.batch import evaluate_batch
+from src.core.scoring import COMBINATIONS, ROLL_TABLE, Combination
+
+
+def test_batch_agrees_with_per_roll_table_for_all_rolls():
+    rolls = np.array(list(product(range(1, 7), repeat=5)), dtype=np.int8)
+    codes, scores = evaluate_batch(rolls)
+    assert codes.shape == scores.shape == (len(rolls),)
+    for roll, code, score in zip(rolls.tolist(), codes.tolist(), scores.tolist()):
+        assert ROLL_TABLE[tuple(roll)] == (COMBINATIONS[code], score)
+
+
+def test_batch_uses_custom_score_table():
+    rolls = [[3, 3, 3, 5, 5], [1, 2, 4, 5, 6]]
+    table = {Combination.FULL_HOUSE: 30}
+    codes, scores = evaluate_batch(rolls, score_table=table)
+    assert COMBINATIONS[codes[0]] is Combination.FULL_HOUSE
+    assert scores.tolist() == [30, 6]
+
+
+def test_batch_accepts_empty_input():
+    codes, scores = evaluate_batch(np.empty((0, 5), dtype=np.int64))
+    assert codes.size == 0 and scores.size == 0
+
+
+@pytest.mark.parametrize(
+    "rolls",
+    [[[1, 2, 3, 4]], [[1, 2, 3, 4, 7]], [[0, 2, 3, 4, 5]], [[1.0, 2.0, 3.0, 4.0, 5.0]]],
+)
+def test_batch_rejects_invalid_input(rolls):
+    with pytest.raises(ValueError):
+        evaluate_batch(rolls)
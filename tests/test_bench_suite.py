@@ -0,0 +1,30 @@
+import json
+
+from benchmarks import suite
+
+
+def test_compare_flags_only_slowdowns_above_threshold():
+    baseline = {
+        "a": {"ns_per_op": 100.0, "relative": 1.0},
+        "b": {"ns_per_op": 100.0, "relative": 1.0},
+    }
+    results = {
+        "a": {"ns_per_op": 120.0, "relative": 1.2},
+        "b": {"ns_per_op": 200.0, "relative": 1.5},
+        "new": {"ns_per_op": 1.0, "relative": 9.0},
+    }
+    assert suite.compare(results, baseline, 0.3) == ["b"]
+    assert suite.compare(results, baseline, 0.1) == ["a", "b"]
+
+
+def test_baseline_round_trip_and_exit_code(tmp_path):
+    path = tmp_path / "baseline.json"
+    args = ["--only", "evaluate_combination", "--repeat", "1", "--min-time", "0.01"]
+    assert suite.main(args + ["--save", "--baseline", str(path)]) == 0
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert set(data["benchmarks"]) == {"evaluate_combination"}
+
+    # База в 100 раз быстрее — регрессия
+    data["benchmarks"]["evaluate_combination"]["relative"] /= 100
+    path.write_text(json.dumps(data), encoding="utf-8")
+    assert suite.main(args + ["--baseline", str(path)]) == 1
@@ -0,0 +1,110 @@
+import time
+
+import pytest
+
+from src.core.bots import BOT_LEVELS, BotScheduler
+from src.core.game_logic import DicePokerGame, GameManager, GameStatus
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def bot_game(gm, levels, humans=()):
+    game = gm.get_game(gm.create_game(max_players=4, max_rounds=3))
+    human_ids = [game.add_player(name) for name in humans]
+    for idx, level in enumerate(levels):
+        game.add_bot(f"Bot{idx}", level)
+    for pid in human_ids:
+        game.set_player_ready(pid)
+    assert game.start_game() is True
+    return game, human_ids
+
+
+def test_bots_play_until_a_human_turn():
+    clock = FakeClock()
+    gm = GameManager()
+    scheduler = BotScheduler(gm, delay=1.0, clock=clock)
+    game, (human,) = bot_game(gm, ["easy", "hard"], humans=["Human"])
+
+    assert game.get_current_player().id == human
+    assert scheduler.pending() == 0
+    game.end_turn(human)
+    assert scheduler.pending() == 1
+
+    # Шаг бота ещё не созрел
+    assert scheduler.run_due() == 0
+    clock.now = 100.0
+    assert scheduler.run_due(float("inf")) >= 2
+    assert game.get_current_player().id == human
+    assert game.current_round == 2
+    assert len(game.turns_history) == 3
+
+
+def test_single_scheduler_finishes_many_bot_games():
+    gm = GameManager()
+    scheduler = BotScheduler(gm, delay=0.0)
+    games = [bot_game(gm, list(BOT_LEVELS) + ["hard"])[0] for _ in range(200)]
+    scheduler.run_due(float("inf"))
+    assert all(g.status == GameStatus.COMPLETED for g in games)
+    assert all(len(g.turns_history) == 4 * 3 for g in games)
+    assert scheduler.pending() == 0
+
+
+def test_stale_entries_are_skipped():
+    clock = FakeClock()
+    gm = GameManager()
+    scheduler = BotScheduler(gm, delay=0.0, clock=clock)
+    game, _ = bot_game(gm, ["medium", "medium"])
+    bot = game.get_current_player().id
+    # Игру двинули в обход планировщика — запись устарела
+    game.end_turn(bot)
+    assert scheduler.pending() == 2
+    done = scheduler.run_due()
+    assert done >= 1
+    assert game.turns_history[0].player_id == bot
+
+
+def test_scheduler_thread_drives_games():
+    gm = GameManager()
+    scheduler = BotScheduler(gm, delay=0.0)
+    scheduler.start()
+    try:
+        game, _ = bot_game(gm, ["easy", "hard"])
+        deadline = time.monotonic() + 5
+        while game.status != GameStatus.COMPLETED and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert game.status == GameStatus.COMPLETED
+    finally:
+        scheduler.stop()
+
+
+def test_bots_survive_snapshot_and_replay():
+    game = DicePokerGame("g")
+    actions = []
+    game.on_change = lambda g, action: actions.append(action)
+    human = game.add_player("Human")
+    bot = game.add_bot("Bot", "hard")
+    assert game.players[bot].is_ready is True
+    assert game.get_game_state(human)["players"][1]["is_bot"] is True
+
+    assert DicePokerGame.from_dict(game.to_dict()).bots == {bot: "hard"}
+    replayed = DicePokerGame("g", seed=game.seed)
+    for action in actions:
+        replayed.apply_action(action)
+    assert replayed.bots == {bot: "hard"}
+
+    game.remove_player(bot)
+    assert game.bots == {}
+
+
+def test_add_bot_respects_table_limits():
+    game = DicePokerGame("g", max_players=2)
+    game.add_player("A")
+    game.add_bot("B", "easy")
+    with pytest.raises(ValueError):
+        game.add_bot("C", "easy")
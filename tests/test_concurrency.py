@@ -0,0 +1,140 @@
+import random
+import sys
+import threading
+
+import pytest
+
+from src.core.game_logic import GameManager, GameStatus
+
+
+@pytest.fixture()
+def fast_switching():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_threads(count, target):
+    errors = []
+
+    def guarded(n):
+        try:
+            target(n)
+        except Exception as exc:  # pragma: no cover - отчёт о сбое
+            errors.append(exc)
+
+    threads = [threading.Thread(target=guarded, args=(n,)) for n in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+
+
+def test_hammering_one_game_keeps_invariants(fast_switching):
+    gm = GameManager()
+    gid = gm.create_game(max_players=4, max_rounds=25)
+    game = gm.get_game(gid)
+    ids = [game.add_player(f"P{i}") for i in range(4)]
+    for pid in ids:
+        game.set_player_ready(pid)
+    assert game.start_game() is True
+
+    ended = []
+    rerolled = []
+
+    def worker(n):
+        rng = random.Random(n)
+        while game.status == GameStatus.ACTIVE:
+            pid = rng.choice(ids)
+            action = rng.random()
+            if action < 0.4:
+                if game.reroll_dice(pid, [rng.randrange(5)]):
+                    rerolled.append(pid)
+            elif action < 0.7:
+                if game.end_turn(pid):
+                    ended.append(pid)
+            else:
+                state = game.get_game_state(pid)
+                current = [p for p in state["players"] if p["is_current"]]
+                assert len(current) <= 1
+                if state["current_turn"]:
+                    assert 0 <= state["current_turn"]["remaining_rerolls"] <= 2
+                    assert len(state["current_turn"]["roll"]) == 5
+
+    run_threads(8, worker)
+
+    assert game.status == GameStatus.COMPLETED
+    assert len(ended) == len(game.turns_history) == 4 * 25
+    # Каждый ход сделан своим игроком, по кругу
+    assert [t.player_id for t in game.turns_history] == ids * 25
+    assert ended == ids * 25
+    for player in game.players.values():
+        assert player.score == sum(
+            t.score for t in game.turns_history if t.player_id == player.id
+        )
+    # Не больше двух перебросов за ход
+    assert len(rerolled) <= 2 * len(game.turns_history)
+    state = game.get_game_state()
+    assert state["players"][0]["score"] == max(p.score for p in game.players.values())
+
+
+def test_concurrent_leaves_and_turns_keep_seats_consistent(fast_switching):
+    gm = GameManager()
+    for _ in range(30):
+        game = gm.get_game(gm.create_game(max_players=4, max_rounds=3))
+        ids = [game.add_player(f"P{i}") for i in range(4)]
+        for pid in ids:
+            game.set_player_ready(pid)
+        game.start_game()
+
+        def worker(n):
+            rng = random.Random(n)
+            if n < 2:
+                game.remove_player(ids[n * 2])
+            for _ in range(50):
+                game.end_turn(rng.choice(ids))
+                game.get_game_state()
+
+        run_threads(4, worker)
+        assert len(game.players) == 2
+        current = game.get_current_player()
+        if game.status == GameStatus.ACTIVE:
+            assert current is not None and current.id in game.players
+            assert 0 <= game.current_player_index < len(game.players)
+
+
+def test_manager_handles_concurrent_create_and_lookup(fast_switching):
+    gm = GameManager(shard_count=4)
+    created = [[] for _ in range(8)]
+
+    def worker(n):
+        for _ in range(200):
+            gid = gm.create_game()
+            created[n].append(gid)
+            assert gm.get_game(gid) is not None
+        for gid in created[n][::2]:
+            gm.remove_game(gid)
+
+    run_threads(8, worker)
+    remaining = {gid for ids in created for gid in ids[1::2]}
+    assert set(gm.games) == remaining
+    assert len(gm) == len(remaining)
+
+
+def test_start_game_only_once_under_concurrent_ready(fast_switching):
+    for _ in range(50):
+        gm = GameManager()
+        game = gm.get_game(gm.create_game())
+        ids = [game.add_player(f"P{i}") for i in range(4)]
+        started = []
+
+        def worker(n):
+            game.set_player_ready(ids[n])
+            if game.start_game():
+                started.append(n)
+
+        run_threads(4, worker)
+        assert len(started) == 1
+        assert game.status == GameStatus.ACTIVE
@@ -22,7 +22,9 @@ def test_remaining_rerolls_decrement_and_reset(monkeypatch):
     assert game.remaining_rerolls == 2
 
     # Make deterministic reroll results
-    monkeypatch.setattr("src.core.game_logic.random.randint", lambda a, b: 6)
+    monkeypatch.setattr(
+        "src.core.game_logic.DicePokerGame._roll_dice", lambda self, count: [6] * count
+    )
 
     # One reroll decrements
     assert game.reroll_dice(p1, [0, 1]) is True
@@ -63,7 +65,9 @@ def test_reroll_changes_only_selected_indices(monkeypatch):
     game, p1, _ = _start_two_player_game()
     before = list(game.current_roll)
     # Force reroll to set 6
-    monkeypatch.setattr("src.core.game_logic.random.randint", lambda a, b: 6)
+    monkeypatch.setattr(
+        "src.core.game_logic.DicePokerGame._roll_dice", lambda self, count: [6] * count
+    )
     assert game.reroll_dice(p1, [0, 4]) is True
     after = list(game.current_roll)
     for i in range(5):
@@ -0,0 +1,115 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import json
+import random
+
+import pytest
+from src.app import app as flask_app
+from src.core.delta import apply_patch, diff_state
+from src.core.game_logic import STATE_HISTORY, DicePokerGame
+
+
+@pytest.fixture()
+def client():
+    flask_app.config.update({"TESTING": True, "SECRET_KEY": "test-key"})
+    with flask_app.test_client() as c:
+        yield c
+
+
+def _states_of_random_game(seed):
+    rng = random.Random(seed)
+    game = DicePokerGame("g", max_players=3, max_rounds=2, seed=seed)
+    states = [game.get_game_state()]
+    ids = [game.add_player(name) for name in ("A", "B", "C")]
+    states.append(game.get_game_state())
+    for player_id in ids:
+        game.set_player_ready(player_id)
+    game.start_game()
+    states.append(game.get_game_state())
+    while game.status.value == "active":
+        player = game.get_current_player()
+        if rng.random() < 0.6 and game.remaining_rerolls:
+            game.reroll_dice(player.id, rng.sample(range(5), rng.randint(1, 5)))
+        elif rng.random() < 0.05 and len(game.players) > 2:
+            game.remove_player(player.id)
+        else:
+            game.end_turn(player.id)
+        states.append(game.get_game_state())
+    return states
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_patch_round_trip(seed):
+    states = _states_of_random_game(seed)
+    for old, new in zip(states, states[1:]):
+        patch = diff_state(old, new)
+        assert apply_patch(old, patch) == new
+        # Патч не длиннее полного состояния
+        assert len(json.dumps(patch)) <= len(json.dumps(new))
+    # Патч через несколько версий тоже собирает состояние
+    assert apply_patch(states[1], diff_state(states[1], states[-1])) == states[-1]
+
+
+def test_reroll_patch_is_compact():
+    game = DicePokerGame("g", seed=3)
+    ids = [game.add_player(name) for name in ("A", "B")]
+    for player_id in ids:
+        game.set_player_ready(player_id)
+    game.start_game()
+    before = game.get_game_state()
+    game.reroll_dice(ids[0], [0])
+    patch = game.get_state_patch(before["version"])
+    assert set(patch) <= {"version", "turn"}
+    assert set(patch["turn"]) <= {"roll", "remaining_rerolls", "combination"}
+    assert set(patch["turn"].get("roll", {})) <= {"0"}
+
+
+def test_old_versions_fall_back_to_full_state():
+    game = DicePokerGame("g", max_players=STATE_HISTORY + 1, seed=3)
+    first = game.get_game_state()["version"]
+    for idx in range(STATE_HISTORY + 1):
+        game.add_player(f"P{idx}")
+        game.get_game_state()
+    assert game.get_state_patch(first) is None
+    assert game.get_state_patch(game.version) == {}
+    assert game.get_state_patch(game.version + 5) is None
+
+
+def test_state_endpoint_serves_patches(client):
+    gid = client.post("/create_game", json={"max_players": 2}).get_json()["game_id"]
+    client.post("/join_game", json={"game_id": gid, "player_name": "A"})
+    guest = flask_app.test_client()
+    guest.post("/join_game", json={"game_id": gid, "player_name": "B"})
+    client.post(f"/game/{gid}/ready")
+    guest.post(f"/game/{gid}/ready")
+
+    state = client.get(f"/game/{gid}/state").get_json()
+    current = state["players"][0]["is_current"] and client or guest
+    current.post(f"/game/{gid}/reroll", json={"dice_to_reroll": [1, 2]})
+
+    data = client.get(f"/game/{gid}/state?since={state['version']}").get_json()
+    assert data["since"] == state["version"]
+    new_state = apply_patch(state, data["patch"])
+    assert new_state == client.get(f"/game/{gid}/state").get_json()
+
+    # Неизвестная версия — полное состояние
+    full = client.get(f"/game/{gid}/state?since=100000").get_json()
+    assert "patch" not in full and full["version"] == new_state["version"]
+
+
+def test_events_stream_patches_when_asked(client):
+    gid = client.post("/create_game", json={"max_players": 2}).get_json()["game_id"]
+    client.post("/join_game", json={"game_id": gid, "player_name": "A"})
+    response = client.get(f"/game/{gid}/events?patches=1", buffered=False)
+    chunks = (chunk.decode() for chunk in response.response)
+    first = json.loads(next(chunks).split("data: ", 1)[1])
+
+    guest = flask_app.test_client()
+    guest.post("/join_game", json={"game_id": gid, "player_name": "B"})
+    event = next(chunks)
+    assert "event: patch" in event
+    patch = json.loads(event.split("data: ", 1)[1])
+    assert [p["name"] for p in apply_patch(first, patch)["players"]] == ["A", "B"]
+    response.close()
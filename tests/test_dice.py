@@ -0,0 +1,85 @@
+from collections import Counter
+
+import pytest
+
+from src.core.dice import DiceStream
+from src.core.game_logic import DicePokerGame, GameStatus, replay
+
+
+def test_stream_is_determined_by_seed():
+    assert DiceStream(7).roll(500) == DiceStream(7).roll(500)
+    assert DiceStream(7).roll(50) != DiceStream(8).roll(50)
+
+
+def test_stream_faces_are_uniform():
+    counts = Counter(DiceStream(1).roll(60_000))
+    assert set(counts) == {1, 2, 3, 4, 5, 6}
+    assert all(abs(n - 10_000) < 500 for n in counts.values())
+
+
+def test_stream_split_reads_match_one_read():
+    stream = DiceStream(3)
+    parts = []
+    for count in (5, 2, 60, 1, 90):
+        parts.extend(stream.roll(count))
+    assert parts == DiceStream(3).roll(158)
+
+
+def test_stream_resumes_from_state():
+    stream = DiceStream(11)
+    stream.roll(137)
+    resumed = DiceStream(11, *stream.state())
+    assert resumed.roll(40) == stream.roll(40)
+
+
+def test_stream_rejects_bad_seed():
+    with pytest.raises(ValueError):
+        DiceStream(-1)
+
+
+def _played_game(seed):
+    game = DicePokerGame("g", max_rounds=2, seed=seed)
+    actions = []
+    game.on_change = lambda g, action: actions.append(dict(action))
+    a, b = game.add_player("A"), game.add_player("B")
+    game.set_player_ready(a)
+    game.set_player_ready(b)
+    game.start_game()
+    while game.status == GameStatus.ACTIVE:
+        pid = game.get_current_player().id
+        game.reroll_dice(pid, [0, 2, 4])
+        game.end_turn(pid)
+    return game, actions
+
+
+def test_same_seed_gives_same_game():
+    first, _ = _played_game(42)
+    second, _ = _played_game(42)
+    assert [t.roll for t in first.turns_history] == [
+        t.roll for t in second.turns_history
+    ]
+
+
+def test_replay_rebuilds_game_without_recorded_rolls():
+    game, actions = _played_game(5)
+    for action in actions:
+        del action["roll"]
+    replayed = replay(5, actions, game_id="g", max_rounds=2)
+    expected, actual = game.to_dict(), replayed.to_dict()
+    expected.pop("created_at")
+    actual.pop("created_at")
+    assert actual == expected
+
+
+def test_snapshot_continues_dice_stream():
+    game = DicePokerGame("g", seed=9)
+    a, b = game.add_player("A"), game.add_player("B")
+    game.set_player_ready(a)
+    game.set_player_ready(b)
+    game.start_game()
+    game.end_turn(a)
+
+    restored = DicePokerGame.from_dict(game.to_dict())
+    game.reroll_dice(b, [0, 1, 2, 3, 4])
+    restored.reroll_dice(b, [0, 1, 2, 3, 4])
+    assert restored.current_roll == game.current_roll
@@ -0,0 +1,114 @@
+import time
+
+from src.core.game_logic import GameManager, GameStatus
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def start(gm, game_id):
+    game = gm.get_game(game_id)
+    ids = [game.add_player("A"), game.add_player("B")]
+    for pid in ids:
+        game.set_player_ready(pid)
+    assert game.start_game() is True
+    return game
+
+
+def test_idle_games_expire_per_status():
+    clock = FakeClock()
+    gm = GameManager(
+        idle_ttl={GameStatus.WAITING: 10, GameStatus.ACTIVE: 100},
+        sweep_interval=1,
+        clock=clock,
+    )
+    waiting = gm.create_game()
+    active = gm.create_game()
+    start(gm, active)
+
+    clock.now = 50
+    assert gm.sweep() == 1
+    assert waiting not in gm
+    assert active in gm
+    assert gm.evictions[("ttl", "waiting")] == 1
+
+    clock.now = 160
+    assert gm.sweep() == 1
+    assert active not in gm
+    assert gm.evictions[("ttl", "active")] == 1
+
+
+def test_access_keeps_game_alive():
+    clock = FakeClock()
+    gm = GameManager(idle_ttl={GameStatus.WAITING: 10}, sweep_interval=1, clock=clock)
+    gid = gm.create_game()
+    for step in range(1, 6):
+        clock.now = step * 8
+        assert gm.get_game(gid) is not None
+    # Проверка наличия не продлевает жизнь игры
+    clock.now = 100
+    assert gid in gm
+    assert gm.sweep() == 1
+    assert gid not in gm
+
+
+def test_amortized_sweep_runs_on_access():
+    clock = FakeClock()
+    # Попутная проверка охватывает часть, к которой идёт обращение
+    gm = GameManager(
+        idle_ttl={GameStatus.WAITING: 5}, sweep_interval=30, clock=clock, shard_count=1
+    )
+    old = gm.create_game()
+    clock.now = 10
+    fresh = gm.create_game()
+    # Интервал проверки ещё не прошёл
+    assert old in gm
+    clock.now = 31
+    assert gm.get_game(fresh) is not None
+    assert old not in gm
+    # Запрошенная игра продлевается до проверки и не вытесняется
+    assert fresh in gm
+    assert sum(gm.evictions.values()) == 1
+
+
+def test_capacity_evicts_least_recently_used_but_not_active():
+    clock = FakeClock()
+    gm = GameManager(max_games=3, clock=clock, shard_count=1)
+    active = gm.create_game()
+    start(gm, active)
+    first = gm.create_game()
+    second = gm.create_game()
+    gm.get_game(first)  # second теперь самая давняя из неактивных
+
+    third = gm.create_game()
+    assert len(gm) == 3
+    assert second not in gm
+    assert {active, first, third} <= set(gm.games)
+    assert gm.evictions[("capacity", "waiting")] == 1
+
+    # Если вытеснять нечего, кроме активных игр, лимит временно превышается
+    gm2 = GameManager(max_games=1, clock=clock)
+    a = gm2.create_game()
+    start(gm2, a)
+    b = gm2.create_game()
+    start(gm2, b)
+    assert len(gm2) == 2
+
+
+def test_background_reaper_evicts_without_requests():
+    gm = GameManager(idle_ttl={GameStatus.WAITING: 0.01}, sweep_interval=3600)
+    gid = gm.create_game()
+    gm.start_reaper(interval=0.01)
+    try:
+        deadline = time.monotonic() + 2
+        while gid in gm and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        gm.stop_reaper()
+    assert gid not in gm
+    assert gm.evictions[("ttl", "waiting")] == 1
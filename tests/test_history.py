@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+
+from src.core.game_logic import DicePokerGame
+from src.core.history import Turn, TurnLog, pack_roll, unpack_roll
+from src.core.scoring import Combination
+
+
+def _turn(player_id="p1", roll=None, ts=1_700_000_000.25):
+    return Turn(
+        player_id=player_id,
+        roll=roll or [6, 6, 2, 3, 1],
+        combination=Combination.ONE_PAIR,
+        score=12,
+        round_number=2,
+        timestamp=datetime.fromtimestamp(ts),
+    )
+
+
+def test_pack_roll_roundtrip_fits_15_bits():
+    for roll in ([1, 1, 1, 1, 1], [6, 6, 6, 6, 6], [3, 1, 6, 2, 5]):
+        packed = pack_roll(roll)
+        assert 0 <= packed < 1 << 15
+        assert unpack_roll(packed) == roll
+
+
+def test_pack_roll_rejects_bad_dice():
+    with pytest.raises(ValueError):
+        pack_roll([1, 2, 3])
+    with pytest.raises(ValueError):
+        pack_roll([0, 2, 3, 4, 5])
+
+
+def test_turn_log_yields_equal_turns():
+    turns = [_turn("p1"), _turn("p2", [5, 4, 3, 2, 1], 1_700_000_001.5)]
+    log = TurnLog(turns)
+    assert len(log) == 2
+    assert list(log) == turns
+    assert log[-1] == turns[1]
+    assert log[0:1] == turns[:1]
+    assert list(log.player_ids()) == ["p1", "p2"]
+    with pytest.raises(IndexError):
+        log[2]
+
+
+def test_turn_log_views_do_not_alias_storage():
+    log = TurnLog([_turn()])
+    view = log[0]
+    view.roll[0] = 1
+    assert log[0].roll == [6, 6, 2, 3, 1]
+
+
+def test_game_history_survives_snapshot():
+    game = DicePokerGame("hist")
+    p1 = game.add_player("A")
+    p2 = game.add_player("B")
+    game.set_player_ready(p1)
+    game.set_player_ready(p2)
+    for _ in range(4):
+        game.end_turn(game.get_current_player().id)
+
+    restored = DicePokerGame.from_dict(game.to_dict())
+    assert isinstance(restored.turns_history, TurnLog)
+    assert list(restored.turns_history) == list(game.turns_history)
+    assert restored.to_dict() == game.to_dict()
@@ -0,0 +1,95 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pytest
+from src.app import app as flask_app
+from src.core.game_logic import GameManager
+from src.core.leaderboard import Leaderboard
+
+
+@pytest.fixture()
+def client():
+    flask_app.config.update({"TESTING": True, "SECRET_KEY": "test-key"})
+    with flask_app.test_client() as c:
+        yield c
+
+
+def _play(manager, names, max_rounds=2, bot=None):
+    game_id = manager.create_game(max_players=4, max_rounds=max_rounds, seed=7)
+    game = manager.get_game(game_id)
+    for name in names:
+        game.set_player_ready(game.add_player(name))
+    if bot:
+        game.add_bot(bot, "easy")
+    game.start_game()
+    while game.status.value == "active":
+        game.end_turn(game.get_current_player().id)
+    return game
+
+
+def test_turns_and_games_are_counted_incrementally():
+    manager = GameManager()
+    board = Leaderboard(manager)
+    game = _play(manager, ["Анна", "Борис"])
+    _play(manager, ["Анна", "Вера"])
+
+    anna = board.player("Анна")
+    assert anna["games"] == 2 and anna["turns"] == 4
+    assert sum(anna["combinations"].values()) == 4
+    turns = [t for t in game.turns_history if game.players[t.player_id].name == "Борис"]
+    boris = board.player("Борис")
+    assert boris["best_score"] == max(t.score for t in turns)
+    assert boris["avg_score"] == game.players[turns[0].player_id].score
+    assert sum(p["wins"] for p in board.top(limit=10)) == 2
+
+
+def test_top_is_sorted_and_limited():
+    manager = GameManager()
+    board = Leaderboard(manager)
+    for _ in range(3):
+        _play(manager, ["Анна", "Борис", "Вера"], max_rounds=1)
+    for by in ("wins", "avg_score", "best_score", "games"):
+        top = board.top(by, limit=3)
+        assert len(top) == 3
+    wins = [p["wins"] for p in board.top("wins")]
+    assert wins == sorted(wins, reverse=True) and sum(wins) == 3
+    assert [p["name"] for p in board.top("games", limit=2)] == ["Анна", "Борис"]
+    with pytest.raises(ValueError):
+        board.top("nope")
+
+
+def test_bots_are_not_ranked_but_finish_games():
+    manager = GameManager()
+    board = Leaderboard(manager)
+    _play(manager, ["Анна"], bot="Бот")
+    assert len(board) == 1
+    assert board.player("Анна")["games"] == 1
+
+
+def test_leaderboard_endpoint(client):
+    response = client.get("/leaderboard?by=nope")
+    assert response.status_code == 400
+    data = client.get("/leaderboard?by=games&limit=5").get_json()
+    assert data["success"] is True and data["by"] == "games"
+    assert len(data["players"]) <= 5
+
+
+def test_game_finished_by_leave_is_recorded():
+    manager = GameManager()
+    board = Leaderboard(manager)
+    game = manager.get_game(manager.create_game(max_players=3, max_rounds=1, seed=7))
+    ids = [game.add_player(name) for name in ("Анна", "Борис", "Вера")]
+    for player_id in ids:
+        game.set_player_ready(player_id)
+    game.start_game()
+    game.end_turn(ids[0])
+    game.end_turn(ids[1])
+    game.remove_player(ids[2])
+    assert game.status.value == "completed"
+    assert board.player("Анна")["games"] == 1
+    assert board.player("Борис")["games"] == 1
+    # Повторные изменения завершённой игры её заново не засчитывают
+    game.remove_player(ids[1])
+    assert board.player("Анна")["games"] == 1
+    assert sum(p["wins"] for p in board.top()) == 1
@@ -0,0 +1,31 @@
+import csv
+import json
+
+from benchmarks import loadgen
+
+
+def test_percentile_nearest_rank():
+    samples = [float(v) for v in range(1, 101)]
+    assert loadgen.percentile(samples, 50) == 50.0
+    assert loadgen.percentile(samples, 99) == 99.0
+    assert loadgen.percentile([3.0], 95) == 3.0
+    assert loadgen.percentile([], 50) == 0.0
+
+
+def test_in_process_load_run_and_export(tmp_path):
+    report = loadgen.run_load(games=4, players=2, workers=2, poll_interval=0.0, think_time=0.0)
+    assert report["completed_clients"] == 8
+    routes = {row["route"]: row for row in report["routes"]}
+    assert routes["POST /create_game"]["requests"] == 4
+    assert routes["POST /game/<id>/end_turn"]["requests"] == 4 * 2 * 3
+    for row in routes.values():
+        assert row["errors"] == 0
+        assert row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"] <= row["max_ms"]
+    assert report["throughput_rps"] > 0
+
+    csv_path, json_path = tmp_path / "routes.csv", tmp_path / "report.json"
+    loadgen.write_csv(report, csv_path)
+    loadgen.write_json(report, json_path)
+    with open(csv_path, encoding="utf-8") as fh:
+        assert len(list(csv.DictReader(fh))) == len(routes)
+    assert json.loads(json_path.read_text(encoding="utf-8"))["clients"] == 8
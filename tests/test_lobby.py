@@ -0,0 +1,109 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pytest
+from src.app import app as flask_app
+from src.core.game_logic import GameManager
+from src.core.lobby import LobbyIndex, decode_cursor, encode_cursor
+
+
+@pytest.fixture()
+def client():
+    flask_app.config.update({"TESTING": True, "SECRET_KEY": "test-key"})
+    with flask_app.test_client() as c:
+        yield c
+
+
+def test_index_orders_by_free_seats_then_age():
+    lobby = LobbyIndex()
+    lobby.update("a", 3, 1.0)
+    lobby.update("b", 1, 2.0)
+    lobby.update("c", 1, 0.5)
+    lobby.update("d", 0, 0.1)
+    lobby.update("e", -2, 0.2)
+    assert [key[2] for key in lobby.page()[0]] == ["c", "b", "a"]
+    lobby.update("c", None, 0.5)
+    assert lobby.first()[2] == "b"
+    lobby.discard("b")
+    assert len(lobby) == 1 and "a" in lobby
+
+
+@pytest.mark.parametrize(
+    "max_players, max_rounds",
+    [(-3, 3), (1, 3), (4, 0), ("4", 3), (4, None), (4, 65536)],
+)
+def test_invalid_game_size_is_rejected_before_registration(max_players, max_rounds):
+    manager = GameManager()
+    with pytest.raises(ValueError):
+        manager.create_game(max_players, max_rounds)
+    assert len(manager) == 0 and len(manager.lobby) == 0
+    assert manager.quick_match() is None
+
+
+def test_cursor_round_trip():
+    key = (2, 1718000000.123456, "ab:c-d_")
+    assert decode_cursor(encode_cursor(key)) == key
+    with pytest.raises(ValueError):
+        decode_cursor("garbage")
+
+
+def test_manager_keeps_lobby_in_sync():
+    manager = GameManager()
+    first = manager.create_game(max_players=2)
+    second = manager.create_game(max_players=4)
+    assert manager.quick_match() == first
+
+    game = manager.get_game(second)
+    alice = game.add_player("Alice")
+    game.add_player("Bob")
+    game.add_player("Carol")
+    # Во второй игре осталось одно место — она заполненнее первой
+    assert manager.quick_match() == second
+    game.add_player("Dave")
+    assert second not in manager.lobby
+
+    game.remove_player(alice)
+    assert manager.quick_match() == second
+    for player_id in list(game.players):
+        game.set_player_ready(player_id)
+    game.start_game()
+    assert second not in manager.lobby
+
+    manager.remove_game(first)
+    assert manager.quick_match() is None
+
+
+def test_pagination_walks_all_games():
+    manager = GameManager()
+    ids = {manager.create_game(max_players=4) for _ in range(7)}
+    seen, cursor = [], None
+    while True:
+        games, cursor = manager.open_games(cursor, limit=3)
+        seen += [game.game_id for game in games]
+        if cursor is None:
+            break
+    assert len(seen) == 7 and set(seen) == ids
+
+
+def test_games_endpoint_and_quick_match(client):
+    game_id = client.post("/create_game", json={"max_players": 2}).get_json()["game_id"]
+    client.post("/join_game", json={"game_id": game_id, "player_name": "A"})
+
+    # Менеджер приложения общий для тестов: наша игра — одна из самых заполненных
+    data = client.get("/quick_match").get_json()
+    assert data["success"] is True and data["game"]["free_seats"] == 1
+
+    entries, url = {}, "/games?limit=100"
+    while url:
+        data = client.get(url).get_json()
+        entries.update((entry["game_id"], entry) for entry in data["games"])
+        url = data["next_cursor"] and f"/games?limit=100&cursor={data['next_cursor']}"
+    assert entries[game_id]["players"] == ["A"]
+    assert client.get("/games?cursor=bad").status_code == 400
+
+
+def test_create_game_endpoint_rejects_bad_sizes(client):
+    response = client.post("/create_game", json={"max_players": 2, "max_rounds": 70000})
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
@@ -0,0 +1,83 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pytest
+from src.app import app as flask_app
+from src.core.game_logic import GameManager, GameStatus
+from src.core.metrics import GameMetrics, Histogram, RequestMetrics, render_metrics
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def client():
+    flask_app.config.update({"TESTING": True, "SECRET_KEY": "test-key"})
+    with flask_app.test_client() as c:
+        yield c
+
+
+def test_histogram_buckets_by_upper_bound():
+    histogram = Histogram((0.01, 0.1))
+    for seconds in (0.01, 0.05, 3.0):
+        histogram.observe(seconds)
+    assert histogram.snapshot() == ([1, 1, 1], 3.06, 3)
+
+
+def test_request_histogram_is_cumulative():
+    metrics = RequestMetrics(bounds=(0.01, 0.1))
+    for seconds in (0.005, 0.05, 0.05, 3.0):
+        metrics.observe("/x", "GET", 200, seconds)
+    metrics.observe("/x", "GET", 404, 0.001)
+    text = render_metrics(metrics)
+    assert 'dice_http_requests_total{route="/x",method="GET",status="200"} 4' in text
+    assert 'dice_http_requests_total{route="/x",method="GET",status="404"} 1' in text
+    assert 'dice_http_request_duration_seconds_bucket{route="/x",method="GET",le="0.01"} 2' in text
+    assert 'dice_http_request_duration_seconds_bucket{route="/x",method="GET",le="0.1"} 4' in text
+    assert 'dice_http_request_duration_seconds_bucket{route="/x",method="GET",le="+Inf"} 5' in text
+    assert 'dice_http_request_duration_seconds_count{route="/x",method="GET"} 5' in text
+
+
+def test_game_gauges_and_turn_rate():
+    clock = FakeClock()
+    gm = GameManager()
+    metrics = GameMetrics(gm, clock=clock)
+    gm.create_game()
+    game = gm.get_game(gm.create_game())
+    a, b = game.add_player("A"), game.add_player("B")
+    game.set_player_ready(a)
+    game.set_player_ready(b)
+    game.start_game()
+    metrics.turns_per_second()
+
+    clock.now = 2.0
+    game.end_turn(a)
+    game.end_turn(b)
+    stats = gm.stats()
+    assert stats["games"][GameStatus.WAITING] == 1
+    assert stats["games"][GameStatus.ACTIVE] == 1
+    assert stats["players_online"] == 2
+    assert stats["avg_turns"] == 1.0
+
+    text = render_metrics(metrics)
+    assert 'dice_games{status="active"} 1' in text
+    assert "dice_turns_total 2" in text
+    assert "dice_turns_per_second 1.0" in text
+
+
+def test_metrics_endpoint_reports_routes(client):
+    gid = client.post("/create_game", json={}).get_json()["game_id"]
+    client.get(f"/game/{gid}/state")
+    rv = client.get("/metrics")
+    assert rv.status_code == 200
+    assert rv.mimetype == "text/plain"
+    text = rv.get_data(as_text=True)
+    assert 'route="/create_game",method="POST",status="200"' in text
+    assert 'route="/game/<game_id>/state",method="GET"' in text
+    assert "dice_players_online" in text
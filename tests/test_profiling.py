@@ -0,0 +1,83 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pstats
+
+import pytest
+from src.app import app as flask_app, profiler
+from src.core.profiling import RequestProfiler
+
+
+def _wsgi_ok(environ, start_response):
+    start_response("200 OK", [("Content-Type", "text/plain")])
+    return [b"ok"]
+
+
+@pytest.fixture()
+def client(tmp_path):
+    flask_app.config.update(
+        {"TESTING": True, "SECRET_KEY": "test-key", "ADMIN_TOKEN": "admin"}
+    )
+    output_dir = profiler.output_dir
+    profiler.output_dir = tmp_path
+    with flask_app.test_client() as c:
+        yield c
+    profiler.stop()
+    profiler.output_dir = output_dir
+    flask_app.config["ADMIN_TOKEN"] = None
+
+
+def test_disabled_profiler_does_not_resolve_routes():
+    calls = []
+    profiler = RequestProfiler("unused")
+    app = profiler.wrap(_wsgi_ok, lambda environ: calls.append(environ) or "GET /")
+    assert app({}, lambda *args: None) == [b"ok"]
+    assert calls == []
+
+
+def test_samples_are_aggregated_per_route(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), sample_rate=1.0)
+    app = profiler.wrap(_wsgi_ok, lambda environ: environ["route"])
+    profiler.start(route_rates={"GET /skip": 0.0})
+    for route in ("GET /a", "GET /a", "GET /b", "GET /skip"):
+        app({"route": route}, lambda *args: None)
+    summary = profiler.stop()
+    assert summary["samples"] == {"GET /a": 2, "GET /b": 1}
+    assert len(summary["files"]) == 2
+    stats = pstats.Stats(summary["files"][0])
+    assert any(func[2] == "_wsgi_ok" for func in stats.stats)
+    # После окна запросы снова не профилируются
+    app({"route": "GET /a"}, lambda *args: None)
+    assert profiler.stop() == {"files": [], "samples": {}}
+
+
+def test_admin_endpoints_require_token(client):
+    assert client.post("/admin/profiler/start").status_code == 403
+    response = client.post(
+        "/admin/profiler/start", headers={"X-Admin-Token": "wrong"}
+    )
+    assert response.status_code == 403
+
+
+def test_profiling_window_over_http(client, tmp_path):
+    headers = {"X-Admin-Token": "admin"}
+    response = client.post(
+        "/admin/profiler/start", json={"sample_rate": 1.5}, headers=headers
+    )
+    assert response.status_code == 400
+
+    response = client.post(
+        "/admin/profiler/start", json={"sample_rate": 1.0}, headers=headers
+    )
+    assert response.get_json()["active"] is True
+    game_id = client.post("/create_game", json={"max_players": 2}).get_json()["game_id"]
+    client.post("/join_game", json={"game_id": game_id, "player_name": "A"})
+    client.get(f"/game/{game_id}/state")
+    client.get(f"/game/{game_id}/state")
+
+    summary = client.post("/admin/profiler/stop", headers=headers).get_json()
+    assert summary["samples"]["GET /game/<game_id>/state"] == 2
+    names = {os.path.basename(path) for path in summary["files"]}
+    assert any(name.endswith("GET_game_game_id_state.pstats") for name in names)
+    assert all(os.path.dirname(path) == str(tmp_path) for path in summary["files"])
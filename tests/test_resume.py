@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pytest
+from src.app import app as flask_app
+from src.core.game_logic import GameManager
+
+
+@pytest.fixture()
+def client():
+    flask_app.config.update({"TESTING": True, "SECRET_KEY": "test-key"})
+    with flask_app.test_client() as c:
+        yield c
+
+
+def test_reverse_index_follows_players_and_games():
+    manager = GameManager()
+    first = manager.get_game(manager.create_game())
+    second = manager.get_game(manager.create_game())
+    player_id = first.add_player("Alice")
+    second.add_player("Alice", player_id)
+    second.add_bot("Bot", "easy")
+    assert {g.game_id for g in manager.games_of(player_id)} == {first.game_id, second.game_id}
+    assert all(manager.games_of(bot_id) == [] for bot_id in second.bots)
+
+    with pytest.raises(ValueError):
+        second.add_player("Alice 2", player_id)
+
+    first.remove_player(player_id)
+    assert manager.games_of(player_id) == [second]
+    manager.remove_game(second.game_id)
+    assert manager.games_of(player_id) == []
+
+
+def test_resume_returns_live_games_of_session_player(client):
+    assert client.get("/resume").status_code == 404
+
+    first = client.post("/create_game", json={"max_players": 2}).get_json()["game_id"]
+    second = client.post("/create_game", json={"max_players": 2}).get_json()["game_id"]
+    player_id = client.post(
+        "/join_game", json={"game_id": first, "player_name": "A"}
+    ).get_json()["player_id"]
+    # Тот же игрок во второй игре — под тем же ID
+    data = client.post("/join_game", json={"game_id": second, "player_name": "A"}).get_json()
+    assert data["player_id"] == player_id
+
+    data = client.get("/resume").get_json()
+    assert data["player_id"] == player_id
+    assert [game["game_id"] for game in data["games"]] == [second, first]
+    assert data["games"][0]["is_current"] is True
+    assert data["games"][0]["game_state"]["players"][0]["id"] == player_id
+
+    client.post(f"/game/{second}/leave")
+    data = client.get("/resume").get_json()
+    assert [game["game_id"] for game in data["games"]] == [first]
+    # ID игрока в сессии сохранился: страница первой игры доступна
+    assert client.get(f"/game/{first}").status_code == 200
+
+    client.post(f"/game/{first}/leave")
+    assert client.get("/resume").status_code == 404
+    # ID остаётся в сессии: при новом входе игрок получит тот же
+    with client.session_transaction() as sess:
+        assert sess["player_id"] == player_id
@@ -0,0 +1,222 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import json
+import multiprocessing
+import socket
+import threading
+from collections import Counter
+
+import pytest
+from werkzeug.serving import make_server
+from werkzeug.test import Client
+from werkzeug.wrappers import Request, Response
+
+from src.cluster import _wait_ready, _worker_db_path, run_worker
+from src.core.game_logic import GameManager
+from src.core.leaderboard import PlayerStats
+from src.core.lobby import encode_cursor
+from src.core.routing import Router, affine_id_factory, worker_for
+
+
+class FakeWorker:
+    """Обработчик, который отвечает своим номером и заданной загрузкой"""
+
+    def __init__(self, index, games=0, lobby=()):
+        self.index = index
+        self.games = games
+        self.lobby = list(lobby)
+        self.resume = []
+        self.leaderboard = []
+        self.paths = []
+        self.server = make_server("127.0.0.1", 0, self, threaded=True)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def address(self):
+        return ("127.0.0.1", self.server.port)
+
+    def __call__(self, environ, start_response):
+        request = Request(environ)
+        self.paths.append(request.path)
+        if request.path == "/games":
+            body = {"success": True, "games": self.lobby, "next_cursor": None}
+        elif request.path == "/resume":
+            body = {"success": bool(self.resume), "player_id": "p", "games": self.resume}
+        elif request.path == "/leaderboard":
+            names = request.args.getlist("player")
+            if names:
+                players = [p for p in self.leaderboard if p["name"] in names]
+            else:
+                players = self.leaderboard[: request.args.get("limit", 10, type=int)]
+            body = {"success": True, "by": request.args.get("by"), "players": players}
+        elif request.path == "/quick_match":
+            body = {"success": bool(self.lobby), "game": self.lobby[:1] and self.lobby[0]}
+        else:
+            body = {"worker": self.index, "data": request.get_data(as_text=True)}
+        response = Response(json.dumps(body), mimetype="application/json")
+        response.headers["X-Dice-Games"] = str(self.games)
+        response.set_cookie("session", f"w{self.index}")
+        return response(environ, start_response)
+
+
+def _entry(free_seats, created_at, game_id):
+    return {
+        "game_id": game_id,
+        "cursor": encode_cursor((free_seats, created_at, game_id)),
+    }
+
+
+def _stats(name, games, wins, total_score):
+    return PlayerStats(name, games=games, wins=wins, total_score=total_score).to_dict()
+
+
+@pytest.fixture(scope="module")
+def workers():
+    started = [FakeWorker(0, games=5), FakeWorker(1, games=2), FakeWorker(2, games=9)]
+    yield started
+    for worker in started:
+        worker.server.shutdown()
+
+
+def test_worker_for_is_stable_and_balanced():
+    ids = [f"game-{idx}" for idx in range(3000)]
+    owners = Counter(worker_for(game_id, 3) for game_id in ids)
+    assert set(owners) == {0, 1, 2}
+    assert min(owners.values()) > 800
+    assert [worker_for(game_id, 3) for game_id in ids[:20]] == [
+        worker_for(game_id, 3) for game_id in ids[:20]
+    ]
+
+
+def test_manager_mints_ids_owned_by_its_worker():
+    manager = GameManager(id_factory=affine_id_factory(2, 4))
+    for _ in range(20):
+        assert worker_for(manager.create_game(), 4) == 2
+
+
+def test_game_requests_go_to_owner(workers):
+    client = Client(Router([worker.address for worker in workers]))
+    for game_id in ("abc", "def", "xyz"):
+        owner = worker_for(game_id, 3)
+        response = client.get(f"/game/{game_id}/state?hint=1")
+        assert response.get_json()["worker"] == owner
+        assert workers[owner].paths[-1] == f"/game/{game_id}/state"
+        response = client.post("/join_game", json={"game_id": game_id, "player_name": "A"})
+        assert response.get_json()["worker"] == owner
+        assert json.loads(response.get_json()["data"])["game_id"] == game_id
+    assert "session=w" in response.headers["Set-Cookie"]
+
+
+def test_create_game_goes_to_least_loaded(workers):
+    router = Router([worker.address for worker in workers])
+    client = Client(router)
+    # Загрузка известна только из ответов: первые запросы раскладываются по кругу
+    for _ in range(3):
+        client.get("/")
+    assert router.loads == [5, 2, 9]
+    placed = [client.post("/create_game", json={}).get_json()["worker"] for _ in range(2)]
+    assert placed == [1, 1]
+
+
+def test_lobby_is_merged_across_workers(workers):
+    workers[0].lobby = [_entry(1, 5.0, "a"), _entry(3, 1.0, "b")]
+    workers[1].lobby = [_entry(1, 2.0, "c")]
+    workers[2].lobby = [_entry(2, 0.5, "d")]
+    client = Client(Router([worker.address for worker in workers]))
+
+    data = client.get("/games?limit=3").get_json()
+    assert [game["game_id"] for game in data["games"]] == ["c", "a", "d"]
+    assert data["next_cursor"] == data["games"][-1]["cursor"]
+    assert client.get("/quick_match").get_json()["game"]["game_id"] == "c"
+
+
+def test_leaderboard_is_merged_across_workers(workers):
+    # Таблицы процессов уже отсортированы по победам
+    workers[0].leaderboard = [_stats("Анна", 2, 1, 60), _stats("Вера", 1, 0, 10)]
+    workers[1].leaderboard = [_stats("Борис", 2, 2, 50), _stats("Анна", 1, 1, 30)]
+    workers[2].leaderboard = []
+    client = Client(Router([worker.address for worker in workers]))
+
+    data = client.get("/leaderboard?by=wins&limit=1").get_json()
+    # Партии Анны в обоих процессах сложены, хотя во втором она не первая
+    assert [p["name"] for p in data["players"]] == ["Анна"]
+    assert data["players"][0]["wins"] == 2 and data["players"][0]["games"] == 3
+    assert data["players"][0]["avg_score"] == 30.0
+    data = client.get("/leaderboard?by=avg_score&limit=3").get_json()
+    assert [p["name"] for p in data["players"]] == ["Анна", "Борис", "Вера"]
+    assert client.get("/leaderboard?by=nope").status_code == 400
+    for worker in workers:
+        worker.leaderboard = []
+
+
+def test_resume_is_merged_across_workers(workers):
+    workers[0].resume = [{"game_id": "a", "is_current": False, "created_at": "2026-01-02"}]
+    workers[2].resume = [
+        {"game_id": "b", "is_current": True, "created_at": "2026-01-01"},
+        {"game_id": "c", "is_current": False, "created_at": "2026-01-03"},
+    ]
+    client = Client(Router([worker.address for worker in workers]))
+    data = client.get("/resume").get_json()
+    assert [game["game_id"] for game in data["games"]] == ["b", "c", "a"]
+    for worker in workers:
+        worker.resume = []
+    assert client.get("/resume").status_code == 404
+
+
+def test_pinned_and_unreachable_workers(workers):
+    client = Client(Router([worker.address for worker in workers] + [("127.0.0.1", 1)]))
+    assert client.get("/metrics", headers={"X-Dice-Worker": "2"}).get_json()["worker"] == 2
+    assert client.get("/metrics", headers={"X-Dice-Worker": "7"}).status_code == 400
+    response = client.get("/metrics", headers={"X-Dice-Worker": "3"})
+    assert response.status_code == 502
+
+
+def test_worker_db_paths_are_distinct():
+    assert _worker_db_path("data/games.db", 1) == os.path.join("data", "games-1.db")
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def app_workers():
+    """Два настоящих процесса-обработчика приложения"""
+    context = multiprocessing.get_context("spawn")
+    ports = [_free_port() for _ in range(2)]
+    processes = [
+        context.Process(
+            target=run_worker,
+            args=(index, 2, port, {"DICE_SECRET_KEY": "test-key"}),
+            daemon=True,
+        )
+        for index, port in enumerate(ports)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for port in ports:
+            _wait_ready(port)
+        yield [("127.0.0.1", port) for port in ports]
+    finally:
+        for process in processes:
+            process.terminate()
+            process.join(timeout=5)
+
+
+def test_leave_on_one_worker_keeps_games_on_another(app_workers):
+    client = Client(Router(app_workers))
+    # Пустые процессы: игры создаются по очереди в первом и во втором
+    games = [client.post("/create_game", json={}).get_json()["game_id"] for _ in range(2)]
+    assert sorted(worker_for(game_id, 2) for game_id in games) == [0, 1]
+    for game_id in games:
+        data = client.post("/join_game", json={"game_id": game_id, "player_name": "A"})
+        assert data.get_json()["success"] is True
+
+    client.post(f"/game/{games[0]}/leave")
+    data = client.get("/resume").get_json()
+    assert [game["game_id"] for game in data["games"]] == [games[1]]
@@ -0,0 +1,37 @@
+from itertools import product
+
+from src.core.game_logic import DicePokerGame, Combination
+from src.core.scoring import (
+    MULTISETS,
+    ROLL_TABLE,
+    SCORE_TABLE,
+    classify_roll,
+    evaluate_roll,
+    score_roll,
+)
+
+
+def test_roll_table_covers_all_ordered_rolls():
+    assert len(ROLL_TABLE) == 6 ** 5
+    assert len(MULTISETS) == 252
+
+
+def test_roll_table_matches_reference_evaluation():
+    for roll in product(range(1, 7), repeat=5):
+        combination = classify_roll(roll)
+        expected = max(roll) if combination is Combination.HIGH_DIE else SCORE_TABLE[combination]
+        assert ROLL_TABLE[roll] == (combination, expected)
+
+
+def test_game_methods_use_table_results():
+    game = DicePokerGame("g")
+    for roll in ([6, 6, 6, 6, 6], [2, 3, 4, 5, 6], [1, 3, 4, 5, 6], [4, 1, 4, 1, 4]):
+        combination, score = ROLL_TABLE[tuple(roll)]
+        assert game._evaluate_combination(roll) == combination
+        assert game._calculate_score(combination, roll) == score
+
+
+def test_non_standard_roll_falls_back_to_reference():
+    # Не 5 костей — таблица не подходит, используется прямой подсчёт
+    assert evaluate_roll([3, 3]) == (Combination.ONE_PAIR, 5)
+    assert score_roll(Combination.HIGH_DIE, [2, 7]) == 7
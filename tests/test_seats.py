@@ -0,0 +1,110 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from src.app import app as flask_app
+from src.core.game_logic import DicePokerGame, GameStatus
+
+
+def start_game(names=("A", "B", "C"), max_rounds=2):
+    game = DicePokerGame("g", max_rounds=max_rounds)
+    ids = [game.add_player(n) for n in names]
+    for pid in ids:
+        game.set_player_ready(pid)
+    assert game.start_game() is True
+    return game, ids
+
+
+def test_leave_before_current_keeps_current_player():
+    game, (a, b, c) = start_game()
+    game.end_turn(a)
+    assert game.get_current_player().id == b
+    roll = list(game.current_roll)
+
+    assert game.remove_player(a) is True
+    assert game.get_current_player().id == b
+    assert game.current_player_index == 0
+    assert game.current_roll == roll
+
+    game.end_turn(b)
+    assert game.get_current_player().id == c
+
+
+def test_leave_after_current_does_not_skip_anyone():
+    game, (a, b, c) = start_game()
+    assert game.remove_player(b) is True
+    assert game.get_current_player().id == a
+    game.end_turn(a)
+    assert game.get_current_player().id == c
+    game.end_turn(c)
+    assert game.current_round == 2
+    assert game.get_current_player().id == a
+
+
+def test_current_player_leaving_passes_turn_with_fresh_roll():
+    game, (a, b, c) = start_game()
+    game.reroll_dice(a, [0])
+    game.reroll_dice(a, [1])
+    assert game.remaining_rerolls == 0
+
+    assert game.remove_player(a) is True
+    assert game.get_current_player().id == b
+    assert game.remaining_rerolls == 2
+    assert game.current_round == 1
+
+
+def test_last_seat_leaving_on_their_turn_starts_next_round():
+    game, (a, b, c) = start_game()
+    game.end_turn(a)
+    game.end_turn(b)
+    assert game.get_current_player().id == c
+
+    assert game.remove_player(c) is True
+    assert game.current_round == 2
+    assert game.get_current_player().id == a
+
+
+def test_leaving_on_final_turn_completes_game():
+    game, (a, b) = start_game(names=("A", "B"), max_rounds=1)
+    game.end_turn(a)
+    assert game.remove_player(b) is True
+    assert game.status == GameStatus.COMPLETED
+    assert game.get_game_state()["winner"]["id"] == a
+
+
+def test_everyone_leaving_completes_active_game():
+    game, (a, b) = start_game(names=("A", "B"))
+    game.remove_player(a)
+    game.remove_player(b)
+    assert game.status == GameStatus.COMPLETED
+    assert game.get_current_player() is None
+    assert game.get_game_state()["winner"] is None
+
+
+def test_leave_in_lobby_keeps_index_valid():
+    game = DicePokerGame("g")
+    a, b = game.add_player("A"), game.add_player("B")
+    game.remove_player(a)
+    assert game.get_current_player().id == b
+    c = game.add_player("C")
+    for pid in (b, c):
+        game.set_player_ready(pid)
+    assert game.start_game() is True
+    assert game.get_current_player().id == b
+
+
+def test_leave_endpoint_mid_game_hands_turn_over():
+    c1, c2, c3 = (flask_app.test_client() for _ in range(3))
+    gid = c1.post("/create_game", json={"max_players": 4, "max_rounds": 1}).get_json()["game_id"]
+    for client, name in ((c1, "A"), (c2, "B"), (c3, "C")):
+        assert client.post("/join_game", json={"game_id": gid, "player_name": name}).get_json()["success"]
+    for client in (c1, c2, c3):
+        client.post(f"/game/{gid}/ready", json={})
+
+    assert c1.post(f"/game/{gid}/leave", json={}).get_json()["success"] is True
+    state = c2.get(f"/game/{gid}/state").get_json()
+    current = [p["name"] for p in state["players"] if p["is_current"]]
+    assert current == ["B"]
+    assert c2.post(f"/game/{gid}/end_turn", json={}).get_json()["success"] is True
+    assert c3.post(f"/game/{gid}/end_turn", json={}).get_json()["success"] is True
+    assert c2.get(f"/game/{gid}/state").get_json()["status"] == "completed"
@@ -0,0 +1,110 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import random
+
+import pytest
+from src.app import app as flask_app, game_manager
+from src.core.game_logic import DicePokerGame
+
+
+@pytest.fixture()
+def client():
+    flask_app.config.update({"TESTING": True, "SECRET_KEY": "test-key"})
+    with flask_app.test_client() as c:
+        yield c
+
+
+def _two_players(client, max_rounds=2):
+    gid = client.post("/create_game", json={"max_players": 2, "max_rounds": max_rounds}).get_json()["game_id"]
+    client.post("/join_game", json={"game_id": gid, "player_name": "A"})
+    other = flask_app.test_client()
+    other.post("/join_game", json={"game_id": gid, "player_name": "B"})
+    other.post(f"/game/{gid}/ready")
+    return gid, other
+
+
+def test_batch_plays_whole_turn_in_one_request(client):
+    gid, _ = _two_players(client)
+    rv = client.post(f"/game/{gid}/actions", json={"actions": [
+        {"op": "ready"},
+        {"op": "reroll", "dice": [0, 1]},
+        {"op": "reroll", "dice": [2]},
+        {"op": "end_turn"},
+    ]})
+    data = rv.get_json()
+    assert data["success"] is True
+    state = data["game_state"]
+    assert state["status"] == "active"
+    current = [p["name"] for p in state["players"] if p["is_current"]]
+    assert current == ["B"]
+    assert len(game_manager.get_game(gid).turns_history) == 1
+
+
+def test_batch_is_atomic_on_failure(client):
+    gid, _ = _two_players(client)
+    client.post(f"/game/{gid}/ready")
+    game = game_manager.get_game(gid)
+    before = game.to_dict()
+
+    # Третий переброс не разрешён — не применяется ничего
+    rv = client.post(f"/game/{gid}/actions", json={"actions": [
+        {"op": "reroll", "dice": [0]},
+        {"op": "reroll", "dice": [1]},
+        {"op": "reroll", "dice": [2]},
+    ]})
+    data = rv.get_json()
+    assert data["success"] is False
+    assert "3" in data["error"]
+    assert game.to_dict() == before
+
+
+def test_batch_rejects_bad_payloads(client):
+    gid, _ = _two_players(client)
+    assert client.post(f"/game/{gid}/actions", json={"actions": []}).get_json()["success"] is False
+    assert client.post(f"/game/{gid}/actions", json={"actions": [{"op": "fly"}]}).get_json()["success"] is False
+    bad_dice = {"actions": [{"op": "ready"}, {"op": "reroll", "dice": "01"}]}
+    assert client.post(f"/game/{gid}/actions", json=bad_dice).get_json()["success"] is False
+    too_many = {"actions": [{"op": "ready"}] * 17}
+    assert client.post(f"/game/{gid}/actions", json=too_many).get_json()["success"] is False
+    assert client.post("/game/nope/actions", json={"actions": [{"op": "ready"}]}).get_json()["success"] is False
+
+
+def _replay_on_copy(game, player_id, operations):
+    """Применимость пакета по полной копии игры — эталон для проверки"""
+    trial = DicePokerGame.from_dict(game.to_dict())
+    for operation in operations:
+        if operation["op"] == "reroll":
+            applied = trial.reroll_dice(player_id, operation["dice"])
+        elif operation["op"] == "end_turn":
+            applied = trial.end_turn(player_id)
+        else:
+            applied = trial.set_player_ready(player_id)
+            trial.start_game()
+        if not applied:
+            return None
+    return trial.to_dict()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_batch_check_matches_full_replay(seed):
+    rng = random.Random(seed)
+    game = DicePokerGame("g", max_players=3, max_rounds=2, seed=seed)
+    ids = [game.add_player(name) for name in ("A", "B", "C")[: rng.randint(2, 3)]]
+    ops = [{"op": "ready"}, {"op": "end_turn"}, {"op": "reroll", "dice": [0, 3]}]
+    for _ in range(30):
+        player_id = rng.choice(ids)
+        operations = [rng.choice(ops) for _ in range(rng.randint(1, 4))]
+        expected = _replay_on_copy(game, player_id, operations)
+        try:
+            game.apply_batch(player_id, operations)
+        except ValueError:
+            assert expected is None
+        else:
+            actual = game.to_dict()
+            # Время хода в копии и в игре разное
+            for state in (actual, expected):
+                for turn in state["turns_history"]:
+                    turn.pop("timestamp")
+            assert actual == expected
@@ -0,0 +1,41 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pytest
+from src.app import app as flask_app, bots
+
+
+@pytest.fixture()
+def client():
+    flask_app.config.update({"TESTING": True, "SECRET_KEY": "test-key"})
+    with flask_app.test_client() as c:
+        yield c
+
+
+def test_add_bot_and_play_against_it(client):
+    gid = client.post("/create_game", json={"max_players": 3, "max_rounds": 1}).get_json()["game_id"]
+    client.post("/join_game", json={"game_id": gid, "player_name": "Human"})
+
+    rv = client.post(f"/game/{gid}/add_bot", json={"level": "hard"})
+    data = rv.get_json()
+    assert data["success"] is True
+    assert [p["is_bot"] for p in data["game_state"]["players"]] == [False, True]
+
+    assert client.post(f"/game/{gid}/ready").get_json()["game_started"] is True
+    assert client.post(f"/game/{gid}/end_turn").get_json()["success"] is True
+
+    bots.run_due(float("inf"))
+    state = client.get(f"/game/{gid}/state").get_json()
+    assert state["status"] == "completed"
+
+
+def test_add_bot_validation(client):
+    gid = client.post("/create_game", json={"max_players": 2}).get_json()["game_id"]
+    assert client.post(f"/game/{gid}/add_bot", json={}).get_json()["success"] is False
+
+    client.post("/join_game", json={"game_id": gid, "player_name": "Human"})
+    assert client.post(f"/game/{gid}/add_bot", json={"level": "godlike"}).get_json()["success"] is False
+    assert client.post(f"/game/{gid}/add_bot", json={"level": "easy"}).get_json()["success"] is True
+    # Стол заполнен
+    assert client.post(f"/game/{gid}/add_bot", json={}).get_json()["success"] is False
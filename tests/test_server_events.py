@@ -0,0 +1,84 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import json
+
+import pytest
+from src.app import app as flask_app, events
+
+
+@pytest.fixture()
+def client():
+    flask_app.config.update({"TESTING": True, "SECRET_KEY": "test-key"})
+    with flask_app.test_client() as c:
+        yield c
+
+
+def read_event(chunks):
+    """Возвращает следующее событие с данными, пропуская keep-alive."""
+    for chunk in chunks:
+        text = chunk.decode()
+        if text.startswith(":"):
+            continue
+        data = [line[6:] for line in text.splitlines() if line.startswith("data: ")]
+        return json.loads(data[0])
+    raise AssertionError("stream closed")
+
+
+def test_events_unknown_game_returns_404(client):
+    assert client.get("/game/no-such/events").status_code == 404
+
+
+def test_events_push_state_on_mutations(client):
+    gid = client.post("/create_game", json={"max_players": 4, "max_rounds": 1}).get_json()["game_id"]
+    assert client.post("/join_game", json={"game_id": gid, "player_name": "A"}).get_json()["success"]
+
+    rv = client.get(f"/game/{gid}/events", buffered=False)
+    assert rv.status_code == 200
+    assert rv.mimetype == "text/event-stream"
+    chunks = iter(rv.response)
+
+    first = read_event(chunks)
+    assert first["status"] == "waiting"
+    assert [p["name"] for p in first["players"]] == ["A"]
+    assert events.subscriber_count(gid) == 1
+
+    other = flask_app.test_client()
+    assert other.post("/join_game", json={"game_id": gid, "player_name": "B"}).get_json()["success"]
+    second = read_event(chunks)
+    assert sorted(p["name"] for p in second["players"]) == ["A", "B"]
+
+    client.post(f"/game/{gid}/ready", json={})
+    other.post(f"/game/{gid}/ready", json={})
+    # Два изменения до чтения приходят одним обновлением
+    third = read_event(chunks)
+    assert third["status"] == "active"
+
+    rv.close()
+    assert events.subscriber_count(gid) == 0
+
+
+def test_events_stream_closes_when_game_completes(client):
+    gid = client.post("/create_game", json={"max_players": 4, "max_rounds": 1}).get_json()["game_id"]
+    other = flask_app.test_client()
+    client.post("/join_game", json={"game_id": gid, "player_name": "A"})
+    other.post("/join_game", json={"game_id": gid, "player_name": "B"})
+    client.post(f"/game/{gid}/ready", json={})
+    other.post(f"/game/{gid}/ready", json={})
+
+    rv = client.get(f"/game/{gid}/events", buffered=False)
+    chunks = iter(rv.response)
+    assert read_event(chunks)["status"] == "active"
+
+    for _ in range(2):
+        current = next(p for p in read_state(client, gid)["players"] if p["is_current"])
+        actor = client if current["name"] == "A" else other
+        assert actor.post(f"/game/{gid}/end_turn", json={}).get_json()["success"]
+        state = read_event(chunks)
+    assert state["status"] == "completed"
+    assert list(chunks) == []
+
+
+def read_state(client, gid):
+    return client.get(f"/game/{gid}/state").get_json()
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from src.core.scoring import Combination
+from src.core.simulator import SimulationConfig, play_game, simulate
+
+
+def reroll_everything(game, player_id, rng):
+    return [0, 1, 2, 3, 4]
+
+
+def test_play_game_runs_to_completion():
+    config = SimulationConfig(strategies=("optimal", "random", "stand"), max_rounds=2)
+    game = play_game(config, random.Random(1))
+    assert game.status.value == "completed"
+    assert len(game.turns_history) == 3 * 2
+
+
+def test_report_statistics_are_consistent():
+    report = simulate(SimulationConfig(), games=200, seed=7, workers=1, chunk_size=50)
+    assert report.games == 200
+    assert sum(report.wins) == pytest.approx(200)
+    assert all(sum(h.values()) == 200 for h in report.score_histograms)
+    # 2 игрока * 3 раунда = 6 ходов за партию
+    assert sum(sum(c.values()) for c in report.combination_counts) == 200 * 6
+    assert sum(report.win_rates()) == pytest.approx(1.0)
+    for frequencies in report.combination_frequencies():
+        assert sum(frequencies.values()) == pytest.approx(1.0)
+
+
+def test_same_seed_is_reproducible_across_worker_counts():
+    config = SimulationConfig(strategies=("optimal", "random"))
+    single = simulate(config, games=60, seed=3, workers=1, chunk_size=20)
+    pooled = simulate(config, games=60, seed=3, workers=2, chunk_size=20)
+    assert single.to_dict() == pooled.to_dict()
+    other = simulate(config, games=60, seed=4, workers=1, chunk_size=20)
+    assert other.to_dict() != single.to_dict()
+
+
+def test_simulation_does_not_disturb_global_random():
+    random.seed(123)
+    expected = random.random()
+    random.seed(123)
+    simulate(SimulationConfig(), games=5, seed=1, workers=1)
+    assert random.random() == expected
+
+
+def test_custom_rules_and_strategy():
+    config = SimulationConfig(
+        strategies=(reroll_everything, "stand"),
+        max_rounds=1,
+        max_rerolls=0,
+        score_table={Combination.ONE_PAIR: 0},
+    )
+    report = simulate(config, games=50, seed=1, workers=1)
+    assert report.games == 50
+    # Пара приносит 0 очков по изменённой таблице
+    pair_games = sum(report.combination_counts[s]["ONE_PAIR"] for s in range(2))
+    assert pair_games > 0
+    assert 0 in report.score_histograms[0] or 0 in report.score_histograms[1]
+
+
+def test_unknown_strategy_rejected():
+    with pytest.raises(ValueError):
+        simulate(SimulationConfig(strategies=("nope", "stand")), games=1)
+
+
+def test_greedy_beats_random_on_average():
+    config = SimulationConfig(strategies=("greedy", "random"))
+    report = simulate(config, games=400, seed=2, workers=1)
+    greedy, rand = report.mean_scores()
+    assert greedy > rand
@@ -0,0 +1,98 @@
+from itertools import combinations, product
+
+import pytest
+
+from src.core.game_logic import GameManager
+from src.core.scoring import ROLL_TABLE
+from src.core.solver import HoldSolver, best_hold
+
+
+def _brute_force(roll, remaining_rerolls):
+    """Перебор всех 32 вариантов удержания по индексам."""
+    if remaining_rerolls == 0:
+        return ROLL_TABLE[tuple(roll)][1]
+    best = float("-inf")
+    for size in range(6):
+        for reroll in combinations(range(5), size):
+            total = 0.0
+            outcomes = list(product(range(1, 7), repeat=size))
+            for outcome in outcomes:
+                new_roll = list(roll)
+                for idx, value in zip(reroll, outcome):
+                    new_roll[idx] = value
+                if remaining_rerolls == 1:
+                    total += ROLL_TABLE[tuple(new_roll)][1]
+                else:
+                    total += best_hold(new_roll, remaining_rerolls - 1).expected_score
+            best = max(best, total / len(outcomes))
+    return best
+
+
+@pytest.mark.parametrize(
+    "roll", [[1, 3, 3, 5, 6], [1, 2, 3, 4, 6], [2, 2, 5, 5, 1], [6, 6, 6, 1, 2], [4, 4, 4, 4, 4]]
+)
+def test_one_reroll_matches_brute_force(roll):
+    advice = best_hold(roll, 1)
+    assert advice.expected_score == pytest.approx(_brute_force(roll, 1))
+    assert sorted(advice.keep + advice.reroll) == [0, 1, 2, 3, 4]
+
+
+def test_two_rerolls_matches_brute_force():
+    roll = [1, 3, 3, 5, 6]
+    assert best_hold(roll, 2).expected_score == pytest.approx(_brute_force(roll, 2))
+
+
+def test_no_rerolls_keeps_everything():
+    advice = best_hold([2, 2, 3, 3, 5], 0)
+    assert advice.keep == [0, 1, 2, 3, 4]
+    assert advice.reroll == []
+    assert advice.expected_score == 10
+
+
+def test_expected_value_grows_with_rerolls():
+    roll = [1, 2, 4, 5, 6]
+    values = [best_hold(roll, r).expected_score for r in range(3)]
+    assert values[0] <= values[1] <= values[2]
+
+
+def test_invalid_queries_raise():
+    with pytest.raises(ValueError):
+        best_hold([1, 2, 3, 4, 5], 3)
+    with pytest.raises(ValueError):
+        best_hold([1, 2, 3, 4, 7], 1)
+    with pytest.raises(ValueError):
+        HoldSolver(max_rerolls=1).best_hold([1, 2, 3, 4, 5], 2)
+
+
+def test_hint_only_for_current_player_on_request():
+    gm = GameManager()
+    game = gm.get_game(gm.create_game())
+    p1, p2 = game.add_player("A"), game.add_player("B")
+    game.set_player_ready(p1)
+    game.set_player_ready(p2)
+    assert game.start_game() is True
+
+    assert "hint" not in game.get_game_state(p1)["current_turn"]
+    assert "hint" not in game.get_game_state(p2, with_hint=True)["current_turn"]
+
+    hint = game.get_game_state(p1, with_hint=True)["current_turn"]["hint"]
+    advice = best_hold(game.current_roll, game.remaining_rerolls)
+    assert hint["keep"] == advice.keep
+    assert hint["reroll"] == advice.reroll
+    assert hint["expected_score"] == round(advice.expected_score, 2)
+
+
+def test_hint_follows_snapshot_not_live_seats():
+    gm = GameManager()
+    game = gm.get_game(gm.create_game(max_players=3))
+    ids = [game.add_player(name) for name in ("A", "B", "C")]
+    for player_id in ids:
+        game.set_player_ready(player_id)
+    game.start_game()
+    state = game.get_game_state()
+
+    # Места меняются между снятием снимка и расчётом подсказки
+    game.remove_player(ids[0])
+    game.current_player_index = 5
+    assert game._hint(state, ids[0]) is not None
+    assert game._hint(state, ids[1]) is None
@@ -0,0 +1,56 @@
+from src.core.game_logic import DicePokerGame, GameStatus
+
+
+def start_game(names=("A", "B", "C"), max_rounds=3, seed=None):
+    game = DicePokerGame("g", max_rounds=max_rounds, seed=seed)
+    ids = [game.add_player(n) for n in names]
+    for pid in ids:
+        game.set_player_ready(pid)
+    assert game.start_game() is True
+    return game, ids
+
+
+def test_snapshot_is_shared_until_next_mutation():
+    game, ids = start_game()
+    first = game.get_game_state(ids[0])
+    assert game.get_game_state(ids[1]) is first
+    assert game.get_game_state() is first
+
+    assert game.reroll_dice(ids[0], [0, 1]) is True
+    second = game.get_game_state(ids[0])
+    assert second is not first
+    assert second["current_turn"]["roll"] == game.current_roll
+    assert second["current_turn"]["remaining_rerolls"] == 1
+
+
+def test_snapshot_roll_is_not_aliased_to_live_roll():
+    game, ids = start_game()
+    state = game.get_game_state(ids[0])
+    roll = list(state["current_turn"]["roll"])
+    game.reroll_dice(ids[0], [0, 1, 2, 3, 4])
+    assert state["current_turn"]["roll"] == roll
+
+
+def test_hint_overlay_does_not_leak_into_shared_snapshot():
+    game, ids = start_game()
+    hinted = game.get_game_state(ids[0], with_hint=True)
+    assert "hint" in hinted["current_turn"]
+    plain = game.get_game_state(ids[1])
+    assert "hint" not in plain["current_turn"]
+    assert hinted["players"] is plain["players"]
+
+
+def test_incremental_ranking_matches_full_sort():
+    # Кости задаются зерном игры, поэтому партии одинаковы при каждом запуске
+    for seed in range(30):
+        game, ids = start_game(names=("A", "B", "C", "D"), seed=seed)
+        while game.status == GameStatus.ACTIVE:
+            expected = sorted(game.players.values(), key=lambda p: p.score, reverse=True)
+            state = game.get_game_state()
+            assert [p["id"] for p in state["players"]] == [p.id for p in expected]
+            game.end_turn(game.get_current_player().id)
+        expected = sorted(game.players.values(), key=lambda p: p.score, reverse=True)
+        state = game.get_game_state()
+        assert [p["id"] for p in state["players"]] == [p.id for p in expected]
+        winner = max(game.players.values(), key=lambda p: p.score)
+        assert state["winner"]["id"] == winner.id
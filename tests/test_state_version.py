@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+import pytest
+
+from src.app import app as flask_app
+from src.core.game_logic import DicePokerGame
+
+
+def test_every_mutation_bumps_version():
+    game = DicePokerGame("g", max_rounds=1)
+    versions = [game.version]
+    p1 = game.add_player("A")
+    versions.append(game.version)
+    p2 = game.add_player("B")
+    versions.append(game.version)
+    game.set_player_ready(p1)
+    versions.append(game.version)
+    game.set_player_ready(p2)
+    versions.append(game.version)
+    assert game.start_game() is True
+    versions.append(game.version)
+    assert game.reroll_dice(p1, [0]) is True
+    versions.append(game.version)
+    assert game.end_turn(p1) is True
+    versions.append(game.version)
+    p3 = game.add_player("C")
+    versions.append(game.version)
+    assert game.remove_player(p3) is True
+    versions.append(game.version)
+
+    assert versions == sorted(set(versions))
+
+
+def test_rejected_actions_keep_version():
+    game = DicePokerGame("g")
+    p1 = game.add_player("A")
+    game.set_player_ready(p1)
+    version = game.version
+    assert game.start_game() is False
+    assert game.reroll_dice(p1, [0]) is False
+    assert game.end_turn(p1) is False
+    assert game.set_player_ready(p1) is True  # уже готов
+    assert game.remove_player("nobody") is False
+    game.get_game_state(p1)
+    assert game.version == version
+
+
+@pytest.fixture()
+def client():
+    flask_app.config.update({"TESTING": True, "SECRET_KEY": "test-key"})
+    with flask_app.test_client() as c:
+        yield c
+
+
+def test_state_returns_304_until_game_changes(client, monkeypatch):
+    gid = client.post("/create_game", json={"max_players": 4, "max_rounds": 1}).get_json()["game_id"]
+    client.post("/join_game", json={"game_id": gid, "player_name": "A"})
+
+    first = client.get(f"/game/{gid}/state")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    # Неизменённое состояние не строится и не сериализуется
+    from src.app import game_manager
+    game = game_manager.get_game(gid)
+    monkeypatch.setattr(type(game), "get_game_state", lambda *a, **k: pytest.fail("state built"))
+    cached = client.get(f"/game/{gid}/state", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+    assert cached.headers["ETag"] == etag
+    monkeypatch.undo()
+
+    other = flask_app.test_client()
+    other.post("/join_game", json={"game_id": gid, "player_name": "B"})
+    fresh = client.get(f"/game/{gid}/state", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert len(fresh.get_json()["players"]) == 2
+
+
+def test_hint_requests_use_separate_etag(client):
+    gid = client.post("/create_game", json={"max_players": 4, "max_rounds": 1}).get_json()["game_id"]
+    client.post("/join_game", json={"game_id": gid, "player_name": "A"})
+    plain = client.get(f"/game/{gid}/state").headers["ETag"]
+    hinted = client.get(f"/game/{gid}/state?hint=1", headers={"If-None-Match": plain})
+    assert hinted.status_code == 200
+    assert hinted.headers["ETag"] != plain
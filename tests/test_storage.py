@@ -0,0 +1,161 @@
+import random
+import sqlite3
+
+import pytest
+
+from src.core.game_logic import DicePokerGame, GameManager, GameStatus
+from src.core.scoring import Combination
+from src.core.storage import MemoryGameStore, SQLiteGameStore
+
+
+def play(game, turns, rng):
+    ids = list(game.players)
+    for _ in range(turns):
+        if game.status != GameStatus.ACTIVE:
+            break
+        pid = game.get_current_player().id
+        if rng.random() < 0.7:
+            game.reroll_dice(pid, [i for i in range(5) if rng.random() < 0.5])
+        game.end_turn(pid)
+    return ids
+
+
+def new_game(manager, names=("A", "B", "C"), max_rounds=4):
+    game = manager.get_game(manager.create_game(max_rounds=max_rounds))
+    ids = [game.add_player(n) for n in names]
+    for pid in ids:
+        game.set_player_ready(pid)
+    game.start_game()
+    return game
+
+
+def test_snapshot_round_trip():
+    game = DicePokerGame("g", max_rounds=2, score_table={Combination.ONE_PAIR: 7})
+    a, b = game.add_player("A"), game.add_player("B")
+    game.set_player_ready(a)
+    game.set_player_ready(b)
+    game.start_game()
+    play(game, 3, random.Random(1))
+
+    restored = DicePokerGame.from_dict(game.to_dict())
+    assert restored.to_dict() == game.to_dict()
+    assert restored.get_game_state() == game.get_game_state()
+    assert restored.score_table == {Combination.ONE_PAIR: 7}
+    assert restored.get_current_player().id == game.get_current_player().id
+
+
+def test_recorded_actions_replay_to_identical_state():
+    game = DicePokerGame("g", max_rounds=3)
+    initial = game.to_dict()
+    actions = []
+    game.on_change = lambda g, action: actions.append(action)
+    ids = [game.add_player(n) for n in ("A", "B", "C")]
+    for pid in ids:
+        game.set_player_ready(pid)
+    game.start_game()
+    play(game, 4, random.Random(2))
+    game.remove_player(game.get_current_player().id)
+    play(game, 10, random.Random(3))
+
+    replica = DicePokerGame.from_dict(initial)
+    for action in actions:
+        replica.apply_action(action)
+    assert replica.to_dict() == game.to_dict()
+
+
+def test_apply_action_rejects_impossible_actions():
+    game = DicePokerGame("g")
+    with pytest.raises(ValueError):
+        game.apply_action({"op": "end_turn", "player_id": "x", "roll": []})
+    with pytest.raises(ValueError):
+        game.apply_action({"op": "explode", "roll": []})
+
+
+def test_memory_store_keeps_default_behaviour():
+    manager = GameManager(store=MemoryGameStore())
+    game = new_game(manager)
+    play(game, 2, random.Random(4))
+    assert manager.get_game(game.game_id) is game
+
+
+def test_sqlite_store_recovers_games_after_restart(tmp_path):
+    path = str(tmp_path / "games.db")
+    manager = GameManager(store=SQLiteGameStore(path, snapshot_every=5))
+    games = [new_game(manager) for _ in range(3)]
+    for n, game in enumerate(games):
+        play(game, 3 + 4 * n, random.Random(n))
+    lobby = manager.get_game(manager.create_game())
+    lobby.add_player("Solo")
+    expected = {g.game_id: g.to_dict() for g in games + [lobby]}
+    manager.close()
+
+    restored = GameManager(store=SQLiteGameStore(path, snapshot_every=5))
+    try:
+        assert {gid: g.to_dict() for gid, g in restored.games.items()} == expected
+        # Восстановленная игра продолжает журналироваться
+        game = restored.get_game(games[0].game_id)
+        play(game, 2, random.Random(9))
+        expected_after = game.to_dict()
+    finally:
+        restored.close()
+
+    again = GameManager(store=SQLiteGameStore(path))
+    try:
+        assert again.get_game(games[0].game_id).to_dict() == expected_after
+    finally:
+        again.close()
+
+
+def test_sqlite_store_recovers_flushed_state_without_clean_shutdown(tmp_path):
+    path = str(tmp_path / "games.db")
+    store = SQLiteGameStore(path, snapshot_every=1000)
+    manager = GameManager(store=store)
+    game = new_game(manager)
+    play(game, 5, random.Random(5))
+    store.flush()
+
+    # Второй процесс открывает базу, пока первый ещё работает («падение»)
+    recovered = SQLiteGameStore(path).load_games()
+    assert [g.to_dict() for g in recovered] == [game.to_dict()]
+    store.close()
+
+
+def test_snapshots_keep_full_journal_and_removal_deletes(tmp_path):
+    path = str(tmp_path / "games.db")
+    store = SQLiteGameStore(path, snapshot_every=4)
+    manager = GameManager(store=store)
+    game = new_game(manager, max_rounds=10)
+    play(game, 20, random.Random(6))
+    store.flush()
+
+    conn = sqlite3.connect(path)
+    # Снимок ускоряет восстановление, но журнал действий остаётся полным
+    snapshot_version = conn.execute("SELECT version FROM snapshots").fetchone()[0]
+    assert snapshot_version > game.version - 4
+    journal_rows = conn.execute("SELECT COUNT(*) FROM journal").fetchone()[0]
+    assert journal_rows == game.version
+    manager.remove_game(game.game_id)
+    store.flush()
+    assert conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM journal").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM origins").fetchone()[0] == 0
+    conn.close()
+    manager.close()
+
+
+def test_replay_game_rebuilds_from_seed_and_journal(tmp_path):
+    path = str(tmp_path / "games.db")
+    store = SQLiteGameStore(path, snapshot_every=5)
+    manager = GameManager(store=store)
+    game = new_game(manager, max_rounds=3)
+    play(game, 9, random.Random(8))
+    store.flush()
+
+    replayed = SQLiteGameStore(path).replay_game(game.game_id)
+    expected = game.to_dict()
+    actual = replayed.to_dict()
+    expected.pop("created_at")
+    actual.pop("created_at")
+    assert actual == expected
+    assert store.replay_game("missing") is None
+    manager.close()